@@ -0,0 +1,86 @@
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from er_translator.data.conceptual import *
+from er_translator.data.relational import Table, Attribute as R_Attribute, ForeignKey
+
+ENTITIES = 10000
+ATTRIBUTES_PER_ENTITY = 10
+
+def create_large_diagram(entities_count: int, attributes_count: int):
+    entities = {}
+    relationships = {}
+    for i in range(entities_count):
+        entity = Entity(f"Entity{i}")
+        entity.add_identifier(Attribute(f"Entity{i}_ID", Cardinality(MinimumCardinality.ONE, MaximumCardinality.ONE), True))
+        for j in range(attributes_count):
+            entity.add_attribute(Attribute(f"Entity{i}_ATTR{j}", Cardinality(MinimumCardinality.ZERO, MaximumCardinality.ONE), False))
+        entities[entity.name] = entity
+        if i > 0:
+            relationship = Relationship(f"Relationship{i}", f"Entity{i}", f"Entity{i - 1}",
+                                        Cardinality(MinimumCardinality.ONE, MaximumCardinality.ONE),
+                                        Cardinality(MinimumCardinality.ZERO, MaximumCardinality.MANY))
+            relationships[relationship.name] = relationship
+    return entities, relationships
+
+def create_large_schema(tables_count: int, attributes_count: int):
+    tables = []
+    for i in range(tables_count):
+        primary_key = R_Attribute(f"Table{i}_ID", False, True)
+        attributes = [R_Attribute(f"Table{i}_ATTR{j}", True, False) for j in range(attributes_count)]
+        table = Table(f"Table{i}", [primary_key], attributes)
+        if tables:
+            referenced = tables[-1]
+            table.add_foreign_key(ForeignKey(f"Table{i}_FK", False, False, referenced, referenced.primary_keys[0]))
+        tables.append(table)
+    return tables
+
+def measure(function, *args):
+    # names are built inside function, so they are part of the measure
+    tracemalloc.start()
+    result = function(*args)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+def measure_instances(factory, count: int) -> float:
+    # names are built outside the measure, so only the objects are counted
+    names = [f"Name{i}" for i in range(count)]
+    tracemalloc.start()
+    instances = [factory(name) for name in names]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return size / count
+
+def main():
+    cardinality = Cardinality(MinimumCardinality.ONE, MaximumCardinality.ONE)
+    print(f"Entity:            {measure_instances(Entity, ENTITIES):8.1f} bytes per instance")
+    print(f"Attribute:         {measure_instances(lambda name: Attribute(name, cardinality, False), ENTITIES):8.1f} bytes per instance")
+    print(f"Cardinality:       {measure_instances(lambda name: Cardinality(MinimumCardinality.ONE, MaximumCardinality.ONE), ENTITIES):8.1f} bytes per instance")
+    print(f"Relational column: {measure_instances(lambda name: R_Attribute(name, False, False), ENTITIES):8.1f} bytes per instance")
+
+    (entities, relationships), size = measure(create_large_diagram, ENTITIES, ATTRIBUTES_PER_ENTITY)
+    attributes_count = ENTITIES * (ATTRIBUTES_PER_ENTITY + 1)
+    print(f"\nConceptual model: {ENTITIES} entities, {attributes_count} attributes, {len(relationships)} relationships")
+    print(f"  total {size / 1024 / 1024:.1f} MiB, {size / ENTITIES:.0f} bytes per entity with its attributes")
+
+    start = time.perf_counter()
+    for entity in entities.values():
+        entity.deep_copy()
+    for relationship in relationships.values():
+        relationship.deep_copy()
+    print(f"  deep copy of the whole model: {time.perf_counter() - start:.3f} s")
+
+    _, size = measure(create_large_schema, ENTITIES, ATTRIBUTES_PER_ENTITY)
+    print(f"\nRelational schema: {ENTITIES} tables, {attributes_count} columns")
+    print(f"  total {size / 1024 / 1024:.1f} MiB, {size / ENTITIES:.0f} bytes per table with its columns")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import sys
+import time
+import timeit
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+start = time.perf_counter()
+from er_translator.translation import sql_generator
+IMPORT_TIME = time.perf_counter() - start
+
+from er_translator.translation.sql_generator import SQLGenerator, SQLTemplate
+
+REPEAT = 5
+NUMBER = 20000
+COLUMNS_PER_TABLE = 10
+
+def render_table():
+    attributes = [SQLGenerator.create_sql_attribute(f"ATTR{i}", i % 2 == 0) for i in range(COLUMNS_PER_TABLE)]
+    selectors = [SQLGenerator.create_sql_selector("TYPE_Entity", ["0", "1"])]
+    references = [SQLGenerator.create_sql_reference(SQLGenerator.create_sql_attribute("Parent_ID", False), "Parent", "ID")]
+    constraints = [SQLGenerator.create_sql_check("CHECK_Entity", "(TYPE_Entity = 1 AND ATTR0 IS NOT NULL)")]
+    return SQLGenerator.create_sql_table("Entity", attributes, selectors, references, ["ID"], constraints)
+
+def render_trigger():
+    return SQLGenerator.create_sql_trigger_before_insert("TRIGGER_Child", "Child", "Parent", "Child", "Parent.ID = N.ID", "TYPE_Child", 1)
+
+def render_both_children_trigger():
+    return SQLGenerator.create_sql_trigger_before_insert("TRIGGER_Child", "Child", "Parent", "Child", "Parent.ID = N.ID", "TYPE_Child", 1, "TYPE_Other", 0)
+
+def render_downwards_trigger():
+    return SQLGenerator.create_sql_downwards_trigger("TRIGGER_Child", "Child", "Other", "Other.ID = N.ID", "Instance already in Other!")
+
+def format_trigger():
+    # str.format with a dict per call, how templates were rendered before being compiled
+    params = {
+        "trigger_name": "TRIGGER_Child",
+        "table_name": "Child",
+        "conditions": "Parent.ID = N.ID",
+        "selector_name": "TYPE_Child",
+        "selector_value": 1,
+        "entity_name": "Parent",
+        "child_name": "Child"
+    }
+    return sql_generator.TRIGGER_ONE_CHILD.text.format(**params)
+
+def measure(function) -> float:
+    # best of REPEAT runs, in microseconds per call
+    return min(timeit.repeat(function, repeat=REPEAT, number=NUMBER)) / NUMBER * 1e6
+
+def main():
+    print(f"Import of sql_generator: {IMPORT_TIME * 1000:.2f} ms")
+
+    start = time.perf_counter()
+    template = SQLTemplate("trigger_one_child.tpl")
+    template.compile()
+    print(f"First use of a template (read and compile): {(time.perf_counter() - start) * 1000:.3f} ms")
+
+    # compile every template before measuring
+    render_table()
+    render_trigger()
+    render_both_children_trigger()
+    render_downwards_trigger()
+
+    print(f"\nTable ({COLUMNS_PER_TABLE} columns, selector, reference, check): {measure(render_table):7.2f} us")
+    print(f"Trigger, one child:                                  {measure(render_trigger):7.2f} us")
+    print(f"Trigger, both children:                              {measure(render_both_children_trigger):7.2f} us")
+    print(f"Trigger, downwards:                                  {measure(render_downwards_trigger):7.2f} us")
+    print(f"Trigger, one child with str.format:                  {measure(format_trigger):7.2f} us")
+
+if __name__ == "__main__":
+    main()
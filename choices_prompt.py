@@ -1,6 +1,12 @@
-from er_translator.translation.er_translation import ERTranslator
+from er_translator.translation.er_translation import ERTranslator, TRANSLATING_MESSAGE
+from er_translator.translation.sql_writer import write_sql_code
 from er_translator.data.choices import HIERARCHY_CHOICE
+from er_translator.utils.log import LOGGER_NAME, log_event, enable_console_output
 from pathlib import Path
+import logging
+import sys
+
+logger = logging.getLogger(f"{LOGGER_NAME}.choices_prompt")
 
 def print_current_choices(current_items, item_name):
     if len(current_items) != 0:
@@ -12,6 +18,22 @@ def print_current_choices(current_items, item_name):
             else:
                 print(f"{item_key}: {item_choice}")
 
+def print_sql_code(er_translator, composite_attributes_choices, hierarchy_choices, relationship_choices):
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    log_event(logger, logging.INFO, "translation_started", TRANSLATING_MESSAGE)
+    sql_code = er_translator.iter_sql_code(composite_attributes_choices, hierarchy_choices, relationship_choices)
+    log_event(logger, logging.INFO, "sql_code", "------- SQL CODE -------")
+    # the code is streamed to stdout rather than logged as one huge message
+    write_sql_code(sql_code, sys.stdout)
+    print()
+
+def print_workload_costs(item_costs, item_name):
+    if len(item_costs) != 0:
+        print(f"\n Estimated workload cost for {item_name}")
+        for item_key, costs in item_costs.items():
+            print(f"{item_key}: " + ", ".join(f"{choice}: {cost:g}" for choice, cost in costs.items()))
+
 def prompt_item_choices(item_name, item_key, item_choices, current_items):
     if isinstance(item_key, tuple):
         entity_name, attr_name = item_key
@@ -74,32 +96,54 @@ def prompt_items(items, current_items, item_name):
             print("\n Invalid input. Please enter a number or press Enter.")
 
 
-def choices_selector(entities, relationships, file_path=None):
-    sql_code = ""
-    entities_copy = {}
-    for entity_name, entity in entities.items():
-        entities_copy[entity_name] = entity.deep_copy()
-    relationships_copy = {}
-    for relationship_name, relationship in relationships.items():
-        relationships_copy[relationship_name] = relationship.deep_copy()
-    er_translator = ERTranslator(entities_copy, relationships_copy)
+def choices_selector(entities, relationships, file_path=None, incremental=False, cache=None, speculate=True, workload=None, quiet=False, optimize=False):
+    # quiet skips the translated code and the other messages, prompts are still shown
+    if quiet or not logging.getLogger(LOGGER_NAME).handlers:
+        # an output enabled by the application, like --log-level, keeps its level
+        enable_console_output(logging.WARNING if quiet else logging.INFO)
+    translated = False
+    if cache is None:
+        # configurations seen before are not translated again
+        from er_translator.translation.translation_cache import TranslationCache
+        cache = TranslationCache()
+    # translate does not modify the model, so one translator serves every iteration
+    if incremental:
+        # only the components affected by a changed choice are translated again
+        from er_translator.translation.incremental_translation import IncrementalTranslator
+        er_translator = IncrementalTranslator(entities, relationships, cache)
+    else:
+        er_translator = ERTranslator(entities, relationships, cache)
+    # translates the alternatives of the current choices while waiting for input
+    speculative_translator = None
+    if speculate:
+        from er_translator.translation.speculative_translation import SpeculativeTranslator
+        speculative_translator = SpeculativeTranslator(er_translator)
 
     composite_attributes_choices, current_composite_attributes_choices = er_translator.get_composite_attributes_choices()
     hierarchy_choices, current_hierarchy_choices = er_translator.get_hierarchy_choices()
     relationship_choices, current_relationship_choices = er_translator.get_relationship_choices()
+
+    if optimize:
+        # start from the choices of the smallest relational model
+        from er_translator.translation.choice_optimization import ChoiceOptimizer
+        choice_optimizer = ChoiceOptimizer(entities, relationships)
+        optimized_choices = choice_optimizer.optimize()
+        current_composite_attributes_choices, current_hierarchy_choices, current_relationship_choices = (
+            {item_key: optimized[item_key] for item_key in current} for optimized, current in zip(optimized_choices, (current_composite_attributes_choices, current_hierarchy_choices, current_relationship_choices))
+        )
+        log_event(logger, logging.INFO, "choices_optimized", "\n Optimized choices, model cost: %g", choice_optimizer.cost, cost=choice_optimizer.cost)
+
+    if workload is not None:
+        # start from the hierarchy and relationship choices cheapest for the workload
+        from er_translator.translation.workload_advisor import WorkloadAdvisor
+        workload_advisor = WorkloadAdvisor(entities, relationships, workload)
+        current_composite_attributes_choices, current_hierarchy_choices, current_relationship_choices = workload_advisor.advise(current_composite_attributes_choices, current_hierarchy_choices, current_relationship_choices)
+        print_workload_costs(workload_advisor.hierarchy_costs, "Hierarchy")
+        print_workload_costs(workload_advisor.relationship_costs, "Relationship")
     
     while True:
-        entities_copy = {}
-        for entity_name, entity in entities.items():
-            entities_copy[entity_name] = entity.deep_copy()
-        relationships_copy = {}
-        for relationship_name, relationship in relationships.items():
-            relationships_copy[relationship_name] = relationship.deep_copy()
-        er_translator = ERTranslator(entities_copy, relationships_copy)
-
-        sql_code = er_translator.translate(current_composite_attributes_choices, current_hierarchy_choices, current_relationship_choices)
-        print("------- SQL CODE -------")
-        print(sql_code)
+        print_sql_code(er_translator, current_composite_attributes_choices, current_hierarchy_choices, current_relationship_choices)
+        translated = True
         print_current_choices(current_composite_attributes_choices, "Composite Attribute")
         print_current_choices(current_hierarchy_choices, "Hierarchy")
         print_current_choices(current_relationship_choices, "Relationship")
@@ -107,6 +151,9 @@ def choices_selector(entities, relationships, file_path=None):
         if len(current_composite_attributes_choices) == 0 and len(current_hierarchy_choices) == 0 and len(current_relationship_choices) == 0:
             print("\n No translations choices to change. Exiting...")
             break
+
+        if speculative_translator:
+            speculative_translator.speculate(current_composite_attributes_choices, current_hierarchy_choices, current_relationship_choices)
         
         user_input = input(f"\n Do you want to change any translations choices? (y/n): ").strip()
 
@@ -128,16 +175,9 @@ def choices_selector(entities, relationships, file_path=None):
                         elif choice_num == 3:
                             prompt_items(relationship_choices, current_relationship_choices, "Relationship")
                         elif choice_num == 4:
-                            entities_copy = {}
-                            for entity_name, entity in entities.items():
-                                entities_copy[entity_name] = entity.deep_copy()
-                            relationships_copy = {}
-                            for relationship_name, relationship in relationships.items():
-                                relationships_copy[relationship_name] = relationship.deep_copy()
-                            er_translator = ERTranslator(entities_copy, relationships_copy)
-                            sql_code = er_translator.translate(current_composite_attributes_choices, current_hierarchy_choices, current_relationship_choices)
-                            print("------- SQL CODE -------")
-                            print(sql_code)
+                            if speculative_translator:
+                                speculative_translator.cancel()
+                            print_sql_code(er_translator, current_composite_attributes_choices, current_hierarchy_choices, current_relationship_choices)
                             break
                     else:
                         print(f"\n Please enter a number between 1 and 4!")
@@ -147,7 +187,10 @@ def choices_selector(entities, relationships, file_path=None):
             print("\n Translation done. Exiting...")
             break
 
-    if sql_code and file_path:
+    if speculative_translator:
+        speculative_translator.shutdown()
+
+    if translated and file_path:
         # Create result folder if it doesn't exist
         result_folder = Path(file_path).parent / "result"
         result_folder.mkdir(exist_ok=True)
@@ -158,6 +201,6 @@ def choices_selector(entities, relationships, file_path=None):
         
         # Write SQL code to file
         with open(output_path, 'w') as f:
-            f.write(sql_code)
+            write_sql_code(er_translator.iter_sql_code(current_composite_attributes_choices, current_hierarchy_choices, current_relationship_choices), f)
         
-        print(f"\n SQL code written to: {output_path}")
+        log_event(logger, logging.INFO, "sql_code_written", "\n SQL code written to: %s", output_path, path=str(output_path))
@@ -0,0 +1,175 @@
+"""
+Command line entry point: python -m er_translator <command> FILE_PATH
+
+Only argparse is imported up front, every command imports the parts of
+the translator it needs when it runs, so short runs start fast.
+"""
+
+import time
+
+_IMPORT_START = time.perf_counter()
+
+import argparse
+import sys
+from pathlib import Path
+
+# choices_prompt.py, used by translate -i, sits in the project root next to the package
+PROJECT_ROOT = Path(__file__).parent.parent
+
+def parse_diagram(file_path: str, streaming: bool = False):
+    from .parsers.erdplus_parser import ERDPLUS_Parser
+
+    erdplus_parser = ERDPLUS_Parser()
+    erdplus_parser.parse_erdplus_diagram(file_path, streaming)
+    return erdplus_parser.entities, erdplus_parser.relationships
+
+def parse_command(arguments) -> None:
+    entities, relationships = parse_diagram(arguments.file_path, arguments.streaming)
+    if arguments.output:
+        from .data.serialization import dump_model
+
+        dump_model(entities, relationships, arguments.output)
+    print(f"{len(entities)} entities, {len(relationships)} relationships")
+
+def translate_command(arguments) -> None:
+    entities, relationships = parse_diagram(arguments.file_path, arguments.streaming)
+    workload = None
+    if arguments.workload:
+        from .parsers.workload_parser import WorkloadParser
+
+        workload = WorkloadParser().parse_workload(arguments.workload)
+    if arguments.interactive:
+        if str(PROJECT_ROOT) not in sys.path:
+            sys.path.insert(0, str(PROJECT_ROOT))
+        from choices_prompt import choices_selector
+
+        choices_selector(entities, relationships, arguments.file_path, workload=workload, optimize=arguments.optimize)
+        return
+
+    from .translation.er_translation import ERTranslator
+    from .translation.sql_writer import write_sql_code
+
+    er_translator = ERTranslator(entities, relationships)
+    if arguments.optimize:
+        from .translation.choice_optimization import ChoiceOptimizer
+
+        choices = ChoiceOptimizer(entities, relationships).optimize()
+    else:
+        choices = (
+            er_translator.get_composite_attributes_choices()[1],
+            er_translator.get_hierarchy_choices()[1],
+            er_translator.get_relationship_choices()[1]
+        )
+    if workload is not None:
+        from .translation.workload_advisor import WorkloadAdvisor
+
+        choices = WorkloadAdvisor(entities, relationships, workload).advise(*choices)
+    sql_code = er_translator.iter_sql_code(*choices)
+    if not arguments.output:
+        write_sql_code(sql_code, sys.stdout)
+        print()
+    elif arguments.output.endswith(".gz"):
+        import gzip
+
+        with gzip.open(arguments.output, "wb") as f:
+            write_sql_code(sql_code, f)
+    else:
+        with open(arguments.output, "w") as f:
+            write_sql_code(sql_code, f)
+
+def estimate_command(arguments) -> None:
+    from .parsers.statistics_parser import StatisticsParser
+    from .translation.er_translation import ERTranslator
+    from .translation.storage_estimation import StorageEstimator
+
+    entities, relationships = parse_diagram(arguments.file_path, arguments.streaming)
+    statistics_parser = StatisticsParser()
+    for name, sample_path in arguments.sample:
+        statistics_parser.parse_csv_sample(name, sample_path)
+    if arguments.statistics:
+        # the statistics file has the last word over the samples
+        statistics_parser.parse_statistics(arguments.statistics)
+
+    er_translator = ERTranslator(entities, relationships)
+    choices = (
+        er_translator.get_composite_attributes_choices()[1],
+        er_translator.get_hierarchy_choices()[1],
+        er_translator.get_relationship_choices()[1]
+    )
+    estimates = StorageEstimator(entities, relationships, statistics_parser.statistics).estimate(*choices)
+    for estimate in estimates.values():
+        print(f"{estimate.name}: {estimate.rows} rows, {estimate.columns} columns, {estimate.bytes_per_row:.1f} bytes per row, {estimate.total_bytes:.0f} bytes, {estimate.null_density:.0%} NULL")
+    print(f"total: {sum(estimate.total_bytes for estimate in estimates.values()):.0f} bytes")
+
+def sample_argument(value: str) -> tuple[str, str]:
+    name, separator, file_path = value.partition("=")
+    if not separator or not name or not file_path:
+        raise argparse.ArgumentTypeError(f"expected NAME=FILE, got {value}")
+    return name, file_path
+
+def print_command(arguments) -> None:
+    from .printers.diagram_printer import print_entities, print_relationships
+
+    entities, relationships = parse_diagram(arguments.file_path, arguments.streaming)
+    print_entities(entities.values())
+    print_relationships(relationships.values())
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="er_translator", description="Translate ERDPlus diagrams into SQL code.")
+    parser.add_argument("--timing", action="store_true", help="report import and run time on stderr")
+    parser.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="show translator messages from this level up on stderr")
+    parser.add_argument("--log-json", action="store_true", help="show messages as JSON lines, with their event and fields")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parse = commands.add_parser("parse", help="parse a diagram and report its size")
+    parse.add_argument("-o", "--output", help="save the parsed model in binary form")
+    parse.set_defaults(run=parse_command)
+
+    translate = commands.add_parser("translate", help="translate a diagram into SQL code")
+    translate.add_argument("-o", "--output", help="write the SQL code to a file instead of stdout, gzip compressed if it ends with .gz")
+    translate.add_argument("-i", "--interactive", action="store_true", help="choose the translation of each item interactively")
+    translate.add_argument("--optimize", action="store_true", help="use the choices giving the smallest relational model, as the starting choices with -i")
+    translate.add_argument("--workload", metavar="FILE", help="adjust hierarchy and one to one relationship choices to the access paths of a workload file")
+    translate.set_defaults(run=translate_command)
+
+    print_ = commands.add_parser("print", help="print the entities and relationships of a diagram")
+    print_.set_defaults(run=print_command)
+
+    estimate = commands.add_parser("estimate", help="estimate the size of every table of the default translation")
+    estimate.add_argument("--statistics", metavar="FILE", help="row counts, null ratios and widths of the model, as a JSON file")
+    estimate.add_argument("--sample", metavar="NAME=FILE", action="append", default=[], type=sample_argument, help="measure an entity or relationship on a sample CSV file, can be repeated")
+    estimate.set_defaults(run=estimate_command)
+
+    for command in (parse, translate, print_, estimate):
+        command.add_argument("file_path", help="path to the .erdplus file")
+        command.add_argument("--streaming", action="store_true", help="parse the file without loading it whole")
+    return parser
+
+def main(argv: list[str] = None) -> int:
+    import_time = time.perf_counter() - _IMPORT_START
+    arguments = create_parser().parse_args(argv)
+    if arguments.log_level or arguments.log_json:
+        import logging
+        from .utils.log import enable_console_output
+
+        enable_console_output(getattr(logging, arguments.log_level or "INFO"), sys.stderr, arguments.log_json)
+    from .exceptions.exceptions import DiagramFormatException, OrphanNodeException, CyclicNodeException, WorkloadFormatException, StatisticsFormatException
+
+    start = time.perf_counter()
+    try:
+        arguments.run(arguments)
+    except BrokenPipeError:
+        # the reader of the output went away, as with head, stop writing quietly
+        import os
+
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except OSError as e:
+        print(f"er_translator: error: {e.filename}: {e.strerror}" if e.filename else f"er_translator: error: {e}", file=sys.stderr)
+        return 1
+    except (DiagramFormatException, OrphanNodeException, CyclicNodeException, WorkloadFormatException, StatisticsFormatException) as e:
+        print(f"er_translator: error: {e.message}", file=sys.stderr)
+        return 1
+    if arguments.timing:
+        print(f"import: {import_time * 1000:.2f} ms, {arguments.command}: {(time.perf_counter() - start) * 1000:.2f} ms", file=sys.stderr)
+    return 0
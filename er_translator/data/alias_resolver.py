@@ -0,0 +1,30 @@
+class AliasResolver:
+    """
+    Union-find of names, every name resolves to the final name of its group.
+
+    Unlike a plain rename map, chains of aliases are followed, and each lookup
+    compresses the chain, so resolving stays close to constant time.
+    """
+    def __init__(self):
+        self._parents: dict[str, str] = {}
+
+    def __contains__(self, name: str):
+        return name in self._parents
+
+    def add_alias(self, alias: str, name: str) -> None:
+        """Make alias, and everything already resolving to it, resolve to what name resolves to."""
+        alias_root = self.resolve(alias)
+        name_root = self.resolve(name)
+        if alias_root != name_root:
+            self._parents[alias_root] = name_root
+
+    def resolve(self, name: str) -> str:
+        parents = self._parents
+        while name in parents:
+            parent = parents[name]
+            grandparent = parents.get(parent)
+            if grandparent is not None:
+                # path halving
+                parents[name] = grandparent
+            name = parent
+        return name
@@ -17,10 +17,29 @@ class HierarchyDisjointness(Enum):
     OVERLAPPING = auto()
     DISJOINT = auto()
 
+# canonical Cardinality instances, one for each (minimum, maximum) pair
+_CARDINALITIES = {}
+
 class Cardinality():
-    def __init__(self, min_cardinality: MinimumCardinality, max_cardinality: MaximumCardinality):
-        self._min_cardinality = min_cardinality
-        self._max_cardinality = max_cardinality
+    """Immutable cardinality, every (minimum, maximum) pair is a single shared instance."""
+    __slots__ = ("_min_cardinality", "_max_cardinality")
+
+    def __new__(cls, min_cardinality: MinimumCardinality, max_cardinality: MaximumCardinality):
+        key = (min_cardinality, max_cardinality)
+        cardinality = _CARDINALITIES.get(key)
+        if cardinality is None:
+            cardinality = super().__new__(cls)
+            object.__setattr__(cardinality, "_min_cardinality", min_cardinality)
+            object.__setattr__(cardinality, "_max_cardinality", max_cardinality)
+            _CARDINALITIES[key] = cardinality
+        return cardinality
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Cardinality is immutable")
+
+    def __reduce__(self):
+        # keep instances canonical across pickling
+        return (Cardinality, (self._min_cardinality, self._max_cardinality))
     
     @property
     def min_cardinality(self):
@@ -47,15 +66,88 @@ class Cardinality():
         return Cardinality(min_cardinality, max_cardinality)
     
     def deep_copy(self) -> "Cardinality":
-        """Create a deep copy of this Cardinality."""
-        return Cardinality(self._min_cardinality, self._max_cardinality)
+        """Cardinalities are immutable and shared, so the copy is the instance itself."""
+        return self
+
+class AttributeCollection:
+    """
+    Insertion-ordered attributes indexed by name.
+
+    Lookup, membership and removal by name are O(1) and iteration follows
+    insertion order like a list. Attributes sharing a name are all kept,
+    removal takes the first one as list.remove would.
+    """
+    __slots__ = ("_attributes", "_duplicates", "_next_key")
+
+    def __init__(self, attributes: list["Attribute"] = ()):
+        # an attribute is keyed by its name, or by (name, n) when the name is already taken
+        self._attributes = {}
+        # keys in insertion order of the names held by more than one attribute, created on demand
+        self._duplicates = None
+        self._next_key = 0
+        for attribute in attributes:
+            self.append(attribute)
+
+    def __iter__(self):
+        return iter(self._attributes.values())
+
+    def __len__(self):
+        return len(self._attributes)
+
+    def __contains__(self, attribute_name: str):
+        return self._first_key(attribute_name) is not None
+
+    def append(self, attribute: "Attribute") -> None:
+        name = attribute.name
+        keys = self._duplicates.get(name) if self._duplicates else None
+        if keys is None:
+            if name not in self._attributes:
+                self._attributes[name] = attribute
+                return
+            if self._duplicates is None:
+                self._duplicates = {}
+            keys = self._duplicates[name] = [name]
+        key = (name, self._next_key)
+        self._next_key += 1
+        self._attributes[key] = attribute
+        keys.append(key)
+
+    def copy(self) -> "AttributeCollection":
+        """Create a new collection holding the same attribute objects."""
+        collection_copy = AttributeCollection()
+        collection_copy._attributes = self._attributes.copy()
+        if self._duplicates:
+            collection_copy._duplicates = {name: list(keys) for name, keys in self._duplicates.items()}
+        collection_copy._next_key = self._next_key
+        return collection_copy
+
+    def get(self, attribute_name: str) -> "Attribute":
+        key = self._first_key(attribute_name)
+        return None if key is None else self._attributes[key]
+
+    def remove(self, attribute_name: str) -> "Attribute":
+        keys = self._duplicates.get(attribute_name) if self._duplicates else None
+        if keys is None:
+            return self._attributes.pop(attribute_name, None)
+        key = keys.pop(0)
+        if not keys:
+            del self._duplicates[attribute_name]
+        return self._attributes.pop(key)
+
+    def _first_key(self, attribute_name: str):
+        keys = self._duplicates.get(attribute_name) if self._duplicates else None
+        if keys:
+            return keys[0]
+        return attribute_name if attribute_name in self._attributes else None
 
 class Entity:
+    __slots__ = ("_name", "_identifiers", "_strong_entity", "_attributes", "_hierarchy")
+
     def __init__(self, name: str):
         self._name = name
-        self._identifiers = []
+        self._identifiers = AttributeCollection()
         self._strong_entity = None
-        self._attributes = []
+        self._attributes = AttributeCollection()
         self._hierarchy = None
 
     @property
@@ -97,17 +189,26 @@ class Entity:
             raise NoHierarchyExcpetion()
         
     def remove_attribute(self, attribute_name: str):
-        for attribute in self._attributes:
-            if attribute.name == attribute_name:
-                self._attributes.remove(attribute)
-                break
+        self._attributes.remove(attribute_name)
     
     def remove_identifier(self, identifier_name: str):
-        for identifier in self._identifiers:
-            if identifier.name == identifier_name:
-                self._identifiers.remove(identifier)
-                break
+        self._identifiers.remove(identifier_name)
+
+    def get_attribute(self, attribute_name: str) -> "Attribute":
+        return self._attributes.get(attribute_name)
+
+    def get_identifier(self, identifier_name: str) -> "Attribute":
+        return self._identifiers.get(identifier_name)
     
+    def copy(self) -> "Entity":
+        """Create a copy of this Entity that shares its attribute and hierarchy objects."""
+        entity_copy = Entity(self._name)
+        entity_copy._identifiers = self._identifiers.copy()
+        entity_copy._attributes = self._attributes.copy()
+        entity_copy._strong_entity = self._strong_entity
+        entity_copy._hierarchy = self._hierarchy
+        return entity_copy
+
     def deep_copy(self) -> "Entity":
         """Create a deep copy of this Entity."""
         entity_copy = Entity(self._name)
@@ -130,6 +231,8 @@ class Entity:
         return entity_copy
 
 class Hierarchy:
+    __slots__ = ("_children", "_hierarchy_completeness", "_hierarchy_disjointness")
+
     def __init__(self, hierarchy_completeness: HierarchyCompleteness, hierarchy_disjointness: HierarchyDisjointness):
         self._children = []
         self._hierarchy_completeness = hierarchy_completeness
@@ -158,6 +261,8 @@ class Hierarchy:
         return hierarchy_copy
 
 class Relationship:
+    __slots__ = ("_name", "_entity_from", "_entity_to", "_cardinality_from", "_cardinality_to", "_attributes")
+
     def __init__(self, name: str, entity_from: str, entity_to: str, cardinality_from: Cardinality, cardinality_to: Cardinality):
         self._name = name
         self._entity_from = entity_from
@@ -208,6 +313,12 @@ class Relationship:
     def set_entity_to(self, entity_to: str):
         self._entity_to = entity_to
     
+    def copy(self) -> "Relationship":
+        """Create a copy of this Relationship that shares its attribute objects."""
+        relationship_copy = Relationship(self._name, self._entity_from, self._entity_to, self._cardinality_from, self._cardinality_to)
+        relationship_copy._attributes = list(self._attributes)
+        return relationship_copy
+
     def deep_copy(self) -> "Relationship":
         """Create a deep copy of this Relationship."""
         relationship_copy = Relationship(
@@ -226,6 +337,8 @@ class Relationship:
 
 
 class Attribute:
+    __slots__ = ("_name", "_cardinality", "_is_unique")
+
     def __init__(self, name: str, cardinality: Cardinality, is_unique: bool):
         self._name = name
         self._cardinality = cardinality
@@ -251,6 +364,8 @@ class Attribute:
         return Attribute(self._name, self._cardinality.deep_copy(), self._is_unique)
 
 class CompositeAttribute(Attribute):
+    __slots__ = ("_simple_attributes",)
+
     def __init__(self, name: str, cardinality: Cardinality, is_unique: bool):
         super().__init__(name, cardinality, is_unique)
         self._simple_attributes = []
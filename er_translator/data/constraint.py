@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 @dataclass
 class Check:
@@ -9,15 +9,18 @@ class Check:
 class Condition:
     selector_value: str
     checks: list[Check]
+    # attribute name -> check, keeps merging proportional to the new checks
+    _checks_index: dict[str, Check] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._checks_index = {}
+        for check in self.checks:
+            self._checks_index.setdefault(check.attribute_name, check)
 
     def add_checks(self, checks: list[Check]):
         for new_check in checks:
-            found = False
-            for check in self.checks:
-                if new_check.attribute_name == check.attribute_name:
-                    found = True
-                    break
-            if not found:
+            if new_check.attribute_name not in self._checks_index:
+                self._checks_index[new_check.attribute_name] = new_check
                 self.checks.append(new_check)
         
 
@@ -27,14 +30,28 @@ class Constraint:
     constraint_name: str
     selector_name: str
     conditions: list[Condition]
+    # selector value -> condition, keeps merging proportional to the new conditions
+    _conditions_index: dict[str, Condition] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._conditions_index = {}
+        for condition in self.conditions:
+            self._conditions_index.setdefault(condition.selector_value, condition)
 
     def add_conditions(self, new_conditions: list[Condition]):
         for new_condition in new_conditions:
-            found = False
-            for condition in self.conditions:
-                if new_condition.selector_value == condition.selector_value:
-                    condition.add_checks(new_condition.checks)
-                    found = True
-                    break
-            if not found:
+            condition = self._conditions_index.get(new_condition.selector_value)
+            if condition is not None:
+                condition.add_checks(new_condition.checks)
+            else:
+                self._conditions_index[new_condition.selector_value] = new_condition
                 self.conditions.append(new_condition)
+
+@dataclass
+class ChildrenChecks:
+    # child name -> checks of its own identifiers and attributes
+    not_null_checks: dict[str, list[Check]]
+    null_checks: dict[str, list[Check]]
+    # child name -> null checks of every other child of the hierarchy
+    other_children_null_checks: dict[str, list[Check]]
+    all_children_null_checks: list[Check]
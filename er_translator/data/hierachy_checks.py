@@ -1,8 +1,15 @@
+from dataclasses import replace
+from typing import Callable
+
+from .sql_ir import Selector, Check, Trigger
+
 class HierarchyChecks:
     def __init__(self):
         self._selectors = {}
         self._constraints = {}
         self._triggers = []
+        # father entity of the hierarchy each trigger belongs to
+        self._trigger_fathers = []
 
     @property
     def selectors(self):
@@ -15,19 +22,42 @@ class HierarchyChecks:
     @property
     def triggers(self):
         return self._triggers
+
+    @property
+    def trigger_fathers(self):
+        return self._trigger_fathers
     
-    def add_selector(self, entity_name: str, selector: str):
+    def add_selector(self, entity_name: str, selector: Selector):
         if entity_name in self._selectors:
             self._selectors[entity_name].append(selector)
         else:
             self._selectors[entity_name] = [selector]
 
-    def add_constraint(self, entity_name: str, constraint: str):
+    def add_constraint(self, entity_name: str, constraint: Check):
         if entity_name in self._constraints:
             self._constraints[entity_name].append(constraint)
         else:
             self._constraints[entity_name] = [constraint]
         
 
-    def add_trigger(self, trigger: str):
-        self._triggers.append(trigger)
\ No newline at end of file
+    def add_trigger(self, trigger: Trigger):
+        self._triggers.append(trigger)
+
+    def set_triggers_father(self, father_name: str):
+        """Record father_name as the father of the triggers added since the last call."""
+        self._trigger_fathers += [father_name] * (len(self._triggers) - len(self._trigger_fathers))
+
+    def rename_tables(self, table_name: Callable[[str], str]) -> "HierarchyChecks":
+        """Copy of the checks with every table renamed by table_name, for tables merged after the hierarchies were eliminated."""
+        renamed = HierarchyChecks()
+        for entity_name, selectors in self._selectors.items():
+            for selector in selectors:
+                renamed.add_selector(table_name(entity_name), selector)
+        for entity_name, constraints in self._constraints.items():
+            for constraint in constraints:
+                renamed.add_constraint(table_name(entity_name), constraint)
+        for trigger in self._triggers:
+            changes = {field_name: table_name(getattr(trigger, field_name)) for field_name in ("table_name", "parent_table_name", "other_table_name") if hasattr(trigger, field_name)}
+            renamed.add_trigger(replace(trigger, **changes))
+        renamed._trigger_fathers = list(self._trigger_fathers)
+        return renamed
@@ -1,4 +1,6 @@
 class Table:
+    __slots__ = ("name", "primary_keys", "foreign_keys", "attributes")
+
     def __init__(self, name: str, primary_keys: list["Attribute"], attributes: list["Attribute"]):
         self.name = name
         self.primary_keys = primary_keys
@@ -12,6 +14,8 @@ class Table:
         self.attributes.append(attribute)
 
 class Attribute:
+    __slots__ = ("name", "is_optional", "is_unique")
+
     def __init__(self, name: str, is_optional: bool, is_unique: bool):
         self.name = name
         self.is_optional = is_optional
@@ -24,6 +28,8 @@ class Attribute:
         self.is_optional = is_optional
     
 class ForeignKey(Attribute):
+    __slots__ = ("table_ref", "primary_key_ref")
+
     def __init__(self, name: str, is_optional: bool, is_unique: bool, 
                  table_ref: Table, primary_key_ref: Attribute):
         super().__init__(name, is_optional, is_unique)
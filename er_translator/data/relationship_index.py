@@ -0,0 +1,57 @@
+from .conceptual import Relationship
+
+class RelationshipIndex:
+    """
+    Adjacency index from entity names to the relationships connected to them.
+
+    The index wraps the relationships dict: relationships must be added, removed
+    and rewired through it so that both stay in sync. Query results follow the
+    order of the relationships dict, like a scan over it would.
+    """
+    def __init__(self, relationships: dict[str, Relationship]):
+        self._relationships = relationships
+        self._entity_relationships: dict[str, set[str]] = {}
+        self._positions: dict[str, int] = {}
+        self._next_position = 0
+        for relationship_name, relationship in relationships.items():
+            self._index_relationship(relationship_name, relationship)
+
+    @property
+    def relationships(self):
+        return self._relationships
+
+    def connected_relationships(self, entity_names: list[str]) -> list[str]:
+        connected = set()
+        for entity_name in entity_names:
+            connected.update(self._entity_relationships.get(entity_name, ()))
+        return sorted(connected, key=self._positions.__getitem__)
+
+    def add_relationship(self, relationship_name: str, relationship: Relationship) -> None:
+        if relationship_name in self._relationships:
+            # replacing keeps the dict position
+            self._unindex_relationship(relationship_name, self._relationships[relationship_name])
+        else:
+            self._positions[relationship_name] = self._next_position
+            self._next_position += 1
+        self._relationships[relationship_name] = relationship
+        self._index_relationship(relationship_name, relationship)
+
+    def remove_relationship(self, relationship_name: str) -> None:
+        relationship = self._relationships.pop(relationship_name)
+        self._unindex_relationship(relationship_name, relationship)
+        del self._positions[relationship_name]
+
+    def _index_relationship(self, relationship_name: str, relationship: Relationship) -> None:
+        if relationship_name not in self._positions:
+            self._positions[relationship_name] = self._next_position
+            self._next_position += 1
+        self._entity_relationships.setdefault(relationship.entity_from, set()).add(relationship_name)
+        self._entity_relationships.setdefault(relationship.entity_to, set()).add(relationship_name)
+
+    def _unindex_relationship(self, relationship_name: str, relationship: Relationship) -> None:
+        for entity_name in (relationship.entity_from, relationship.entity_to):
+            relationship_names = self._entity_relationships.get(entity_name)
+            if relationship_names:
+                relationship_names.discard(relationship_name)
+                if not relationship_names:
+                    del self._entity_relationships[entity_name]
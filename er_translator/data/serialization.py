@@ -0,0 +1,264 @@
+import hashlib
+import struct
+import sys
+from array import array
+
+from .conceptual import *
+from ..exceptions.exceptions import ModelFormatException
+
+# Binary layout, all integers little-endian unsigned 32 bits:
+#   header: magic, format version, number of strings, size of the utf-8 blob, number of model integers
+#   string table: length in characters of every string, then all strings as one utf-8 blob
+#   model: a flat stream of integers, names are indexes in the string table
+MAGIC = b"ERDM"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHIII")
+
+NONE = 0
+FALSE = 1
+TRUE = 2
+
+SIMPLE_ATTRIBUTE = 0
+COMPOSITE_ATTRIBUTE = 1
+
+CARDINALITY_CODES = {
+    (MinimumCardinality.ZERO, MaximumCardinality.ONE): 0,
+    (MinimumCardinality.ZERO, MaximumCardinality.MANY): 1,
+    (MinimumCardinality.ONE, MaximumCardinality.ONE): 2,
+    (MinimumCardinality.ONE, MaximumCardinality.MANY): 3,
+}
+CARDINALITIES = {code: cardinality for cardinality, code in CARDINALITY_CODES.items()}
+
+# 0 is kept for entities without hierarchy
+HIERARCHY_CODES = {
+    (HierarchyCompleteness.TOTAL, HierarchyDisjointness.OVERLAPPING): 1,
+    (HierarchyCompleteness.TOTAL, HierarchyDisjointness.DISJOINT): 2,
+    (HierarchyCompleteness.PARTIAL, HierarchyDisjointness.OVERLAPPING): 3,
+    (HierarchyCompleteness.PARTIAL, HierarchyDisjointness.DISJOINT): 4,
+}
+HIERARCHIES = {code: hierarchy for hierarchy, code in HIERARCHY_CODES.items()}
+
+def _to_little_endian(values: array) -> array:
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class _ModelWriter:
+    def __init__(self):
+        self._strings = []
+        self._string_indexes = {}
+        self._stream = []
+
+    def write_model(self, entities: dict[str, Entity], relationships: dict[str, Relationship]) -> bytes:
+        self._stream.append(len(entities))
+        for entity_key, entity in entities.items():
+            self._write_entity(entity_key, entity)
+        self._stream.append(len(relationships))
+        for relationship_key, relationship in relationships.items():
+            self._write_relationship(relationship_key, relationship)
+
+        lengths = _to_little_endian(array("I", [len(string) for string in self._strings]))
+        blob = "".join(self._strings).encode("utf-8")
+        stream = _to_little_endian(array("I", self._stream))
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, len(self._strings), len(blob), len(stream))
+        return header + lengths.tobytes() + blob + stream.tobytes()
+
+    def _write_string(self, string: str) -> None:
+        index = self._string_indexes.get(string)
+        if index is None:
+            index = len(self._strings)
+            self._strings.append(string)
+            self._string_indexes[string] = index
+        self._stream.append(index)
+
+    def _write_optional_string(self, string: str) -> None:
+        # shifted by one so that 0 means None
+        if string is None:
+            self._stream.append(NONE)
+        else:
+            self._write_string(string)
+            self._stream[-1] += 1
+
+    def _write_flag(self, flag) -> None:
+        if flag is None:
+            self._stream.append(NONE)
+        else:
+            self._stream.append(TRUE if flag else FALSE)
+
+    def _write_cardinality(self, cardinality: Cardinality) -> None:
+        self._stream.append(CARDINALITY_CODES[(cardinality.min_cardinality, cardinality.max_cardinality)])
+
+    def _write_attributes(self, attributes: list[Attribute]) -> None:
+        self._stream.append(len(attributes))
+        for attribute in attributes:
+            if isinstance(attribute, CompositeAttribute):
+                self._stream.append(COMPOSITE_ATTRIBUTE)
+            else:
+                self._stream.append(SIMPLE_ATTRIBUTE)
+            self._write_string(attribute.name)
+            self._write_cardinality(attribute.cardinality)
+            self._write_flag(attribute.is_unique)
+            if isinstance(attribute, CompositeAttribute):
+                self._write_attributes(attribute.simple_attributes)
+
+    def _write_entity(self, entity_key: str, entity: Entity) -> None:
+        self._write_string(entity_key)
+        self._write_string(entity.name)
+        self._write_optional_string(entity.strong_entity)
+        hierarchy = entity.hierarchy
+        if hierarchy:
+            self._stream.append(HIERARCHY_CODES[(hierarchy.hierarchy_completeness, hierarchy.hierarchy_disjointness)])
+            self._stream.append(len(hierarchy.children))
+            for child_name in hierarchy.children:
+                self._write_string(child_name)
+        else:
+            self._stream.append(NONE)
+        self._write_attributes(entity.identifiers)
+        self._write_attributes(entity.attributes)
+
+    def _write_relationship(self, relationship_key: str, relationship: Relationship) -> None:
+        self._write_string(relationship_key)
+        self._write_string(relationship.name)
+        self._write_string(relationship.entity_from)
+        self._write_string(relationship.entity_to)
+        self._write_cardinality(relationship.cardinality_from)
+        self._write_cardinality(relationship.cardinality_to)
+        self._write_attributes(relationship.attributes)
+
+
+class _ModelReader:
+    def __init__(self, data: bytes):
+        if len(data) < HEADER.size:
+            raise ModelFormatException()
+        magic, version, strings_count, blob_size, stream_size = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ModelFormatException()
+        if version != FORMAT_VERSION:
+            raise ModelFormatException(f"Unsupported conceptual model format version {version}!")
+
+        lengths_start = HEADER.size
+        blob_start = lengths_start + 4 * strings_count
+        stream_start = blob_start + blob_size
+        if len(data) != stream_start + 4 * stream_size:
+            raise ModelFormatException("Truncated conceptual model file!")
+
+        lengths = array("I")
+        lengths.frombytes(data[lengths_start:blob_start])
+        try:
+            blob = data[blob_start:stream_start].decode("utf-8")
+        except UnicodeDecodeError:
+            raise ModelFormatException("Corrupted conceptual model file!")
+        lengths = _to_little_endian(lengths)
+        if sum(lengths) != len(blob):
+            raise ModelFormatException("Corrupted conceptual model file!")
+        stream = array("I")
+        stream.frombytes(data[stream_start:])
+
+        self._strings = []
+        offset = 0
+        for length in lengths:
+            self._strings.append(sys.intern(blob[offset:offset + length]))
+            offset += length
+        self._stream = iter(_to_little_endian(stream))
+        self._next = self._stream.__next__
+
+    def read_model(self) -> tuple[dict[str, Entity], dict[str, Relationship]]:
+        try:
+            entities = {}
+            for _ in range(self._next()):
+                entity_key, entity = self._read_entity()
+                entities[entity_key] = entity
+            relationships = {}
+            for _ in range(self._next()):
+                relationship_key, relationship = self._read_relationship()
+                relationships[relationship_key] = relationship
+        except (StopIteration, IndexError, KeyError, RecursionError):
+            raise ModelFormatException("Corrupted conceptual model file!")
+        if next(self._stream, None) is not None:
+            # the counts do not describe the whole stream
+            raise ModelFormatException("Corrupted conceptual model file!")
+        return entities, relationships
+
+    def _read_string(self) -> str:
+        return self._strings[self._next()]
+
+    def _read_optional_string(self) -> str:
+        index = self._next()
+        return None if index == NONE else self._strings[index - 1]
+
+    def _read_flag(self):
+        flag = self._next()
+        return None if flag == NONE else flag == TRUE
+
+    def _read_cardinality(self) -> Cardinality:
+        min_cardinality, max_cardinality = CARDINALITIES[self._next()]
+        return Cardinality(min_cardinality, max_cardinality)
+
+    def _read_attributes(self) -> list[Attribute]:
+        attributes = []
+        for _ in range(self._next()):
+            kind = self._next()
+            name = self._read_string()
+            cardinality = self._read_cardinality()
+            is_unique = self._read_flag()
+            if kind == COMPOSITE_ATTRIBUTE:
+                attribute = CompositeAttribute(name, cardinality, is_unique)
+                for simple_attribute in self._read_attributes():
+                    attribute.add_simple_attribute(simple_attribute)
+            else:
+                attribute = Attribute(name, cardinality, is_unique)
+            attributes.append(attribute)
+        return attributes
+
+    def _read_entity(self) -> tuple[str, Entity]:
+        entity_key = self._read_string()
+        entity = Entity(self._read_string())
+        strong_entity = self._read_optional_string()
+        if strong_entity is not None:
+            entity.set_strong_entity(strong_entity)
+        hierarchy_code = self._next()
+        if hierarchy_code != NONE:
+            completeness, disjointness = HIERARCHIES[hierarchy_code]
+            hierarchy = Hierarchy(completeness, disjointness)
+            for _ in range(self._next()):
+                hierarchy.add_child(self._read_string())
+            entity.set_hierarchy(hierarchy)
+        for identifier in self._read_attributes():
+            entity.add_identifier(identifier)
+        for attribute in self._read_attributes():
+            entity.add_attribute(attribute)
+        return entity_key, entity
+
+    def _read_relationship(self) -> tuple[str, Relationship]:
+        relationship_key = self._read_string()
+        name = self._read_string()
+        entity_from = self._read_string()
+        entity_to = self._read_string()
+        cardinality_from = self._read_cardinality()
+        cardinality_to = self._read_cardinality()
+        relationship = Relationship(name, entity_from, entity_to, cardinality_from, cardinality_to)
+        for attribute in self._read_attributes():
+            relationship.add_attribute(attribute)
+        return relationship_key, relationship
+
+
+def dumps_model(entities: dict[str, Entity], relationships: dict[str, Relationship]) -> bytes:
+    """Serialize a whole conceptual model into the versioned binary format."""
+    return _ModelWriter().write_model(entities, relationships)
+
+def loads_model(data: bytes) -> tuple[dict[str, Entity], dict[str, Relationship]]:
+    """Rebuild the entities and relationships dicts serialized by dumps_model."""
+    return _ModelReader(data).read_model()
+
+def dump_model(entities: dict[str, Entity], relationships: dict[str, Relationship], file_path: str) -> None:
+    with open(file_path, 'wb') as file:
+        file.write(dumps_model(entities, relationships))
+
+def load_model(file_path: str) -> tuple[dict[str, Entity], dict[str, Relationship]]:
+    with open(file_path, 'rb') as file:
+        return loads_model(file.read())
+
+def fingerprint_model(entities: dict[str, Entity], relationships: dict[str, Relationship]) -> str:
+    """Hash of the serialized model, equal models have the same fingerprint."""
+    return hashlib.sha256(dumps_model(entities, relationships)).hexdigest()
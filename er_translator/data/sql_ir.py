@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+
+# Dialect neutral description of the generated SQL statements.
+# Nodes only hold names and values, renderers (see translation/sql_renderer.py) turn them into text.
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    is_optional: bool
+    is_unique: bool = False
+
+@dataclass(frozen=True)
+class Reference:
+    column: Column
+    table_name: str
+    primary_key: str
+
+@dataclass(frozen=True)
+class Selector:
+    """Column telling which children of a collapsed hierarchy a row belongs to."""
+    name: str
+    values: tuple[str, ...]
+
+@dataclass(frozen=True)
+class NullCheck:
+    column: str
+    is_null: bool
+
+@dataclass(frozen=True)
+class RowCondition:
+    """
+    All null checks hold for a row.
+
+    With a selector the condition is about the rows whose selector has selector_value.
+    """
+    null_checks: tuple[NullCheck, ...]
+    selector_name: str = None
+    selector_value: str = None
+
+@dataclass(frozen=True)
+class AnySelectorSet:
+    """At least one of the selector flags of an overlapping hierarchy is set."""
+    selector_names: tuple[str, ...]
+
+@dataclass(frozen=True)
+class Check:
+    name: str
+    # a row must satisfy at least one of the conditions
+    conditions: tuple[RowCondition | AnySelectorSet, ...]
+
+@dataclass(frozen=True)
+class CreateTable:
+    name: str
+    columns: tuple[Column, ...]
+    selectors: tuple[Selector, ...]
+    references: tuple[Reference, ...]
+    primary_keys: tuple[str, ...]
+    checks: tuple[Check, ...]
+
+@dataclass(frozen=True)
+class Trigger:
+    name: str
+    table_name: str
+
+@dataclass(frozen=True)
+class ParentTrigger(Trigger):
+    """
+    Reject a row that does not reference a parent row of the right child type.
+
+    key_columns pairs every parent primary key with the new row column referencing it.
+    With other_selector_name the check only applies when the new row has other_selector_value.
+    identifier_modifier tells apart the triggers of the two sides of a recursive relationship,
+    which share their name in the default dialect.
+    """
+    parent_table_name: str
+    child_name: str
+    key_columns: tuple[tuple[str, str], ...]
+    selector_name: str
+    selector_value: str
+    other_selector_name: str = None
+    other_selector_value: str = None
+    identifier_modifier: str = ""
+
+@dataclass(frozen=True)
+class ExclusionTrigger(Trigger):
+    """Reject a row whose key columns already exist in other_table_name."""
+    other_table_name: str
+    key_columns: tuple[str, ...]
+    message: str
@@ -0,0 +1,60 @@
+DEFAULT_ROWS = 1000
+# bytes of a column value when no width is known
+DEFAULT_WIDTH = 8
+# bytes of the header every row carries, as in PostgreSQL
+DEFAULT_ROW_OVERHEAD = 24
+
+class Statistics:
+    """Row counts, null ratios and average value widths of the entities and relationships of a model."""
+    def __init__(self, default_rows: int = DEFAULT_ROWS, default_width: float = DEFAULT_WIDTH, row_overhead: int = DEFAULT_ROW_OVERHEAD):
+        self._rows = {}
+        self._null_ratios = {}
+        self._widths = {}
+        self._default_rows = default_rows
+        self._default_width = default_width
+        self._row_overhead = row_overhead
+
+    @property
+    def default_rows(self):
+        return self._default_rows
+
+    @property
+    def default_width(self):
+        return self._default_width
+
+    @property
+    def row_overhead(self):
+        return self._row_overhead
+
+    def set_default_rows(self, default_rows: int) -> None:
+        self._default_rows = default_rows
+
+    def set_default_width(self, default_width: float) -> None:
+        self._default_width = default_width
+
+    def set_row_overhead(self, row_overhead: int) -> None:
+        self._row_overhead = row_overhead
+
+    def set_rows(self, name: str, rows: int) -> None:
+        self._rows[name] = rows
+
+    def set_null_ratio(self, name: str, attribute_name: str, null_ratio: float) -> None:
+        self._null_ratios[(name, attribute_name)] = null_ratio
+
+    def set_width(self, name: str, attribute_name: str, width: float) -> None:
+        self._widths[(name, attribute_name)] = width
+
+    def has_rows(self, name: str) -> bool:
+        return name in self._rows
+
+    def has_width(self, name: str, attribute_name: str) -> bool:
+        return (name, attribute_name) in self._widths
+
+    def get_rows(self, name: str) -> int:
+        return self._rows.get(name, self._default_rows)
+
+    def get_null_ratio(self, name: str, attribute_name: str) -> float:
+        return self._null_ratios.get((name, attribute_name), 0)
+
+    def get_width(self, name: str, attribute_name: str) -> float:
+        return self._widths.get((name, attribute_name), self._default_width)
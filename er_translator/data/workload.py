@@ -0,0 +1,56 @@
+DEFAULT_ROWS = 1000
+# a join is charged like reading this many rows
+DEFAULT_JOIN_COST = 100
+
+class AccessPath:
+    """Entities read together by one application query, and how often the query runs."""
+    __slots__ = ("_entities", "_frequency", "_name")
+
+    def __init__(self, entities: list[str], frequency: float, name: str = None):
+        self._entities = entities
+        self._frequency = frequency
+        self._name = name if name else " -> ".join(entities)
+
+    @property
+    def entities(self):
+        return self._entities
+
+    @property
+    def frequency(self):
+        return self._frequency
+
+    @property
+    def name(self):
+        return self._name
+
+class Workload:
+    def __init__(self, join_cost: float = DEFAULT_JOIN_COST, default_rows: int = DEFAULT_ROWS):
+        self._access_paths = []
+        self._rows = {}
+        self._join_cost = join_cost
+        self._default_rows = default_rows
+
+    @property
+    def access_paths(self):
+        return self._access_paths
+
+    @property
+    def rows(self):
+        return self._rows
+
+    @property
+    def join_cost(self):
+        return self._join_cost
+
+    @property
+    def default_rows(self):
+        return self._default_rows
+
+    def add_access_path(self, access_path: AccessPath) -> None:
+        self._access_paths.append(access_path)
+
+    def set_rows(self, entity_name: str, rows: int) -> None:
+        self._rows[entity_name] = rows
+
+    def get_rows(self, entity_name: str) -> int:
+        return self._rows.get(entity_name, self._default_rows)
@@ -1,4 +1,37 @@
 class NoHierarchyExcpetion(Exception):
     def __init__(self, message="This entity has no hierarchy!"):
         self.message = message
-        super().__init__(self.message)
\ No newline at end of file
+        super().__init__(self.message)
+
+class OrphanNodeException(Exception):
+    def __init__(self, node_id: str, parent_id: str):
+        self.node_id = node_id
+        self.parent_id = parent_id
+        self.message = f"Node {node_id} references missing parent {parent_id}!"
+        super().__init__(self.message)
+
+class CyclicNodeException(Exception):
+    def __init__(self, node_ids: list[str]):
+        self.node_ids = node_ids
+        self.message = f"Nodes {', '.join(node_ids)} form a parent cycle!"
+        super().__init__(self.message)
+
+class ModelFormatException(Exception):
+    def __init__(self, message="This is not a supported conceptual model file!"):
+        self.message = message
+        super().__init__(self.message)
+
+class WorkloadFormatException(Exception):
+    def __init__(self, message="This is not a supported workload file!"):
+        self.message = message
+        super().__init__(self.message)
+
+class StatisticsFormatException(Exception):
+    def __init__(self, message="This is not a supported statistics file!"):
+        self.message = message
+        super().__init__(self.message)
+
+class DiagramFormatException(Exception):
+    def __init__(self, message="This is not a supported ERDPlus diagram file!"):
+        self.message = message
+        super().__init__(self.message)
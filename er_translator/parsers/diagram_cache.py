@@ -0,0 +1,94 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from ..data.serialization import dumps_model, loads_model
+from ..exceptions.exceptions import ModelFormatException
+
+DEFAULT_CACHE_DIR = Path.home().joinpath(".cache").joinpath("er_translator")
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+CACHE_SUFFIX = ".model"
+READ_SIZE = 1 << 20
+
+class DiagramCache:
+    """
+    On-disk cache of parsed conceptual models.
+
+    Entries are keyed by the hash of the diagram file contents and the parser
+    version, so an edited file or a new parser never returns a stale model.
+    When the cache grows past max_size bytes the least recently used entries
+    are evicted, a hit refreshes the entry modification time.
+    """
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_size: int = DEFAULT_MAX_SIZE):
+        self._cache_dir = Path(cache_dir)
+        self._max_size = max_size
+
+    @property
+    def cache_dir(self):
+        return self._cache_dir
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    def get_key(self, file_path: str, parser_version: str) -> str:
+        digest = hashlib.sha256(parser_version.encode())
+        with open(file_path, 'rb') as file:
+            while chunk := file.read(READ_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def load(self, key: str):
+        """Return the cached (entities, relationships) for key, or None on a miss."""
+        entry_path = self._get_entry_path(key)
+        try:
+            with open(entry_path, 'rb') as file:
+                entities, relationships = loads_model(file.read())
+        except FileNotFoundError:
+            return None
+        except ModelFormatException:
+            # corrupted or outdated entry
+            entry_path.unlink(missing_ok=True)
+            return None
+        os.utime(entry_path)
+        return entities, relationships
+
+    def store(self, key: str, entities: dict, relationships: dict) -> None:
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first so readers never see a partial entry
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self._cache_dir)
+        try:
+            with os.fdopen(file_descriptor, 'wb') as file:
+                file.write(dumps_model(entities, relationships))
+            os.replace(temporary_path, self._get_entry_path(key))
+        except BaseException:
+            Path(temporary_path).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+    def clear(self) -> None:
+        for entry_path in self._cache_dir.glob("*" + CACHE_SUFFIX):
+            entry_path.unlink(missing_ok=True)
+
+    def _get_entry_path(self, key: str) -> Path:
+        return self._cache_dir.joinpath(key + CACHE_SUFFIX)
+
+    def _evict(self) -> None:
+        entries = []
+        total_size = 0
+        for entry_path in self._cache_dir.glob("*" + CACHE_SUFFIX):
+            try:
+                entry_stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((entry_stat.st_mtime, entry_stat.st_size, entry_path))
+            total_size += entry_stat.st_size
+
+        # least recently used first
+        entries.sort()
+        for _, entry_size, entry_path in entries:
+            if total_size <= self._max_size:
+                break
+            entry_path.unlink(missing_ok=True)
+            total_size -= entry_size
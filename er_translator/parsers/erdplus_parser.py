@@ -1,10 +1,22 @@
 import json
-from collections import deque
+import sys
 
 from ..data.conceptual import *
+from ..exceptions.exceptions import OrphanNodeException, CyclicNodeException, DiagramFormatException
+from .json_stream import JSONStreamReader
+from .diagram_cache import DiagramCache
+
+# bump whenever the parsed model changes, so cached models are not reused
+PARSER_VERSION = "1"
+
+# only these fields of an ERDPlus node are read by the parser, layout data is dropped
+NODE_FIELDS = ("id", "type", "parentId")
+NODE_DATA_FIELDS = ("label", "type", "parentId", "totalSpecialization", "supertypeDefinition", "types", "isIdentifying")
+ENTITY_DETAILS_FIELDS = ("id", "minCardinality", "maxCardinality")
 
 class ERDPLUS_Parser:
-    def __init__(self):
+    def __init__(self, cache: DiagramCache = None):
+        self._cache = cache
         self._json_data = {}
         self._entities = {}
         self._relationships = {}
@@ -13,9 +25,9 @@ class ERDPLUS_Parser:
         self._relationship_ids = {}
         self._attribute_ids = {}
 
-        self._json_entities = deque()
-        self._json_relationships = deque()
-        self._json_attributes = deque()
+        self._json_entities = []
+        self._json_relationships = []
+        self._json_attributes = []
 
     @property
     def entities(self):
@@ -25,10 +37,34 @@ class ERDPLUS_Parser:
     def relationships(self):
         return self._relationships
     
-    def parse_erdplus_diagram(self, file_path: str):
-        self._load_json_data(file_path)
-        # separate nodes
-        self._separate_nodes()
+    def parse_erdplus_diagram(self, file_path: str, streaming: bool = False):
+        """
+        Parse the diagram at file_path into entities and relationships.
+
+        Raise OSError if the file cannot be read and DiagramFormatException if it
+        is not an ERDPlus diagram, a model is cached only when parsing succeeds.
+        """
+        if self._cache is None:
+            self._parse_erdplus_diagram(file_path, streaming)
+            return
+
+        cache_key = self._cache.get_key(file_path, PARSER_VERSION)
+        cached_model = self._cache.load(cache_key)
+        if cached_model:
+            self._entities, self._relationships = cached_model
+            return
+
+        self._parse_erdplus_diagram(file_path, streaming)
+        self._cache.store(cache_key, self._entities, self._relationships)
+
+    def _parse_erdplus_diagram(self, file_path: str, streaming: bool):
+        if streaming:
+            # load and separate nodes one at a time
+            self._stream_nodes(file_path)
+        else:
+            self._load_json_data(file_path)
+            # separate nodes
+            self._separate_nodes()
 
         # parse entities
         self._parse_entities()
@@ -40,47 +76,70 @@ class ERDPLUS_Parser:
         self._parse_attributes()
 
     def _load_json_data(self, file_path: str):
-        try:
-            with open(file_path, 'r') as file:
+        with open(file_path, 'r') as file:
+            try:
                 data = json.load(file)
-                self._json_data = data
-        except FileNotFoundError as e:
-            print(e.strerror)
-        except json.JSONDecodeError as e: 
-            print(e.strerror)
+            except json.JSONDecodeError as e:
+                raise DiagramFormatException(f"{file_path}: {e.msg}") from e
+        if not isinstance(data, dict) or not isinstance(data.get("data"), dict) or not isinstance(data["data"].get("nodes"), list):
+            raise DiagramFormatException(f"{file_path}: no data.nodes array")
+        if not all(isinstance(node, dict) for node in data["data"]["nodes"]):
+            raise DiagramFormatException(f"{file_path}: data.nodes holds a node that is not an object")
+        self._json_data = data
         
+    def _stream_nodes(self, file_path: str):
+        with open(file_path, 'r') as file:
+            try:
+                for node in JSONStreamReader(file).iter_path(["data", "nodes"]):
+                    if not isinstance(node, dict):
+                        raise DiagramFormatException(f"{file_path}: data.nodes holds a node that is not an object")
+                    self._add_node(self._compact_node(node))
+            except json.JSONDecodeError as e:
+                raise DiagramFormatException(f"{file_path}: {e.msg}") from e
+            except KeyError as e:
+                raise DiagramFormatException(f"{file_path}: no data.nodes array") from e
+
     def _separate_nodes(self):
-        for node in self._json_data.get("data").get("nodes"):
-            node_type = node.get("type")
-            if node_type == "Entity":
-                self._json_entities.append(node)
-            elif node_type == "Relationship":
-                self._json_relationships.append(node)
-            elif node_type == "Attribute":
-                self._json_attributes.append(node)
+        for node in self._json_data["data"]["nodes"]:
+            self._add_node(node)
+        # the raw document is no longer needed
+        self._json_data = {}
+
+    def _add_node(self, node):
+        node_type = node.get("type")
+        if node_type == "Entity":
+            self._json_entities.append(node)
+        elif node_type == "Relationship":
+            self._json_relationships.append(node)
+        elif node_type == "Attribute":
+            self._json_attributes.append(node)
+
+    def _compact_node(self, node):
+        compact_node = {field: node[field] for field in NODE_FIELDS if field in node}
+        node_data = node.get("data", {})
+        compact_data = {field: node_data[field] for field in NODE_DATA_FIELDS if field in node_data}
+        for details in ("sourceEntityDetails", "targetEntityDetails"):
+            if details in node_data:
+                compact_data[details] = {field: node_data[details].get(field) for field in ENTITY_DETAILS_FIELDS}
+        compact_node["data"] = compact_data
+        return compact_node
 
     def _parse_entities(self):
-        while self._json_entities:
-            json_entity = self._json_entities.popleft()
-            entity_data = json_entity.get("data")
-            parent_id = entity_data.get("parentId")
-            if parent_id and parent_id not in self._entity_ids:
-                # current entity is a subtype and parent hasn't been created yet
-                # put it back in the queue
-                self._json_entities.append(json_entity)
-            else:
-                entity = self._create_entity(entity_data)
-                self._entities[entity.name] = entity
-                entity_id = json_entity.get("id")
-                self._entity_ids[entity_id] = entity
+        # subtypes are created after their supertype, whatever their position in the file
+        ordered_entities = self._order_by_parent(self._json_entities, lambda node: node.get("data").get("parentId"))
+        self._json_entities = []
+        for json_entity in ordered_entities:
+            entity = self._create_entity(json_entity.get("data"))
+            self._entities[entity.name] = entity
+            entity_id = json_entity.get("id")
+            self._entity_ids[entity_id] = entity
 
     def _parse_relationships(self):
-        while self._json_relationships:
-            json_relationship = self._json_relationships.popleft()
+        for json_relationship in self._json_relationships:
             relationship_id = json_relationship.get("id")
             json_data = json_relationship.get("data")
 
-            name = json_data.get("label")
+            name = sys.intern(json_data.get("label"))
             
             source_entity = json_data.get("sourceEntityDetails")
             source_entity_name = self._entity_ids[source_entity.get("id")].name
@@ -96,20 +155,17 @@ class ERDPLUS_Parser:
             relationship = Relationship(name, source_entity_name, target_entity_name, source_cardinality, target_cardinality)
             self._relationships[name] = relationship
             self._relationship_ids[relationship_id] = relationship
+        self._json_relationships = []
 
     def _parse_attributes(self):
-        while self._json_attributes:
-            json_attribute = self._json_attributes.popleft()
+        # simple attributes are created after their composite, whatever their position in the file
+        owner_ids = self._entity_ids.keys() | self._relationship_ids.keys()
+        ordered_attributes = self._order_by_parent(self._json_attributes, lambda node: node.get("parentId"), owner_ids)
+        self._json_attributes = []
+        for json_attribute in ordered_attributes:
             attribute_data = json_attribute.get("data")
             parent_id = json_attribute.get("parentId")
 
-            if parent_id not in self._entity_ids and parent_id not in self._relationship_ids and parent_id not in self._attribute_ids:
-                # Composite attribute not created yet
-                # put it back in the queue
-                
-                self._json_attributes.append(json_attribute)
-                continue
-            
             attribute = self._create_attribute(attribute_data)
             if parent_id in self._entity_ids:
                 # is an attribute of an entity
@@ -126,15 +182,55 @@ class ERDPLUS_Parser:
             elif parent_id in self._relationship_ids:
                 # is an attribute of a relationship
                 self._relationship_ids[parent_id].add_attribute(attribute)
-            else:
+            elif parent_id in self._attribute_ids:
                 # is a simple attribute of a composite
                 self._attribute_ids[parent_id].add_simple_attribute(attribute)
+            else:
+                raise OrphanNodeException(json_attribute.get("id"), parent_id)
                 
             attribute_id = json_attribute.get("id")
             self._attribute_ids[attribute_id] = attribute
 
+    def _order_by_parent(self, nodes: list[dict], get_parent_id, resolved_ids: set[str] = frozenset()) -> list[dict]:
+        """
+        Order nodes so that every node comes after its parent, in the order of the former retry queue, in linear time.
+
+        The queue went through the nodes in file order and put back at its end
+        every node whose parent was not created yet. A node is therefore created
+        in the same pass as its parent when it comes after it in the file, one
+        pass later otherwise, and the nodes of a pass keep their file order.
+        A parent is either one of the nodes or one of resolved_ids.
+        """
+        positions = {node.get("id"): position for position, node in enumerate(nodes)}
+        passes = [None] * len(nodes)
+        for position in range(len(nodes)):
+            # walk up to the first ancestor whose pass is known
+            chain = []
+            chain_positions = set()
+            current = position
+            while passes[current] is None:
+                parent_id = get_parent_id(nodes[current])
+                if not parent_id or parent_id in resolved_ids:
+                    passes[current] = 0
+                    break
+                if parent_id not in positions:
+                    raise OrphanNodeException(nodes[current].get("id"), parent_id)
+                if current in chain_positions:
+                    raise CyclicNodeException([nodes[chain_position].get("id") for chain_position in chain[chain.index(current):]])
+                chain.append(current)
+                chain_positions.add(current)
+                current = positions[parent_id]
+            for child in reversed(chain):
+                parent_position = positions[get_parent_id(nodes[child])]
+                passes[child] = passes[parent_position] + (1 if parent_position > child else 0)
+
+        nodes_by_pass = [[] for _ in range(max(passes, default=-1) + 1)]
+        for position, node in enumerate(nodes):
+            nodes_by_pass[passes[position]].append(node)
+        return [node for pass_nodes in nodes_by_pass for node in pass_nodes]
+
     def _create_entity(self, entity_data):
-        name = entity_data.get("label")
+        name = sys.intern(entity_data.get("label"))
         entity = Entity(name)
         entity_type = entity_data.get("type")
         if entity_type and entity_type == "Weak":
@@ -181,7 +277,7 @@ class ERDPLUS_Parser:
             entity_to.set_strong_entity(entity_from_name)
 
     def _create_attribute(self, attribute_data):
-        name = attribute_data.get("label")
+        name = sys.intern(attribute_data.get("label"))
         attribute_types = attribute_data.get("types")
         attribute_parameters = {} if isinstance(attribute_types, list) else attribute_types 
         min_cardinality = MinimumCardinality.ZERO if attribute_parameters.get("Optional") else MinimumCardinality.ONE
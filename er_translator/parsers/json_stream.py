@@ -0,0 +1,142 @@
+import json
+import re
+
+CHUNK_SIZE = 1 << 16
+WHITESPACE = " \t\n\r"
+STRUCTURAL = re.compile(r'["\\\[\]{}]')
+
+class JSONStreamReader:
+    """
+    Minimal pull reader over a JSON text file.
+
+    Only the containers on the path to the wanted values are walked, every
+    other value is skipped without being built, so the whole document is
+    never held in memory.
+    """
+    def __init__(self, file, chunk_size: int = CHUNK_SIZE):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        # drop what has already been consumed
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in WHITESPACE:
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                raise json.JSONDecodeError("Unexpected end of file", self._buffer, self._position)
+
+    def expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self._buffer, self._position)
+        self._position += 1
+
+    def read_value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                # the value may continue in the next chunk
+                if not self._fill():
+                    raise
+                continue
+            if end == len(self._buffer) and not self._eof and not isinstance(value, (dict, list, str)):
+                # a number or literal may be cut at the end of the buffer
+                self._fill()
+                continue
+            self._position = end
+            return value
+
+    def skip_value(self) -> None:
+        """Skip the value at the current position without building it."""
+        if self._peek() not in "{[":
+            self.read_value()
+            return
+        depth = 0
+        in_string = False
+        while True:
+            match = STRUCTURAL.search(self._buffer, self._position)
+            if not match:
+                self._position = len(self._buffer)
+                if not self._fill():
+                    raise json.JSONDecodeError("Unexpected end of file", self._buffer, self._position)
+                continue
+            char = match.group()
+            if char == "\\":
+                if match.end() == len(self._buffer):
+                    # the escaped character is in the next chunk
+                    self._position = match.start()
+                    if not self._fill():
+                        raise json.JSONDecodeError("Unexpected end of file", self._buffer, self._position)
+                    continue
+                self._position = match.end() + 1
+                continue
+            self._position = match.end()
+            if char == '"':
+                in_string = not in_string
+            elif not in_string:
+                depth += 1 if char in "{[" else -1
+                if depth == 0:
+                    return
+
+    def iter_object_keys(self):
+        """Yield the keys of the object at the current position, the caller must consume each value."""
+        self.expect("{")
+        if self._peek() == "}":
+            self._position += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            yield key
+            if self._peek() == ",":
+                self._position += 1
+            else:
+                self.expect("}")
+                return
+
+    def iter_array(self):
+        """Yield the elements of the array at the current position one at a time."""
+        self.expect("[")
+        if self._peek() == "]":
+            self._position += 1
+            return
+        while True:
+            yield self.read_value()
+            if self._peek() == ",":
+                self._position += 1
+            else:
+                self.expect("]")
+                return
+
+    def iter_path(self, path: list[str]):
+        """Yield the elements of the array found at path, skipping every other value, raise KeyError if path is missing."""
+        if not path:
+            yield from self.iter_array()
+            return
+        found = False
+        for key in self.iter_object_keys():
+            if key == path[0] and not found:
+                found = True
+                yield from self.iter_path(path[1:])
+            else:
+                self.skip_value()
+        if not found:
+            raise KeyError(path[0])
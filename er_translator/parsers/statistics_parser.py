@@ -0,0 +1,109 @@
+import csv
+import json
+
+from ..data.statistics import Statistics
+from ..exceptions.exceptions import StatisticsFormatException
+
+class StatisticsParser:
+    """
+    Parser of model statistics, from a JSON config file like:
+
+        {
+            "default_width": 8,
+            "entities": {
+                "Employee": {"rows": 50000, "null_ratios": {"Phone": 0.4}, "widths": {"Name": 24}}
+            },
+            "relationships": {"WorkOn": {"rows": 120000}}
+        }
+
+    or from sample CSV files of an entity, one column per attribute, read one row at a time.
+    Every parsed file or sample adds to the same statistics, later values replace earlier ones.
+    """
+    def __init__(self, statistics: Statistics = None):
+        self._statistics = statistics if statistics is not None else Statistics()
+
+    @property
+    def statistics(self):
+        return self._statistics
+
+    def parse_statistics(self, file_path: str) -> Statistics:
+        """Add the statistics of a JSON config file, on top of the ones parsed before."""
+        try:
+            with open(file_path, 'r') as file:
+                data = json.load(file)
+        except json.JSONDecodeError:
+            raise StatisticsFormatException()
+        if not isinstance(data, dict):
+            raise StatisticsFormatException()
+
+        for key, set_default in (("default_rows", self._statistics.set_default_rows), ("default_width", self._statistics.set_default_width), ("row_overhead", self._statistics.set_row_overhead)):
+            if key in data:
+                if not self._is_number(data[key]) or data[key] < 0:
+                    raise StatisticsFormatException(f"{key} must be a number not below 0!")
+                set_default(data[key])
+        for group in ("entities", "relationships"):
+            items = data.get(group, {})
+            if not isinstance(items, dict) or not all(isinstance(details, dict) for details in items.values()):
+                raise StatisticsFormatException(f"{group} must map names to their statistics!")
+            for name, details in items.items():
+                self._parse_details(name, details)
+        return self._statistics
+
+    def _parse_details(self, name: str, details: dict) -> None:
+        null_ratios = details.get("null_ratios", {})
+        widths = details.get("widths", {})
+        if "rows" in details and (not self._is_number(details["rows"]) or details["rows"] < 0):
+            raise StatisticsFormatException(f"Rows of {name} must be a number not below 0!")
+        if not isinstance(null_ratios, dict) or not all(self._is_number(null_ratio) and 0 <= null_ratio <= 1 for null_ratio in null_ratios.values()):
+            raise StatisticsFormatException(f"Null ratios of {name} must be numbers between 0 and 1!")
+        if not isinstance(widths, dict) or not all(self._is_number(width) and width >= 0 for width in widths.values()):
+            raise StatisticsFormatException(f"Widths of {name} must be numbers not below 0!")
+
+        if "rows" in details:
+            self._statistics.set_rows(name, details["rows"])
+        for attribute_name, null_ratio in null_ratios.items():
+            self._statistics.set_null_ratio(name, attribute_name, null_ratio)
+        for attribute_name, width in widths.items():
+            self._statistics.set_width(name, attribute_name, width)
+
+    def _is_number(self, value) -> bool:
+        # bool is an int, but true is not a row count
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    def parse_csv_sample(self, name: str, file_path: str, rows: int = None) -> Statistics:
+        """
+        Add the statistics of an entity or relationship measured on a sample CSV file.
+
+        Empty cells count as NULL, widths are the average size of the other values.
+        The row count is the number of sample rows, unless rows is given.
+        """
+        sample_rows = 0
+        null_counts = None
+        width_sums = None
+        with open(file_path, 'r', newline='') as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if header is None:
+                raise StatisticsFormatException(f"Sample file {file_path} has no header!")
+            null_counts = [0] * len(header)
+            width_sums = [0] * len(header)
+            for row in reader:
+                sample_rows += 1
+                for column, value in enumerate(row[:len(header)]):
+                    if value == "":
+                        null_counts[column] += 1
+                    else:
+                        width_sums[column] += len(value.encode())
+                # missing trailing cells are NULL too
+                for column in range(len(row), len(header)):
+                    null_counts[column] += 1
+
+        self._statistics.set_rows(name, rows if rows is not None else sample_rows)
+        if sample_rows == 0:
+            return self._statistics
+        for column, attribute_name in enumerate(header):
+            self._statistics.set_null_ratio(name, attribute_name, null_counts[column] / sample_rows)
+            non_null_count = sample_rows - null_counts[column]
+            if non_null_count:
+                self._statistics.set_width(name, attribute_name, width_sums[column] / non_null_count)
+        return self._statistics
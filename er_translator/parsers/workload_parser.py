@@ -0,0 +1,79 @@
+import json
+import re
+
+from ..data.workload import Workload, AccessPath, DEFAULT_JOIN_COST, DEFAULT_ROWS
+from ..exceptions.exceptions import WorkloadFormatException
+
+# "10k/s", "2.5M", "300"
+FREQUENCY_PATTERN = re.compile(r"^\s*([0-9]*\.?[0-9]+)\s*([kKmM]?)\s*(/\s*s)?\s*$")
+FREQUENCY_MULTIPLIERS = {"": 1, "k": 1000, "m": 1000000}
+
+class WorkloadParser:
+    """
+    Parser of workload files, JSON documents like:
+
+        {
+            "join_cost": 100,
+            "rows": {"Employee": 50000, "Manager": 200},
+            "access_paths": [
+                {"name": "Employee with Manager attributes", "entities": ["Employee", "Manager"], "frequency": 20},
+                {"entities": ["Order", "Customer"], "frequency": "10k/s"}
+            ]
+        }
+
+    join_cost and rows are optional, entities without rows get default_rows.
+    """
+    def __init__(self):
+        self._workload = None
+
+    @property
+    def workload(self):
+        return self._workload
+
+    def parse_workload(self, file_path: str) -> Workload:
+        try:
+            with open(file_path, 'r') as file:
+                data = json.load(file)
+        except json.JSONDecodeError:
+            raise WorkloadFormatException()
+        if not isinstance(data, dict) or not isinstance(data.get("access_paths"), list):
+            raise WorkloadFormatException("The workload file has no access_paths list!")
+
+        join_cost = data.get("join_cost", DEFAULT_JOIN_COST)
+        default_rows = data.get("default_rows", DEFAULT_ROWS)
+        rows = data.get("rows", {})
+        if not self._is_number(join_cost) or not self._is_number(default_rows):
+            raise WorkloadFormatException("join_cost and default_rows must be numbers!")
+        if not isinstance(rows, dict) or not all(self._is_number(entity_rows) for entity_rows in rows.values()):
+            raise WorkloadFormatException("rows must map entity names to numbers!")
+
+        self._workload = Workload(join_cost, default_rows)
+        for entity_name, entity_rows in rows.items():
+            self._workload.set_rows(entity_name, entity_rows)
+        for access_path in data["access_paths"]:
+            entities = access_path.get("entities") if isinstance(access_path, dict) else None
+            if not entities:
+                raise WorkloadFormatException(f"Access path {access_path} has no entities!")
+            if not isinstance(entities, list) or not all(isinstance(entity_name, str) for entity_name in entities):
+                raise WorkloadFormatException(f"Access path {access_path} entities must be a list of entity names!")
+            name = access_path.get("name")
+            if name is not None and not isinstance(name, str):
+                raise WorkloadFormatException(f"Access path {access_path} name must be a string!")
+            frequency = self._parse_frequency(access_path.get("frequency", 1))
+            self._workload.add_access_path(AccessPath(entities, frequency, name))
+        return self._workload
+
+    def _is_number(self, value) -> bool:
+        # bool is an int, but true is not a row count
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    def _parse_frequency(self, frequency) -> float:
+        if self._is_number(frequency):
+            return frequency
+        if not isinstance(frequency, str):
+            raise WorkloadFormatException(f"Invalid access path frequency {frequency}!")
+        match = FREQUENCY_PATTERN.match(str(frequency))
+        if match is None:
+            raise WorkloadFormatException(f"Invalid access path frequency {frequency}!")
+        value, multiplier, _ = match.groups()
+        return float(value) * FREQUENCY_MULTIPLIERS[multiplier.lower()]
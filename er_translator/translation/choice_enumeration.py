@@ -0,0 +1,291 @@
+import hashlib
+import itertools
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from ..data.choices import RELATIONSHIP_CHOICE
+from ..data.conceptual import Entity, Relationship, MinimumCardinality, MaximumCardinality
+from ..data.serialization import dumps_model, loads_model
+from .er_translation import ERTranslator
+from .incremental_translation import split_into_components, merge_component_statements
+from .pipeline import TranslationPipeline
+from .sql_writer import join_sql_code
+from ..utils.utils import get_relational_metrics, fingerprint_tables
+
+DEFAULT_CHUNK_SIZE = 16
+VARIANTS_FILE = "variants.jsonl"
+
+# component translators of the worker process, created once by _init_worker
+_worker_translators = None
+
+def _init_worker(model_data: bytes) -> None:
+    global _worker_translators
+    _worker_translators = [ERTranslator(*component) for component in split_into_components(*loads_model(model_data))]
+
+def _translate_chunk(chunk: list[tuple[int, int, tuple[dict, dict, dict]]]) -> list[tuple]:
+    results = []
+    for component, count, choices in chunk:
+        results.append((component, count, choices) + _translate_variant(_worker_translators[component], choices))
+    return results
+
+def _translate_variant(translator: ERTranslator, choices: tuple[dict, dict, dict]) -> tuple:
+    """Return (fingerprint, metrics, (table statements, triggers, order keys), error) of one variant of a component."""
+    try:
+        translated = translator.translate_model(*choices)
+    except Exception as e:
+        return None, None, None, f"{type(e).__name__}: {e}"
+    fingerprint = fingerprint_tables(translated.tables, translated.hierarchy_checks)
+    metrics = get_relational_metrics(translated.tables, translated.hierarchy_checks)
+    statements = translated.create_sql_statements() + (translated.create_order_keys(),)
+    return fingerprint, metrics, statements, None
+
+def _count_options(choices: dict) -> int:
+    count = 1
+    for item_choices in choices.values():
+        count *= len(item_choices)
+    return count
+
+def _sorted_options(item_choices: set) -> list:
+    return sorted(item_choices, key=lambda item_choice: item_choice.value)
+
+def _iter_products(choices: dict):
+    keys = list(choices)
+    for combination in itertools.product(*(_sorted_options(choices[key]) for key in keys)):
+        yield dict(zip(keys, combination))
+
+def _resolve(merged_tables: dict[str, str], name: str) -> str:
+    while name in merged_tables:
+        name = merged_tables[name]
+    return name
+
+def _merges_tables(relationship: Relationship, choice: RELATIONSHIP_CHOICE = None) -> bool:
+    """Whether translating the relationship merges its two tables, as ERTranslator does."""
+    if relationship.cardinality_from.max_cardinality != MaximumCardinality.ONE or relationship.cardinality_to.max_cardinality != MaximumCardinality.ONE:
+        return False
+    if relationship.cardinality_from.min_cardinality == MinimumCardinality.ZERO and relationship.cardinality_to.min_cardinality == MinimumCardinality.ZERO:
+        return False
+    return choice is None or choice == RELATIONSHIP_CHOICE.MERGE_INTO_SINGLE_TABLE
+
+
+class ChoiceEnumerator:
+    """
+    Enumerate the relational models of every combination of composite attribute, hierarchy and relationship choices.
+
+    The model is split into independent components (see split_into_components),
+    and only the choices of each component are combined and translated, so the
+    work grows with the sum of the component choice spaces, not their product.
+    Within a component, relationship choices that cannot change the model are
+    not enumerated: those of relationships replaced by the hierarchy elimination,
+    and of relationships whose entities the previous relationships merged into
+    one table, translated as recursive whatever the choice.
+
+    Component variants are translated in chunks by a process pool, at most a few
+    chunks in flight. Variants of a component producing the same relational model
+    are kept once, and every combination of the distinct component models is
+    streamed to disk: one line per model in variants.jsonl, with how many choice
+    combinations produce it, and one SQL file per model.
+    """
+    def __init__(self, entities: dict[str, Entity], relationships: dict[str, Relationship], max_workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self._entities = entities
+        self._relationships = relationships
+        self._max_workers = max_workers
+        self._chunk_size = chunk_size
+        self._entity_positions = {entity_name: position for position, entity_name in enumerate(entities)}
+        self._relationship_positions = {relationship_name: position for position, relationship_name in enumerate(relationships)}
+        self._components = split_into_components(entities, relationships)
+        self._components_choices = []
+        for component_entities, component_relationships in self._components:
+            translator = ERTranslator(component_entities, component_relationships)
+            self._components_choices.append((
+                translator.get_composite_attributes_choices(),
+                translator.get_hierarchy_choices(),
+                translator.get_relationship_choices(),
+            ))
+        self._choices = tuple(
+            {key: item_choices for component_choices in self._components_choices for key, item_choices in component_choices[position][0].items()}
+            for position in range(3)
+        )
+
+    @property
+    def variants_count(self):
+        count = 1
+        for choices in self._choices:
+            count *= _count_options(choices)
+        return count
+
+    @property
+    def components_count(self):
+        return len(self._components)
+
+    def iter_choices(self):
+        """Yield the (composite attributes, hierarchy, relationship) choice dicts of every combination."""
+        for composite_attributes_choices in _iter_products(self._choices[0]):
+            for hierarchy_choices in _iter_products(self._choices[1]):
+                for relationship_choices in _iter_products(self._choices[2]):
+                    yield composite_attributes_choices, hierarchy_choices, relationship_choices
+
+    def iter_component_choices(self, component: int):
+        """
+        Yield (combinations count, choices) of the variants of a component worth translating.
+
+        Relationship choices that cannot change the model keep their default, and
+        the count tells how many choice combinations the variant stands for.
+        """
+        (composite_choices, _), (hierarchy_choices, _), (relationship_choices, default_relationship_choices) = self._components_choices[component]
+        pipeline = TranslationPipeline(*self._components[component])
+        for composite_attributes_variant in _iter_products(composite_choices):
+            normalized_model = pipeline.normalize(composite_attributes_variant)
+            for hierarchy_variant in _iter_products(hierarchy_choices):
+                relationships = pipeline.eliminate_hierarchies(normalized_model, hierarchy_variant).relationships
+                # choices of relationships replaced by the hierarchy elimination are not used
+                removed_count = _count_options({relationship_name: item_choices for relationship_name, item_choices in relationship_choices.items() if relationship_name not in relationships})
+                for count, relationship_variant in self._iter_relationship_variants(list(relationships.values()), relationship_choices, 0, {}, {}):
+                    relationship_variant = {relationship_name: relationship_variant.get(relationship_name, default_choice) for relationship_name, default_choice in default_relationship_choices.items()}
+                    yield removed_count * count, (composite_attributes_variant, hierarchy_variant, relationship_variant)
+
+    def _iter_relationship_variants(self, relationships: list[Relationship], relationship_choices: dict, position: int, merged_tables: dict[str, str], variant: dict):
+        """
+        Yield (combinations count, relationship choices) from relationships[position:], in translation order.
+
+        A relationship between entities already merged into one table by the
+        previous ones is translated as recursive whatever its choice, so the
+        choice is left out of the variant and counted instead.
+        """
+        count = 1
+        while position < len(relationships):
+            relationship = relationships[position]
+            position += 1
+            table_from_name = _resolve(merged_tables, relationship.entity_from)
+            table_to_name = _resolve(merged_tables, relationship.entity_to)
+            item_choices = relationship_choices.get(relationship.name)
+            if table_from_name == table_to_name:
+                count *= len(item_choices) if item_choices else 1
+            elif not item_choices:
+                if _merges_tables(relationship):
+                    merged_tables = {**merged_tables, table_from_name: table_to_name}
+            else:
+                for choice in _sorted_options(item_choices):
+                    choice_merged_tables = {**merged_tables, table_from_name: table_to_name} if _merges_tables(relationship, choice) else merged_tables
+                    for variant_count, choice_variant in self._iter_relationship_variants(relationships, relationship_choices, position, choice_merged_tables, {**variant, relationship.name: choice}):
+                        yield count * variant_count, choice_variant
+                return
+        yield count, variant
+
+    def enumerate(self, output_dir: Path) -> dict[str, int]:
+        """
+        Write every distinct model to output_dir.
+
+        Return the number of choice combinations, of component variants translated,
+        of distinct models written and of combinations that failed to translate.
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        summary = {"variants": self.variants_count, "translated": 0, "distinct": 0, "failed": 0}
+        # component -> fingerprint -> [combinations count, choices, fingerprint, metrics, statements]
+        component_models = [{} for _ in self._components]
+        failed_records = []
+
+        for component, count, choices, fingerprint, metrics, statements, error in self._iter_results():
+            summary["translated"] += 1
+            if error is not None:
+                failed_records.append({"component": component, "choices": self._choices_to_json(choices), "combinations": count, "error": error})
+                continue
+            model = component_models[component].get(fingerprint)
+            if model is None:
+                component_models[component][fingerprint] = [count, choices, fingerprint, metrics, statements]
+            else:
+                model[0] += count
+
+        successful_count = self._product(sum(model[0] for model in models.values()) for models in component_models)
+        summary["failed"] = self.variants_count - successful_count
+
+        with open(output_dir.joinpath(VARIANTS_FILE), 'w') as variants_file:
+            for variant, models in enumerate(itertools.product(*(list(models.values()) for models in component_models))):
+                sql_file_name = f"variant_{variant}.sql"
+                table_statements, triggers = merge_component_statements(self._entity_positions, self._relationship_positions, [model[4] for model in models])
+                with open(output_dir.joinpath(sql_file_name), 'w') as sql_file:
+                    sql_file.write(join_sql_code(table_statements, triggers))
+                record = {
+                    "variant": variant,
+                    "choices": self._choices_to_json(self._merge_choices([model[1] for model in models])),
+                    "combinations": self._product(model[0] for model in models),
+                    "fingerprint": self._combine_fingerprints([model[2] for model in models]),
+                    "metrics": self._combine_metrics([model[3] for model in models]),
+                    "sql_file": sql_file_name,
+                }
+                variants_file.write(json.dumps(record) + "\n")
+                summary["distinct"] += 1
+            for record in failed_records:
+                variants_file.write(json.dumps(record) + "\n")
+        return summary
+
+    def _iter_work(self):
+        for component in range(len(self._components)):
+            for count, choices in self.iter_component_choices(component):
+                yield component, count, choices
+
+    def _iter_chunks(self):
+        chunk = []
+        for work in self._iter_work():
+            chunk.append(work)
+            if len(chunk) == self._chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _iter_results(self):
+        if self._max_workers == 1:
+            translators = [ERTranslator(*component) for component in self._components]
+            for component, count, choices in self._iter_work():
+                yield (component, count, choices) + _translate_variant(translators[component], choices)
+            return
+
+        max_workers = self._max_workers or os.cpu_count() or 1
+        # workers rebuild the model from its serialized form once, not for every chunk
+        model_data = dumps_model(self._entities, self._relationships)
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(model_data,)) as executor:
+            max_pending = 2 * max_workers
+            pending = deque()
+            for chunk in self._iter_chunks():
+                pending.append(executor.submit(_translate_chunk, chunk))
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def _merge_choices(self, components_choices: list[tuple[dict, dict, dict]]) -> tuple[dict, dict, dict]:
+        merged = ({}, {}, {})
+        for choices in components_choices:
+            for position in range(3):
+                merged[position].update(choices[position])
+        return merged
+
+    def _combine_fingerprints(self, fingerprints: list[str]) -> str:
+        if len(fingerprints) == 1:
+            return fingerprints[0]
+        return hashlib.sha256("".join(fingerprints).encode()).hexdigest()
+
+    def _combine_metrics(self, components_metrics: list[dict[str, int]]) -> dict[str, int]:
+        metrics = {}
+        for component_metrics in components_metrics:
+            for name, value in component_metrics.items():
+                metrics[name] = metrics.get(name, 0) + value
+        return metrics
+
+    def _product(self, counts) -> int:
+        product = 1
+        for count in counts:
+            product *= count
+        return product
+
+    def _choices_to_json(self, choices: tuple[dict, dict, dict]) -> dict:
+        composite_attributes_choices, hierarchy_choices, relationship_choices = choices
+        return {
+            "composite_attributes": [[entity_name, attribute_name, choice.name] for (entity_name, attribute_name), choice in composite_attributes_choices.items()],
+            "hierarchies": {entity_name: choice.name for entity_name, choice in hierarchy_choices.items()},
+            "relationships": {relationship_name: choice.name for relationship_name, choice in relationship_choices.items()},
+        }
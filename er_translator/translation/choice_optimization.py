@@ -0,0 +1,116 @@
+import itertools
+import math
+from typing import Callable
+
+from ..data.conceptual import Entity, Relationship
+from ..data.relational import Table
+from ..data.hierachy_checks import HierarchyChecks
+from .er_translation import ERTranslator
+from .incremental_translation import split_into_components
+from ..utils.utils import get_relational_metrics, get_neighbour_choices
+
+DEFAULT_COST_WEIGHTS = {"tables": 1, "foreign_keys": 1, "triggers": 1, "nullable_columns": 1}
+# components with at most this many combinations are searched exhaustively
+DEFAULT_EXHAUSTIVE_LIMIT = 256
+DEFAULT_MAX_EVALUATIONS = 2000
+
+def weighted_cost(weights: dict[str, float] = DEFAULT_COST_WEIGHTS) -> Callable[[dict[str, Table], HierarchyChecks], float]:
+    """Cost function summing the relational metrics (see get_relational_metrics) multiplied by their weight."""
+    def cost(tables: dict[str, Table], hierarchy_checks: HierarchyChecks) -> float:
+        metrics = get_relational_metrics(tables, hierarchy_checks)
+        return sum(weight * metrics[metric] for metric, weight in weights.items())
+    return cost
+
+
+class ChoiceOptimizer:
+    """
+    Pick the translation choices minimizing a cost function of the relational model.
+
+    Independent components of the model (see split_into_components) are searched
+    separately, so the cost function must add up over components, like weighted_cost.
+    Small components are searched exhaustively, the others by steepest descent
+    over single-choice changes, starting from the default choices and stopping
+    after max_evaluations translations. Choices whose translation fails cost infinity.
+    """
+    def __init__(self, entities: dict[str, Entity], relationships: dict[str, Relationship], cost_function=None, exhaustive_limit: int = DEFAULT_EXHAUSTIVE_LIMIT, max_evaluations: int = DEFAULT_MAX_EVALUATIONS):
+        self._components = [ERTranslator(component_entities, component_relationships) for component_entities, component_relationships in split_into_components(entities, relationships)]
+        self._cost_function = cost_function if cost_function is not None else weighted_cost()
+        self._exhaustive_limit = exhaustive_limit
+        self._max_evaluations = max_evaluations
+        self._cost = None
+
+    @property
+    def cost(self):
+        # total cost of the choices returned by the last optimize call
+        return self._cost
+
+    def optimize(self) -> tuple[dict, dict, dict]:
+        """Return the best (composite attributes, hierarchy, relationship) choices found."""
+        best_choices = ({}, {}, {})
+        self._cost = 0
+        for component in self._components:
+            component_choices, component_cost = self._optimize_component(component)
+            for position, choices in enumerate(component_choices):
+                best_choices[position].update(choices)
+            self._cost += component_cost
+        return best_choices
+
+    def _optimize_component(self, component: ERTranslator) -> tuple[tuple[dict, dict, dict], float]:
+        all_choices = (
+            component.get_composite_attributes_choices(),
+            component.get_hierarchy_choices(),
+            component.get_relationship_choices(),
+        )
+        options = tuple(choices for choices, _ in all_choices)
+        default_choices = tuple(default_choices for _, default_choices in all_choices)
+
+        combinations_count = math.prod(len(item_choices) for choices in options for item_choices in choices.values())
+        if combinations_count <= self._exhaustive_limit:
+            return self._search_exhaustively(component, options, default_choices)
+        return self._search_locally(component, options, default_choices)
+
+    def _evaluate(self, component: ERTranslator, choices: tuple[dict, dict, dict]) -> float:
+        try:
+            tables, hierarchy_checks = component.translate_tables(*choices)
+        except Exception:
+            return math.inf
+        return self._cost_function(tables, hierarchy_checks)
+
+    def _search_exhaustively(self, component: ERTranslator, options: tuple[dict, dict, dict], default_choices: tuple[dict, dict, dict]) -> tuple[tuple[dict, dict, dict], float]:
+        keys = []
+        item_options = []
+        for position, choices in enumerate(options):
+            for item_key, item_choices in choices.items():
+                keys.append((position, item_key))
+                item_options.append(sorted(item_choices, key=lambda item_choice: item_choice.value))
+
+        # ties keep the default choices
+        best_choices = default_choices
+        best_cost = self._evaluate(component, best_choices)
+        for combination in itertools.product(*item_options):
+            choices = ({}, {}, {})
+            for (position, item_key), choice in zip(keys, combination):
+                choices[position][item_key] = choice
+            cost = self._evaluate(component, choices)
+            if cost < best_cost:
+                best_choices, best_cost = choices, cost
+        return best_choices, best_cost
+
+    def _search_locally(self, component: ERTranslator, options: tuple[dict, dict, dict], default_choices: tuple[dict, dict, dict]) -> tuple[tuple[dict, dict, dict], float]:
+        best_choices = default_choices
+        best_cost = self._evaluate(component, best_choices)
+        evaluations = 1
+        improved = True
+        while improved and evaluations < self._max_evaluations:
+            improved = False
+            for neighbour in get_neighbour_choices(options, best_choices):
+                if evaluations >= self._max_evaluations:
+                    break
+                cost = self._evaluate(component, neighbour)
+                evaluations += 1
+                if cost < best_cost:
+                    best_neighbour, best_cost = neighbour, cost
+                    improved = True
+            if improved:
+                best_choices = best_neighbour
+        return best_choices, best_cost
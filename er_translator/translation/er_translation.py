@@ -1,57 +1,263 @@
+import logging
+
 from ..data.conceptual import MinimumCardinality, MaximumCardinality, Cardinality, HierarchyCompleteness, HierarchyDisjointness, Entity, Hierarchy, Relationship, Attribute as C_Attribute, CompositeAttribute
 from ..data.relational import Table, Attribute as R_Attribute, ForeignKey
 from ..data.choices import COMPOSITE_ATTRIBUTE_CHOICE, RELATIONSHIP_CHOICE, HIERARCHY_CHOICE
 from ..data.hierachy_checks import HierarchyChecks
+from ..data.sql_ir import Column, Reference, CreateTable, Trigger
+from ..data.relationship_index import RelationshipIndex
+from ..data.alias_resolver import AliasResolver
+from ..data.serialization import fingerprint_model
 from ..translation.hierarchy_translation import HierachyTranslator
-from ..translation.sql_generator import SQLGenerator
-from ..utils.utils import get_all_father_entities, retrieve_connected_relationships, retrieve_children_names, retrieve_all_hierarchy_relationships, change_relationships_entity
+from ..translation.sql_renderer import SQLRenderer, DEFAULT_RENDERER
+from ..translation.sql_writer import join_sql_code, iter_sql_code
+from ..translation.translation_cache import TranslationCache
+from ..utils.utils import get_all_father_entities, retrieve_children_names, retrieve_all_hierarchy_entities
+from ..utils.log import log_event
+
+logger = logging.getLogger(__name__)
+
+def create_statements(tables: dict[str, Table], hierarchy_checks: HierarchyChecks) -> tuple[list[CreateTable], list[Trigger]]:
+    """Describe the CREATE TABLE statements and the triggers as statement IR, without rendering them."""
+    statements = []
+    
+    for table_name, table in tables.items():
+        # Primary keys that are also foreign keys are declared with the references
+        columns = []
+        foreign_keys_names = [foreign_key.name for foreign_key in table.foreign_keys]
+        for primary_key in table.primary_keys:
+            if primary_key.name in foreign_keys_names:
+                continue
+            columns.append(Column(primary_key.name, primary_key.is_optional))
+        for attribute in table.attributes:
+            columns.append(Column(attribute.name, attribute.is_optional, attribute.is_unique))
+        
+        # Foreign key references
+        references = []
+        for foreign_key in table.foreign_keys:
+            column = Column(foreign_key.name, foreign_key.is_optional, foreign_key.is_unique)
+            references.append(Reference(column, foreign_key.table_ref.name, foreign_key.primary_key_ref.name))
+        
+        statements.append(CreateTable(
+            table_name,
+            tuple(columns),
+            tuple(hierarchy_checks.selectors.get(table_name, [])),
+            tuple(references),
+            tuple(primary_key.name for primary_key in table.primary_keys),
+            tuple(hierarchy_checks.constraints.get(table_name, []))
+        ))
+    
+    return statements, list(hierarchy_checks.triggers)
+
+def create_sql_statements(tables: dict[str, Table], hierarchy_checks: HierarchyChecks, renderer: SQLRenderer = DEFAULT_RENDERER) -> tuple[list[str], list[str]]:
+    """Generate the CREATE TABLE statements and the triggers, without joining them."""
+    table_statements, triggers = create_statements(tables, hierarchy_checks)
+    return list(renderer.render_statements(table_statements)), list(renderer.render_statements(triggers))
+
+TRANSLATING_MESSAGE = "\n Translating ER model..."
 
 class ERTranslator:
-    def __init__(self, entities: dict[str, Entity], relationships: dict[str, Relationship]):
+    def __init__(self, entities: dict[str, Entity], relationships: dict[str, Relationship], cache: TranslationCache = None):
         self._entities = entities
         self._relationships = relationships
+        self._cache = cache
+        self._model_fingerprint = None
+        # stages of translate, see the pipeline property
+        self._pipeline = None
+        # choices of the model, computed on first request
+        self._choices = {}
+        self._relationship_index = RelationshipIndex(relationships)
+        # bumped whenever entities are added or removed
+        self._entities_version = 0
+        self._hierarchy_entities = None
+        self._hierarchy_entities_key = None
         self._tables = {}
         self._hierarchy_checks = HierarchyChecks()
-        self._hierarchy_changes = {}
-
-    def translate(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> list[Table]:
-        print("\n Translating ER model...")
+        # entity name -> name of the table it was merged into by a one to one relationship
+        self._merged_entities = AliasResolver()
+        # child entity name -> father entity whose table holds it after collapsing upwards
+        self._collapsed_entities = AliasResolver()
+        # relationship copied for a child when collapsing downwards -> original relationship name
+        self._relationship_origins = {}
+        # where added entities, relationships and tables come from, see create_order_keys
+        self._added_entities: dict[str, str] = {}
+        self._added_relationships: dict[str, tuple[int, str]] = {}
+        self._table_steps: dict[str, tuple[int, str]] = {}
+        self._current_step = None
+
+    def translate(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> str:
+        """
+        Translate the ER model without modifying it.
+
+        Every call works on its own shallow copy of the entities and relationships,
+        so the same translator can be reused for many translations, also from different threads.
+        The translation runs through the stages of the pipeline property, a call that changes
+        only the later choices reuses the models built by the earlier stages.
+        """
+        log_event(logger, logging.INFO, "translation_started", TRANSLATING_MESSAGE)
+        table_statements, triggers = self.translate_statements(composite_attributes_choices, hierarchy_choices, relationship_choices)
+        return join_sql_code(table_statements, triggers)
+
+    def translate_statements(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> tuple[list[str], list[str]]:
+        """Same as translate, but return the CREATE TABLE statements and the triggers separately."""
+        if self._cache is not None:
+            key = self._cache.get_key(self.model_fingerprint, composite_attributes_choices, hierarchy_choices, relationship_choices)
+            statements = self._cache.load(key)
+            log_event(logger, logging.DEBUG, "translation_cache_lookup", "Translation cache %s", "hit" if statements is not None else "miss", hit=statements is not None)
+            if statements is not None:
+                return statements
+
+        statements = self.pipeline.run(composite_attributes_choices, hierarchy_choices, relationship_choices)
+        # the artifacts of the pipeline are shared, callers get their own lists
+        table_statements, triggers = list(statements.table_statements), list(statements.triggers)
+
+        if self._cache is not None:
+            self._cache.store(key, table_statements, triggers)
+        return table_statements, triggers
+
+    def translate_ordered_statements(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> tuple[list[str], list[str], tuple[list[tuple], list[str]]]:
+        """Same as translate_statements, with the order keys of the statements (see create_order_keys)."""
+        if self._cache is not None:
+            key = self._cache.get_key(self.model_fingerprint, composite_attributes_choices, hierarchy_choices, relationship_choices)
+            statements = self._cache.load_ordered(key)
+            if statements is not None:
+                return statements
+
+        translated = self.translate_model(composite_attributes_choices, hierarchy_choices, relationship_choices)
+        table_statements, triggers = translated.create_sql_statements()
+        order_keys = translated.create_order_keys()
+
+        if self._cache is not None:
+            self._cache.store(key, table_statements, triggers, order_keys)
+        return table_statements, triggers, order_keys
+
+    def iter_sql_code(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]):
+        """
+        Same SQL code as translate, yielded in pieces to be written with write_sql_code.
+
+        Without a cache statements are rendered one at a time while the pieces are consumed.
+        """
+        if self._cache is not None:
+            return iter_sql_code(*self.translate_statements(composite_attributes_choices, hierarchy_choices, relationship_choices))
+        relational_model = self.pipeline.translate(composite_attributes_choices, hierarchy_choices, relationship_choices)
+        table_statements, triggers = create_statements(relational_model.tables, relational_model.hierarchy_checks)
+        return iter_sql_code(DEFAULT_RENDERER.render_statements(table_statements), DEFAULT_RENDERER.render_statements(triggers))
+
+    def translate_tables(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> tuple[dict[str, Table], HierarchyChecks]:
+        """Translate the ER model into the relational tables and hierarchy checks, without generating SQL code."""
+        translator = self.translate_model(composite_attributes_choices, hierarchy_choices, relationship_choices)
+        return translator.tables, translator.hierarchy_checks
+
+    def translate_model(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> "ERTranslator":
+        """Translate a copy of the ER model, and return the translator holding the resulting tables."""
+        entities = {entity_name: entity.copy() for entity_name, entity in self._entities.items()}
+        relationships = {relationship_name: relationship.copy() for relationship_name, relationship in self._relationships.items()}
+        translator = ERTranslator(entities, relationships)
+        translator._translate(composite_attributes_choices, hierarchy_choices, relationship_choices)
+        return translator
+
+    @property
+    def tables(self):
+        return self._tables
+
+    @property
+    def pipeline(self):
+        """TranslationPipeline of the model, created on first use."""
+        if self._pipeline is None:
+            # imported here, the pipeline module builds on this one
+            from .pipeline import TranslationPipeline
+            self._pipeline = TranslationPipeline(self._entities, self._relationships)
+        return self._pipeline
+
+    def resolve_table_name(self, entity_name: str) -> str:
+        """Name of the table holding an entity after translation, through collapses and merges."""
+        while True:
+            table_name = self._merged_entities.resolve(self._collapsed_entities.resolve(entity_name))
+            if table_name == entity_name:
+                return table_name
+            entity_name = table_name
+
+    @property
+    def hierarchy_checks(self):
+        return self._hierarchy_checks
+
+    @property
+    def model_fingerprint(self):
+        # the model is not modified by translate, so it is hashed only once
+        if self._model_fingerprint is None:
+            self._model_fingerprint = fingerprint_model(self._entities, self._relationships)
+        return self._model_fingerprint
+
+    def _get_choices(self, choices_name: str, compute_choices):
+        if choices_name not in self._choices:
+            self._choices[choices_name] = compute_choices()
+        choices, default_choices = self._choices[choices_name]
+        # callers edit the current choices in place
+        return choices, dict(default_choices)
+
+    def _translate(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> None:
         
         # Translation steps:
         # 1. Normalize composite attributes
         self.normalize_all_attributes(composite_attributes_choices)
 
-        
         # 2. Eliminate hierarchies
+        self.eliminate_all_hierarchies(hierarchy_choices)
+
+        # 3. and 4. Translate entities and relationships
+        self.translate_entities_and_relationships(relationship_choices)
+        
+        # 5. SQL code is created by the caller from the translated tables
+
+    def eliminate_all_hierarchies(self, hierarchy_choices: dict[str, HIERARCHY_CHOICE]) -> None:
         self.eliminate_one_to_one_relationships(hierarchy_choices)
         self.create_hierarchy_checks(hierarchy_choices)
         self._eliminate_hierarchies(hierarchy_choices)
-        
+
+    def translate_entities_and_relationships(self, relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> None:
         # 3. Translate entities
         for entity_name in self._entities.keys():
+            self._current_step = (0, entity_name)
             self.translate_entity(entity_name)
         
         # 4. Translate relationships
         for relationship_name, relationship in self._relationships.items():
+            self._current_step = (1, relationship_name)
             # Check if it's a recursive relationship (entity references itself)
-            if relationship.entity_from == relationship.entity_to:
-                table_name = relationship.entity_from
-                if table_name in self._hierarchy_changes:
-                    table = self._tables[self._hierarchy_changes[table_name]]
-                else:
-                    table = self._tables[table_name]
+            table_name = self._merged_entities.resolve(relationship.entity_from)
+            if table_name == self._merged_entities.resolve(relationship.entity_to):
+                table = self._get_table(table_name)
                 self.translate_recursive_relationship(table, relationship, table_name)
             else:
                 if relationship_name in relationship_choices:
                     self.translate_relationship(relationship_name, relationship_choices[relationship_name])
                 else:
                     self.translate_relationship(relationship_name)
-        
-        # 5. Create SQL code
-        return self.create_sql_code()
-        
 
-        
+        # the hierarchy checks name the tables from before the one to one merges
+        self._hierarchy_checks = self._hierarchy_checks.rename_tables(self.resolve_table_name)
+
+    def set_hierarchy_state(self, hierarchy_checks: HierarchyChecks, collapsed_entities: AliasResolver, relationship_origins: dict[str, str]) -> None:
+        """Continue from hierarchies eliminated by another translator, see eliminate_all_hierarchies."""
+        self._hierarchy_checks = hierarchy_checks
+        self._collapsed_entities = collapsed_entities
+        self._relationship_origins = relationship_origins
+
+    @property
+    def entities(self):
+        return self._entities
+
+    @property
+    def relationships(self):
+        return self._relationships
+
+    @property
+    def collapsed_entities(self):
+        return self._collapsed_entities
+
+    @property
+    def relationship_origins(self):
+        return self._relationship_origins
 
     # 1. Normalize composite attributes
     # Three possibilities:
@@ -60,6 +266,9 @@ class ERTranslator:
     # - Create new entity (mandatory when cardinality is n)
 
     def get_composite_attributes_choices(self):
+        return self._get_choices("composite_attributes", self._compute_composite_attributes_choices)
+
+    def _compute_composite_attributes_choices(self):
         choices = {}
         default_choices = {}
         for entity in self._entities.values():
@@ -115,8 +324,9 @@ class ERTranslator:
             elif choice == COMPOSITE_ATTRIBUTE_CHOICE.KEEP_SIMPLE_ATTRIBUTES:
                 simple_attributes = attribute.simple_attributes
                 for simple_attribute in simple_attributes:
-                    simple_attribute.set_cardinality(attribute.cardinality)
-                    self._normalize_multi_value_attribute(entity, simple_attribute, is_identifier)
+                    # new object, the conceptual model attributes are never modified
+                    multi_value_attribute = C_Attribute(simple_attribute.name, attribute.cardinality, simple_attribute.is_unique)
+                    self._normalize_multi_value_attribute(entity, multi_value_attribute, is_identifier)
             
             # Remove the composite attribute after processing
             if is_identifier:
@@ -176,6 +386,8 @@ class ERTranslator:
             entity.remove_attribute(attribute.name)
         
         self._entities[new_entity.name] = new_entity
+        self._added_entities[new_entity.name] = entity.name
+        self._entities_version += 1
         new_relationship = Relationship(
             entity.name + "_" + attribute.name,
             entity.name,
@@ -183,10 +395,14 @@ class ERTranslator:
             attribute.cardinality,
             Cardinality(MinimumCardinality.ONE, MaximumCardinality.ONE)
         )
-        self._relationships[new_relationship.name] = new_relationship
+        self._relationship_index.add_relationship(new_relationship.name, new_relationship)
+        self._added_relationships[new_relationship.name] = (1, entity.name)
 
     # 2. Eliminate hierarchies
     def get_hierarchy_choices(self):
+        return self._get_choices("hierarchy", self._compute_hierarchy_choices)
+
+    def _compute_hierarchy_choices(self):
         choices = {}
         default_choices = {}
         for entity in self._entities.values():
@@ -212,7 +428,7 @@ class ERTranslator:
             
             if choice == HIERARCHY_CHOICE.COLLAPSE_UPWARDS:
                 children_entities = retrieve_children_names(father_entity)
-                hierarchy_relationships = retrieve_connected_relationships(children_entities, self._relationships)
+                hierarchy_relationships = self._relationship_index.connected_relationships(children_entities)
                 
                 for relationship_name in hierarchy_relationships:
                     relationship = self._relationships[relationship_name]
@@ -222,7 +438,7 @@ class ERTranslator:
                         elif relationship.entity_to in children_entities:
                             relationship.set_cardinality_from(Cardinality(relationship.cardinality_from.min_cardinality, MaximumCardinality.MANY))
             elif choice == HIERARCHY_CHOICE.COLLAPSE_DOWNWARDS:
-                hierarchy_relationships = retrieve_connected_relationships([father_entity.name], self._relationships)
+                hierarchy_relationships = self._relationship_index.connected_relationships([father_entity.name])
             
                 for relationship_name in hierarchy_relationships:
                     relationship = self._relationships[relationship_name]
@@ -233,7 +449,7 @@ class ERTranslator:
                             relationship.set_cardinality_to(Cardinality(relationship.cardinality_to.min_cardinality, MaximumCardinality.MANY))            
                     
     def create_hierarchy_checks(self, hierarchy_choices: dict[str, HIERARCHY_CHOICE]):
-        hierachy_translator = HierachyTranslator(self._entities, self._relationships)
+        hierachy_translator = HierachyTranslator(self._entities, self._relationships, self._relationship_index)
         hierachy_translator.translate_hierarchies(hierarchy_choices)
         self._hierarchy_checks = hierachy_translator.hierarchy_checks
 
@@ -255,7 +471,7 @@ class ERTranslator:
                 
                 # Add all children's attributes to parent as optional            
                 for child_name in children:
-                    self._hierarchy_changes[child_name] = parent_entity_name
+                    self._collapsed_entities.add_alias(child_name, parent_entity_name)
                     child_entity = self._entities[child_name]
                     
                     for identifier in child_entity.identifiers:
@@ -272,8 +488,9 @@ class ERTranslator:
 
                     if child_name in self._entities:
                         del self._entities[child_name]
+                        self._entities_version += 1
             elif choice == HIERARCHY_CHOICE.COLLAPSE_DOWNWARDS:
-                parent_relationships = retrieve_connected_relationships([parent_entity.name], self._relationships)
+                parent_relationships = self._relationship_index.connected_relationships([parent_entity.name])
                 for child_name in children:
                     child_entity = self._entities[child_name]
                     for identifier in parent_entity.identifiers:
@@ -290,11 +507,13 @@ class ERTranslator:
                         elif parent_entity.name == relationship.entity_to:
                             relationship_copy.set_entity_to(child_name)
                         relationship_copy.set_name(relationship_copy.name + "_" + relationship_copy.entity_from + "_" + relationship_copy.entity_to)
-                        self._hierarchy_changes[relationship_copy.name] = relationship.name
-                        self._relationships[relationship_copy.name] = relationship_copy
+                        self._relationship_origins[relationship_copy.name] = relationship.name
+                        self._relationship_index.add_relationship(relationship_copy.name, relationship_copy)
+                        self._added_relationships[relationship_copy.name] = (2, parent_entity_name)
                 for relationship_name in parent_relationships:
-                    del self._relationships[relationship_name]
+                    self._relationship_index.remove_relationship(relationship_name)
                 del self._entities[parent_entity_name]
+                self._entities_version += 1
 
     # 3. Translate entities
 
@@ -320,16 +539,18 @@ class ERTranslator:
                 attributes.append(self._translate_attribute(attribute))
 
             new_table = Table(entity.name, primary_keys, attributes)
-            self._tables[entity_name] = new_table
+            self._add_table(new_table)
        
     # 4. Translate relationships
 
     def get_relationship_choices(self):
+        return self._get_choices("relationship", self._compute_relationship_choices)
+
+    def _compute_relationship_choices(self):
         choices = {}
         default_choices = {}
-        hierarchy_relationships = retrieve_all_hierarchy_relationships(self._entities.values(), self._relationships)
         for relationship in self._relationships.values():
-            if relationship.name in hierarchy_relationships:
+            if self._is_hierarchy_relationship(relationship):
                 continue
             if relationship.cardinality_to.max_cardinality == MaximumCardinality.ONE and relationship.cardinality_from.max_cardinality == MaximumCardinality.ONE:
                 # one_to_one relationship
@@ -347,15 +568,13 @@ class ERTranslator:
         return choices, default_choices
 
     def translate_recursive_relationship(self, table: Table, relationship: Relationship, table_name: str) -> None:
-        relationship_name = relationship.name
-        if relationship.name in self._hierarchy_changes:
-            relationship_name = self._hierarchy_changes[relationship.name]
+        relationship_name = self._relationship_origins.get(relationship.name, relationship.name)
         if relationship.cardinality_from.max_cardinality != relationship.cardinality_to.max_cardinality:
             # add foreign key
-            hierarchy_relationships = retrieve_all_hierarchy_relationships(self._entities.values(), self._relationships)    
+            is_hierarchy_relationship = self._is_hierarchy_relationship(relationship)
             for key in table.primary_keys:
                 is_optional = key.is_optional
-                if relationship.name in hierarchy_relationships:
+                if is_hierarchy_relationship:
                     is_optional = True
                 
                 table.add_foreign_key(ForeignKey(relationship_name + "_" + table_name + "_" + key.name, is_optional, key.is_unique, table, key))
@@ -364,7 +583,7 @@ class ERTranslator:
                 new_attribute = self._translate_attribute(attribute)
                 new_attribute.set_name(relationship_name + "_" + table_name + "_" + attribute.name)
                 is_optional = is_relationship_optional
-                if relationship.name in hierarchy_relationships:
+                if is_hierarchy_relationship:
                     is_optional = True
                 new_attribute.set_optional(is_optional)
                 table.add_attribute(new_attribute)
@@ -385,20 +604,15 @@ class ERTranslator:
                 new_table.add_foreign_key(ForeignKey(relationship_name + "_" + table_name + "_" + key.name + "_A", key.is_optional, key.is_unique, table, key))
                 new_table.add_foreign_key(ForeignKey(relationship_name + "_" + table_name + "_" + key.name + "_B", key.is_optional, key.is_unique, table, key))
             
-            self._tables[new_table.name] = new_table
+            self._add_table(new_table)
 
     def translate_relationship(self, relationship_name: str, choice: RELATIONSHIP_CHOICE = None) -> None:
         relationship = self._relationships[relationship_name]
-        table_from_name = relationship.entity_from
-        if relationship.entity_from in self._hierarchy_changes:
-            table_from = self._tables[self._hierarchy_changes[relationship.entity_from]]
-        else:
-            table_from = self._tables[relationship.entity_from]
-        table_to_name = relationship.entity_to
-        if relationship.entity_to in self._hierarchy_changes:
-            table_to = self._tables[self._hierarchy_changes[relationship.entity_to]]
-        else:
-            table_to = self._tables[relationship.entity_to]
+        # collapsed children keep their names for the foreign keys, _get_table finds the table holding them
+        table_from_name = self._merged_entities.resolve(relationship.entity_from)
+        table_from = self._get_table(table_from_name)
+        table_to_name = self._merged_entities.resolve(relationship.entity_to)
+        table_to = self._get_table(table_to_name)
         if relationship.cardinality_from.max_cardinality == MaximumCardinality.MANY and relationship.cardinality_to.max_cardinality == MaximumCardinality.MANY: 
             # many to many relationship
             self._translate_many_to_many_relationship(table_from, table_to, relationship, table_from_name, table_to_name)
@@ -427,9 +641,7 @@ class ERTranslator:
         new_attribues = []
         for attribute in relationship.attributes:
             new_attribues.append(self._translate_attribute(attribute))
-        relationship_name = relationship.name
-        if relationship.name in self._hierarchy_changes:
-            relationship_name = self._hierarchy_changes[relationship.name]
+        relationship_name = self._relationship_origins.get(relationship.name, relationship.name)
         new_primary_keys = []
         for key in table_from.primary_keys:
             new_pk = R_Attribute(relationship_name + "_" + table_from_name + "_" + key.name, key.is_optional, key.is_unique)
@@ -448,7 +660,7 @@ class ERTranslator:
         for key in table_to.primary_keys:
             new_table.add_foreign_key(ForeignKey(relationship_name + "_" + table_to_name + "_" + key.name, key.is_optional, key.is_unique, table_to, key))
         
-        self._tables[new_table.name] = new_table
+        self._add_table(new_table)
 
     def _translate_one_to_many_relationship(self, one_side: Table, many_side: Table, relationship: Relationship,
                                             one_side_name: str, many_side_name: str,
@@ -494,13 +706,11 @@ class ERTranslator:
     
     def _add_foreign_keys_and_attributes(self, main_table: Table, referenced_table: Table, relationship: Relationship, main_table_name: str, referenced_table_name: str) -> None:
         relationship_attributes = relationship.attributes
-        relationship_name = relationship.name
-        if relationship.name in self._hierarchy_changes:
-            relationship_name = self._hierarchy_changes[relationship.name]
-        hierarchy_relationships = retrieve_all_hierarchy_relationships(self._entities.values(), self._relationships)
+        relationship_name = self._relationship_origins.get(relationship.name, relationship.name)
+        is_hierarchy_relationship = self._is_hierarchy_relationship(relationship)
         for key in referenced_table.primary_keys:
             is_optional = key.is_optional
-            if relationship.name in hierarchy_relationships:
+            if is_hierarchy_relationship:
                 is_optional = True
             main_table.add_foreign_key(ForeignKey(relationship_name + "_" + referenced_table_name + "_" + key.name, is_optional, key.is_unique, referenced_table, key))
             
@@ -517,7 +727,7 @@ class ERTranslator:
         new_attributes = list(main_table.attributes)
         secondary_attributes = list(secondary_table.primary_keys) + list(secondary_table.attributes)
 
-        relationship_cardinality = relationship.cardinality_from if secondary_table_name == relationship.entity_from else relationship.cardinality_to
+        relationship_cardinality = relationship.cardinality_from if secondary_table_name == self._merged_entities.resolve(relationship.entity_from) else relationship.cardinality_to
         is_optional = relationship_cardinality.min_cardinality == MinimumCardinality.ZERO
 
         for attribute in secondary_attributes:
@@ -541,12 +751,25 @@ class ERTranslator:
         if secondary_table_name in self._tables:
             del self._tables[secondary_table_name]
 
-        change_relationships_entity(self._relationships, main_table_name, new_table.name)
-        change_relationships_entity(self._relationships, secondary_table_name, new_table.name)
+        # relationships are not rewritten, their entities now resolve to the merged table
+        self._merged_entities.add_alias(main_table_name, new_table.name)
+        self._merged_entities.add_alias(secondary_table_name, new_table.name)
         
-        self._tables[new_table.name] = new_table
+        self._add_table(new_table)
 
     # helper functions
+    def _get_table(self, entity_name: str) -> Table:
+        """Table holding the entity, whether it was collapsed into its father, merged, or both."""
+        return self._tables[self.resolve_table_name(entity_name)]
+
+    def _is_hierarchy_relationship(self, relationship: Relationship) -> bool:
+        """Whether the relationship touches an entity of a hierarchy, once merged entities are resolved."""
+        if self._hierarchy_entities_key != self._entities_version:
+            # cached until entities are added or removed
+            self._hierarchy_entities = set(retrieve_all_hierarchy_entities(self._entities.values()))
+            self._hierarchy_entities_key = self._entities_version
+        return self._merged_entities.resolve(relationship.entity_from) in self._hierarchy_entities or self._merged_entities.resolve(relationship.entity_to) in self._hierarchy_entities
+
     def _translate_attribute(self, conceptual_attribute: C_Attribute) -> R_Attribute:
         # Translate conceptual attribute to relational attribute
         isOptional = True if conceptual_attribute.cardinality.min_cardinality == MinimumCardinality.ZERO else False
@@ -555,55 +778,40 @@ class ERTranslator:
 
     # 5. Create SQL code
 
+    def create_order_keys(self) -> tuple[list[tuple], list[str]]:
+        """
+        Return where each table and trigger comes from, in terms of the entities and relationships of the original model.
+
+        Tables are keyed by the translation step that added them: (0, entity) or
+        (1, relationship), where an added entity is (1, entity it comes from) and an
+        added relationship is (1, entity normalized) or (2, father collapsed downwards),
+        and an original one is (0, name). Triggers are keyed by their father entity.
+        Sorting the statements of independent translations by these keys, with the
+        original positions in place of the names, gives the order of a single translation.
+        """
+        table_keys = []
+        for table_name in self._tables:
+            phase, item_name = self._table_steps[table_name]
+            if phase == 0:
+                source = (1, self._added_entities[item_name]) if item_name in self._added_entities else (0, item_name)
+            else:
+                source = self._added_relationships.get(item_name, (0, item_name))
+            table_keys.append((phase, source))
+        return table_keys, list(self._hierarchy_checks.trigger_fathers)
+
+    def _add_table(self, table: Table) -> None:
+        if table.name not in self._tables:
+            self._table_steps[table.name] = self._current_step
+        self._tables[table.name] = table
+
     def create_sql_code(self) -> str:
-        """Generate SQL code for all tables using SQLGenerator templates."""
-        sql_statements = []
-        
-        for table_name, table in self._tables.items():
-            # Generate attributes SQL
-            attributes_sql = []
-            foreign_keys_names = [foreign_key.name for foreign_key in table.foreign_keys]
-            for primary_key in table.primary_keys:
-                if primary_key.name in foreign_keys_names:
-                    continue
-                attr_sql = SQLGenerator.create_sql_attribute(primary_key.name, primary_key.is_optional)
-                attributes_sql.append(attr_sql)
-            for attribute in table.attributes:
-                attr_sql = SQLGenerator.create_sql_attribute(attribute.name, attribute.is_optional, attribute.is_unique)
-                attributes_sql.append(attr_sql)
-            
-            # Generate selectors SQL (empty for now, will be used for hierarchies)
-            selectors_sql = self._hierarchy_checks.selectors.get(table_name, [])
-            
-            # Generate foreign key references SQL
-            references_sql = []
-            for foreign_key in table.foreign_keys:
-                ref_table_name = foreign_key.table_ref.name
-                ref_primary_key = foreign_key.primary_key_ref.name
-                sql_attribute = SQLGenerator.create_sql_attribute(foreign_key.name, foreign_key.is_optional, foreign_key.is_unique)
-                ref_sql = SQLGenerator.create_sql_reference(
-                    sql_attribute, 
-                    ref_table_name, 
-                    ref_primary_key
-                )
-                references_sql.append(ref_sql)
-            
-            # Get primary key names
-            primary_keys = [pk.name for pk in table.primary_keys]
-            
-            # Generate constraints SQL (empty for now, will be added later)
-            constraints_sql = self._hierarchy_checks.constraints.get(table_name, [])
-            
-            # Create the complete SQL table statement
-            table_sql = SQLGenerator.create_sql_table(
-                table_name,
-                attributes_sql,
-                selectors_sql,
-                references_sql,
-                primary_keys,
-                constraints_sql
-            )
-            sql_statements.append(table_sql)
-        
-        return "\n\n".join(sql_statements) + "\n\n" + "\n\n".join(self._hierarchy_checks.triggers)
-        
\ No newline at end of file
+        """Generate SQL code for all tables with the default renderer."""
+        table_statements, triggers = self.create_sql_statements()
+        return join_sql_code(table_statements, triggers)
+
+    def create_statements(self) -> tuple[list[CreateTable], list[Trigger]]:
+        return create_statements(self._tables, self._hierarchy_checks)
+
+    def create_sql_statements(self, renderer: SQLRenderer = DEFAULT_RENDERER) -> tuple[list[str], list[str]]:
+        """Generate the CREATE TABLE statements and the triggers, without joining them."""
+        return create_sql_statements(self._tables, self._hierarchy_checks, renderer)
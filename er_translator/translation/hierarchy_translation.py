@@ -1,17 +1,20 @@
-from .sql_generator import SQLGenerator
 from ..data.conceptual import *
 from ..data.hierachy_checks import HierarchyChecks
 from ..data.choices import HIERARCHY_CHOICE
 from ..data.constraint import *
-from ..utils.utils import get_all_father_entities, create_copy_from_entity, retrieve_connected_relationships, retrieve_children_names
+from ..data.sql_ir import Selector, NullCheck, RowCondition, AnySelectorSet, Check as SQL_Check, ParentTrigger, ExclusionTrigger
+from ..data.relationship_index import RelationshipIndex
+from ..utils.utils import get_all_father_entities, create_copy_from_entity, retrieve_children_names, get_primary_keys
 
 SELECTOR_PREFIX = "TYPE_"
 
 class HierachyTranslator:
-    def __init__(self, entities: list[Entity], relationships: list[Relationship]):
+    def __init__(self, entities: list[Entity], relationships: list[Relationship], relationship_index: RelationshipIndex = None):
         self._entities = entities
         self._relationships = relationships
+        self._relationship_index = relationship_index if relationship_index else RelationshipIndex(relationships)
         self._constraints: dict[str, Constraint] = {}
+        self._children_checks: dict[str, ChildrenChecks] = {}
         self._hierarchy_checks = HierarchyChecks()
         
     @property
@@ -35,9 +38,10 @@ class HierachyTranslator:
                 self._translate_hierarchy(father_entity_name, hierarchy_choices[father_entity_name])
             else:
                 self._translate_hierarchy(father_entity_name)
+            self._hierarchy_checks.set_triggers_father(father_entity_name)
 
         for constraint in self._constraints.values():
-            self._hierarchy_checks.add_constraint(constraint.entity_name, SQLGenerator.create_sql_constraint(constraint))
+            self._hierarchy_checks.add_constraint(constraint.entity_name, self._create_sql_check(constraint))
 
     def _translate_hierarchy(self, father_entity_name, choice: HIERARCHY_CHOICE = HIERARCHY_CHOICE.COLLAPSE_UPWARDS):
         father_entity: Entity = self._entities[father_entity_name]
@@ -55,7 +59,7 @@ class HierachyTranslator:
 
 
     def _collapse_downwards(self, father_entity: Entity):
-        father_relationships = retrieve_connected_relationships([father_entity.name], self._relationships)
+        father_relationships = self._relationship_index.connected_relationships([father_entity.name])
         self._create_sql_trigger_downwards_children(father_entity)
 
         for relationship_name in father_relationships:
@@ -94,13 +98,12 @@ class HierachyTranslator:
                 selectors[selector_name] = ["0", "1"]
         
         for selector_name, selector_values in selectors.items():
-            selector = SQLGenerator.create_sql_selector(selector_name, selector_values)
-            self._hierarchy_checks.add_selector(father_entity.name, selector)
+            self._hierarchy_checks.add_selector(father_entity.name, Selector(selector_name, tuple(selector_values)))
 
     
     def _create_constraint_and_trigger(self, father_entity: Entity):
         children_names = retrieve_children_names(father_entity)
-        hierarchy_relationships = retrieve_connected_relationships(children_names, self._relationships)
+        hierarchy_relationships = self._relationship_index.connected_relationships(children_names)
 
         for relationship_name in hierarchy_relationships:
             relationship = self._relationships[relationship_name]
@@ -176,16 +179,21 @@ class HierachyTranslator:
         else:
             selector_name = self._get_selector_name(father)
             other_selector_name = selector_name
+        trigger_name = relationship.name + connected_child.name
+        key_columns = []
+        for primary_key in get_primary_keys(father):
+            key_columns.append((primary_key, f"{relationship.name}_{connected_child.name}_{primary_key}{identifier_modifier}"))
+
+        if hierarchy.hierarchy_disjointness == HierarchyDisjointness.DISJOINT:
+            selector_value = connected_child.name
+            other_selector_value = other_child.name if other_child else None
+        else:
+            selector_value = "1"
+            other_selector_value = "1"
         if other_child:
-            if identifier_modifier != "":
-                sql_trigger = SQLGenerator.create_sql_trigger_before_insert(relationship, table_name, father, connected_child, selector_name, other_child, other_selector_name, identifier_modifier)
-            else:
-                sql_trigger = SQLGenerator.create_sql_trigger_before_insert(relationship, table_name, father, connected_child, selector_name, other_child, other_selector_name)
+            sql_trigger = ParentTrigger(trigger_name, table_name, father.name, connected_child.name, tuple(key_columns), selector_name, selector_value, other_selector_name, other_selector_value, identifier_modifier)
         else:
-            if identifier_modifier != "":
-                sql_trigger = SQLGenerator.create_sql_trigger_before_insert(relationship, table_name, father, connected_child, selector_name, identifier_modifier=identifier_modifier)
-            else:
-                sql_trigger = SQLGenerator.create_sql_trigger_before_insert(relationship, table_name, father, connected_child, selector_name)
+            sql_trigger = ParentTrigger(trigger_name, table_name, father.name, connected_child.name, tuple(key_columns), selector_name, selector_value, identifier_modifier=identifier_modifier)
         self._hierarchy_checks.add_trigger(sql_trigger)
 
     def _create_sql_constraint(self, relationship: Relationship, father: Entity, connected_child: Entity):
@@ -199,7 +207,7 @@ class HierachyTranslator:
                 if child_name == connected_child.name:
                     conditions = self._get_sql_constraint_values_overlapping(relationship, father, connected_child)
                 else:
-                    conditions = self._get_sql_constraint_values_overlapping_child(child_entity)
+                    conditions = self._get_sql_constraint_values_overlapping_child(father, child_entity)
                 constraint = Constraint(father.name, constraint_name, selector_name, conditions)
                 self._add_constraint(constraint)
         else:
@@ -217,9 +225,16 @@ class HierachyTranslator:
         else:
             self._constraints[constraint_name] = constraint
 
+    def _create_sql_check(self, constraint: Constraint) -> SQL_Check:
+        conditions = tuple(
+            RowCondition(tuple(NullCheck(check.attribute_name, check.isNull) for check in condition.checks), constraint.selector_name, condition.selector_value)
+            for condition in constraint.conditions
+        )
+        return SQL_Check(constraint.constraint_name, conditions)
+
     def _create_sql_total_constraint(self, father: Entity):
         children_names = retrieve_children_names(father)
-        sql_constraint = SQLGenerator.create_sql_total_constraint(children_names)
+        sql_constraint = SQL_Check("TOTAL_HIERARCHY", (AnySelectorSet(tuple(SELECTOR_PREFIX + name for name in children_names)),))
         self._hierarchy_checks.add_constraint(father.name, sql_constraint)
 
 
@@ -261,38 +276,27 @@ class HierachyTranslator:
             relationship_attr = Attribute(attr_name, cardinality, rel_attribute.is_unique)
             relationship_attributes.append(relationship_attr)
         
+        relationship_not_null_checks = self._get_not_null_checks(foreign_keys) + self._get_not_null_checks(relationship_attributes)
+        relationship_null_checks = self._get_null_checks(foreign_keys) + self._get_null_checks(relationship_attributes)
+        children_checks = self._get_children_checks(father)
+
         hierarchy = father.hierarchy
         for child_name in hierarchy.children:
-            child_entity = self._entities[child_name]
-            checks = []
-            checks += self._get_not_null_checks(child_entity.identifiers)
-            checks += self._get_not_null_checks(child_entity.attributes)
+            checks = list(children_checks.not_null_checks[child_name])
 
             if child_name == connected_child.name:
-                checks += self._get_not_null_checks(foreign_keys)
-                checks += self._get_not_null_checks(relationship_attributes)
+                checks += relationship_not_null_checks
             else:
-                checks += self._get_null_checks(foreign_keys)
-                checks += self._get_null_checks(relationship_attributes)
+                checks += relationship_null_checks
             
-            for other_child_name in hierarchy.children:
-                if child_name != other_child_name:
-                    other_child_entity = self._entities[other_child_name]
-                    checks += self._get_null_checks(other_child_entity.identifiers)
-                    checks += self._get_null_checks(other_child_entity.attributes)
+            checks += children_checks.other_children_null_checks[child_name]
             
             condition = Condition(child_name, checks)
             conditions.append(condition)
         
         if hierarchy.hierarchy_completeness == HierarchyCompleteness.PARTIAL:
-            checks = []
-            for child_name in hierarchy.children:
-                child_entity = self._entities[child_name]
-                checks += self._get_null_checks(child_entity.identifiers)
-                checks += self._get_null_checks(child_entity.attributes)
-                
-            checks += self._get_null_checks(foreign_keys)
-            checks += self._get_null_checks(relationship_attributes)
+            checks = list(children_checks.all_children_null_checks)
+            checks += relationship_null_checks
             
             condition = Condition(father.name, checks)
             conditions.append(condition)
@@ -330,9 +334,9 @@ class HierachyTranslator:
         
         selector_value = 1
 
-        checks = []
-        checks += self._get_not_null_checks(connected_child.identifiers)
-        checks += self._get_not_null_checks(connected_child.attributes)
+        children_checks = self._get_children_checks(father)
+
+        checks = list(children_checks.not_null_checks[connected_child.name])
         checks += self._get_not_null_checks(foreign_keys)
         checks += self._get_not_null_checks(relationship_attributes)
         
@@ -341,9 +345,7 @@ class HierachyTranslator:
 
         selector_value = 0
 
-        checks = []
-        checks += self._get_null_checks(connected_child.identifiers)
-        checks += self._get_null_checks(connected_child.attributes)
+        checks = list(children_checks.null_checks[connected_child.name])
         checks += self._get_null_checks(foreign_keys)
         checks += self._get_null_checks(relationship_attributes)
         
@@ -352,27 +354,54 @@ class HierachyTranslator:
 
         return conditions
     
-    def _get_sql_constraint_values_overlapping_child(self, child: Entity) -> list[Condition]:
+    def _get_sql_constraint_values_overlapping_child(self, father: Entity, child: Entity) -> list[Condition]:
         conditions = []
+        children_checks = self._get_children_checks(father)
         
         selector_value = 1
-        checks = []
-        checks += self._get_not_null_checks(child.identifiers)
-        checks += self._get_not_null_checks(child.attributes)
+        checks = list(children_checks.not_null_checks[child.name])
         
         condition = Condition(selector_value, checks)
         conditions.append(condition)
 
         selector_value = 0
-        checks = []
-        checks += self._get_null_checks(child.identifiers)
-        checks += self._get_null_checks(child.attributes)
+        checks = list(children_checks.null_checks[child.name])
         
         condition = Condition(selector_value, checks)
         conditions.append(condition)
 
         return conditions
 
+    def _get_children_checks(self, father: Entity) -> ChildrenChecks:
+        """Null and not null checks of every child of father, computed once per hierarchy."""
+        children_checks = self._children_checks.get(father.name)
+        if children_checks is not None:
+            return children_checks
+
+        children = father.hierarchy.children
+        not_null_checks = {}
+        null_checks = {}
+        for child_name in children:
+            child_entity = self._entities[child_name]
+            not_null_checks[child_name] = self._get_not_null_checks(child_entity.identifiers) + self._get_not_null_checks(child_entity.attributes)
+            null_checks[child_name] = self._get_null_checks(child_entity.identifiers) + self._get_null_checks(child_entity.attributes)
+
+        other_children_null_checks = {}
+        for child_name in children:
+            other_checks = []
+            for other_child_name in children:
+                if child_name != other_child_name:
+                    other_checks += null_checks[other_child_name]
+            other_children_null_checks[child_name] = other_checks
+
+        all_children_null_checks = []
+        for child_name in children:
+            all_children_null_checks += null_checks[child_name]
+
+        children_checks = ChildrenChecks(not_null_checks, null_checks, other_children_null_checks, all_children_null_checks)
+        self._children_checks[father.name] = children_checks
+        return children_checks
+
     def _get_identifier_names(self, entity: Entity):
         names = []
         for identifier in entity.identifiers:
@@ -410,13 +439,9 @@ class HierachyTranslator:
             for other_child_name in children:
                 if child_name == other_child_name:
                     continue
-                checks = []
-                for identifier in father.identifiers:
-                    check = f"N.{identifier.name} = {other_child_name}.{identifier.name}"
-                    checks.append(check)
-                conditions = " OR ".join(checks)
+                key_columns = tuple(identifier.name for identifier in father.identifiers)
                 message = f"Only one child must exist with a specific identifier!"
-                self._create_sql_trigger_downwards(child_name, other_child_name, conditions, message)
+                self._create_sql_trigger_downwards(child_name, other_child_name, key_columns, message)
         
 
     def _create_sql_constraint_downwards(self, entity_name: str, relationship_name: str, father: Entity):
@@ -429,33 +454,32 @@ class HierachyTranslator:
             checks = []
             father_ids = self._get_identifier_names(father)
             for id in father_ids:
-                check = f"{relationship_name}_{child_name}_{id} IS NOT NULL"
+                check = NullCheck(f"{relationship_name}_{child_name}_{id}", False)
                 checks.append(check)
             
             # Add mandatory relationship attributes checks for this child
             for rel_attribute in relationship.attributes:
                 if rel_attribute.cardinality.min_cardinality == MinimumCardinality.ONE:
                     attr_name = f"{relationship_name}_{child_name}_{rel_attribute.name}"
-                    check = f"{attr_name} IS NOT NULL"
+                    check = NullCheck(attr_name, False)
                     checks.append(check)
             
             for other_child_name in father.hierarchy.children:
                 if child_name != other_child_name:
                     for id in father_ids:
-                        check = f"{relationship_name}_{other_child_name}_{id} IS NULL"
+                        check = NullCheck(f"{relationship_name}_{other_child_name}_{id}", True)
                         checks.append(check)
                     
                     # Add relationship attributes checks for other children (all must be NULL)
                     for rel_attribute in relationship.attributes:
                         attr_name = f"{relationship_name}_{other_child_name}_{rel_attribute.name}"
-                        check = f"{attr_name} IS NULL"
+                        check = NullCheck(attr_name, True)
                         checks.append(check)
 
-            condition = " AND ".join(checks)
-            conditions.append(f"({condition})")
-        sql_constraint = SQLGenerator.create_sql_downwards_constraint(relationship_name, conditions)
+            conditions.append(RowCondition(tuple(checks)))
+        sql_constraint = SQL_Check(relationship_name, tuple(conditions))
         self._hierarchy_checks.add_constraint(entity_name, sql_constraint)
                     
-    def _create_sql_trigger_downwards(self, table_name: str, other_table_name: str, conditions: str, message: str):        
-        sql_trigger = SQLGenerator.create_sql_downwards_trigger(table_name, other_table_name, conditions, message)
+    def _create_sql_trigger_downwards(self, table_name: str, other_table_name: str, key_columns: tuple[str, ...], message: str):        
+        sql_trigger = ExclusionTrigger(table_name + "_" + other_table_name, table_name, other_table_name, key_columns, message)
         self._hierarchy_checks.add_trigger(sql_trigger)
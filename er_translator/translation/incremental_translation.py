@@ -0,0 +1,151 @@
+import logging
+
+from ..data.conceptual import Entity, Relationship
+from ..data.choices import COMPOSITE_ATTRIBUTE_CHOICE, RELATIONSHIP_CHOICE, HIERARCHY_CHOICE
+from ..data.alias_resolver import AliasResolver
+from .er_translation import ERTranslator, TRANSLATING_MESSAGE
+from .sql_writer import join_sql_code, iter_sql_code
+from .translation_cache import TranslationCache
+from ..utils.log import log_event
+
+logger = logging.getLogger(__name__)
+
+def split_into_components(entities: dict[str, Entity], relationships: dict[str, Relationship]) -> list[tuple[dict[str, Entity], dict[str, Relationship]]]:
+    """
+    Split the model into parts that are translated independently of each other.
+
+    Entities linked by a relationship, a hierarchy or a weak entity identification
+    end up in the same component. Components follow the order of their first entity.
+    """
+    groups = AliasResolver()
+    for relationship in relationships.values():
+        groups.add_alias(relationship.entity_to, relationship.entity_from)
+    for entity_name, entity in entities.items():
+        if entity.hierarchy:
+            for child_name in entity.hierarchy.children:
+                groups.add_alias(child_name, entity_name)
+        if entity.strong_entity in entities:
+            groups.add_alias(entity.strong_entity, entity_name)
+
+    component_entities = {}
+    for entity_name, entity in entities.items():
+        component_entities.setdefault(groups.resolve(entity_name), {})[entity_name] = entity
+    component_relationships = {root: {} for root in component_entities}
+    for relationship_name, relationship in relationships.items():
+        component_relationships[groups.resolve(relationship.entity_from)][relationship_name] = relationship
+    return [(component_entities[root], component_relationships[root]) for root in component_entities]
+
+def merge_component_statements(entity_positions: dict[str, int], relationship_positions: dict[str, int], results: list[tuple[list[str], list[str], tuple[list[tuple], list[str]]]]) -> tuple[list[str], list[str]]:
+    """
+    Merge the (table statements, triggers, order keys) of independent components.
+
+    The order keys name entities and relationships of the original model (see
+    ERTranslator.create_order_keys), replacing the names with their positions
+    in the whole model gives the order of a translation of the whole model.
+    """
+    keyed_tables = []
+    keyed_triggers = []
+    for table_statements, triggers, (table_keys, trigger_keys) in results:
+        for (phase, (kind, name)), table_statement in zip(table_keys, table_statements):
+            # only original relationships are named in the relationships step
+            position = relationship_positions[name] if phase == 1 and kind == 0 else entity_positions[name]
+            keyed_tables.append(((phase, kind, position), table_statement))
+        for father_name, trigger in zip(trigger_keys, triggers):
+            keyed_triggers.append((entity_positions[father_name], trigger))
+    # the sort is stable, statements of a component with the same key keep their order
+    keyed_tables.sort(key=lambda keyed_table: keyed_table[0])
+    keyed_triggers.sort(key=lambda keyed_trigger: keyed_trigger[0])
+    return [table_statement for _, table_statement in keyed_tables], [trigger for _, trigger in keyed_triggers]
+
+class IncrementalTranslator:
+    """
+    Translator that only re-translates the part of the model affected by a change of choices.
+
+    The model is split into independent components (see split_into_components).
+    The tables, constraints and triggers of a component depend only on the
+    choices of its own attributes, hierarchies and relationships, so each
+    component result is kept and reused until one of its choices changes.
+
+    Component statements are merged back in the order of the whole model, so
+    the output is the same as ERTranslator.
+    """
+    def __init__(self, entities: dict[str, Entity], relationships: dict[str, Relationship], cache: TranslationCache = None):
+        self._er_translator = ERTranslator(entities, relationships)
+        self._cache = cache
+        self._components: list[ERTranslator] = []
+        self._components_choices: list[list] = []
+        self._entity_positions = {entity_name: position for position, entity_name in enumerate(entities)}
+        self._relationship_positions = {relationship_name: position for position, relationship_name in enumerate(relationships)}
+        # component index -> (choices used, (table statements, triggers, order keys))
+        self._results: dict[int, tuple] = {}
+        self._recomputed_components: list[int] = []
+        self._create_components(entities, relationships)
+
+    @property
+    def components_count(self):
+        return len(self._components)
+
+    @property
+    def recomputed_components(self):
+        # indexes of the components translated again by the last translate call
+        return self._recomputed_components
+
+    def get_composite_attributes_choices(self):
+        return self._er_translator.get_composite_attributes_choices()
+
+    def get_hierarchy_choices(self):
+        return self._er_translator.get_hierarchy_choices()
+
+    def get_relationship_choices(self):
+        return self._er_translator.get_relationship_choices()
+
+    def translate(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> str:
+        log_event(logger, logging.INFO, "translation_started", TRANSLATING_MESSAGE)
+        return join_sql_code(*self._translate_components(composite_attributes_choices, hierarchy_choices, relationship_choices))
+
+    def iter_sql_code(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]):
+        return iter_sql_code(*self._translate_components(composite_attributes_choices, hierarchy_choices, relationship_choices))
+
+    def _translate_components(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> tuple[list[str], list[str]]:
+        self._recomputed_components = []
+        results = []
+        for index, component in enumerate(self._components):
+            component_choices = self._get_component_choices(index, composite_attributes_choices, hierarchy_choices, relationship_choices)
+            choices = tuple(tuple(choices.items()) for choices in component_choices)
+
+            result = self._results.get(index)
+            if result is None or result[0] != choices:
+                result = (choices, component.translate_ordered_statements(*component_choices))
+                self._results[index] = result
+                self._recomputed_components.append(index)
+            results.append(result[1])
+
+        table_statements, triggers = merge_component_statements(self._entity_positions, self._relationship_positions, results)
+        log_event(logger, logging.DEBUG, "components_translated", "Translated %d of %d components", len(self._recomputed_components), len(self._components), recomputed=self._recomputed_components)
+        return table_statements, triggers
+
+    def translate_statements(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> tuple[list[str], list[str]]:
+        """Translate every component without touching the kept results, the cache is still used."""
+        results = [
+            component.translate_ordered_statements(*self._get_component_choices(index, composite_attributes_choices, hierarchy_choices, relationship_choices))
+            for index, component in enumerate(self._components)
+        ]
+        return merge_component_statements(self._entity_positions, self._relationship_positions, results)
+
+    def _get_component_choices(self, index: int, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> tuple[dict, dict, dict]:
+        composite_keys, hierarchy_keys, relationship_keys = self._components_choices[index]
+        return (
+            {key: composite_attributes_choices[key] for key in composite_keys if key in composite_attributes_choices},
+            {key: hierarchy_choices[key] for key in hierarchy_keys if key in hierarchy_choices},
+            {key: relationship_choices[key] for key in relationship_keys if key in relationship_choices},
+        )
+
+    def _create_components(self, entities: dict[str, Entity], relationships: dict[str, Relationship]) -> None:
+        for component_entities, component_relationships in split_into_components(entities, relationships):
+            component = ERTranslator(component_entities, component_relationships, self._cache)
+            self._components.append(component)
+            self._components_choices.append([
+                list(component.get_composite_attributes_choices()[0]),
+                list(component.get_hierarchy_choices()[0]),
+                list(component.get_relationship_choices()[0]),
+            ])
@@ -0,0 +1,139 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from ..data.conceptual import Entity, Relationship
+from ..data.relational import Table
+from ..data.choices import COMPOSITE_ATTRIBUTE_CHOICE, RELATIONSHIP_CHOICE, HIERARCHY_CHOICE
+from ..data.hierachy_checks import HierarchyChecks
+from ..data.alias_resolver import AliasResolver
+from ..data.serialization import fingerprint_model
+from .er_translation import ERTranslator, create_sql_statements
+
+DEFAULT_STAGE_CACHE_SIZE = 32
+
+# Stage artifacts. Every artifact carries the key of the inputs it was built from,
+# and must not be modified: later stages work on copies of it.
+
+@dataclass(frozen=True)
+class NormalizedModel:
+    key: tuple
+    entities: dict[str, Entity]
+    relationships: dict[str, Relationship]
+
+@dataclass(frozen=True)
+class HierarchyFreeModel:
+    key: tuple
+    entities: dict[str, Entity]
+    relationships: dict[str, Relationship]
+    hierarchy_checks: HierarchyChecks
+    collapsed_entities: AliasResolver
+    relationship_origins: dict[str, str]
+
+@dataclass(frozen=True)
+class RelationalModel:
+    key: tuple
+    tables: dict[str, Table]
+    hierarchy_checks: HierarchyChecks
+
+@dataclass(frozen=True)
+class SQLStatements:
+    key: tuple
+    table_statements: list[str]
+    triggers: list[str]
+
+
+class TranslationPipeline:
+    """
+    ERTranslator.translate split into stages, each one cached by the key of its inputs.
+
+        normalize                 model, composite attribute choices -> NormalizedModel
+        eliminate_hierarchies     NormalizedModel, hierarchy choices  -> HierarchyFreeModel
+        translate_tables          HierarchyFreeModel, relationship choices -> RelationalModel
+        render                    RelationalModel -> SQLStatements
+
+    The key of a stage is the key of its input artifact and its own frozen choices,
+    so changing only relationship choices reuses the normalized, hierarchy free model.
+    Every stage keeps the max_entries most recently used artifacts. Stages can run
+    from several threads, an artifact built by two of them at once is kept once.
+    """
+    def __init__(self, entities: dict[str, Entity], relationships: dict[str, Relationship], max_entries: int = DEFAULT_STAGE_CACHE_SIZE):
+        self._entities = entities
+        self._relationships = relationships
+        self._max_entries = max_entries
+        self._model_fingerprint = None
+        self._stage_caches = {stage: OrderedDict() for stage in ("normalize", "eliminate_hierarchies", "translate_tables", "render")}
+        # stage -> number of times it actually ran
+        self._runs = {stage: 0 for stage in self._stage_caches}
+        self._lock = threading.Lock()
+
+    @property
+    def runs(self):
+        return self._runs
+
+    def run(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> SQLStatements:
+        return self.render(self.translate(composite_attributes_choices, hierarchy_choices, relationship_choices))
+
+    def translate(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> RelationalModel:
+        """Run every stage but render."""
+        normalized_model = self.normalize(composite_attributes_choices)
+        hierarchy_free_model = self.eliminate_hierarchies(normalized_model, hierarchy_choices)
+        return self.translate_tables(hierarchy_free_model, relationship_choices)
+
+    def normalize(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE]) -> NormalizedModel:
+        if self._model_fingerprint is None:
+            self._model_fingerprint = fingerprint_model(self._entities, self._relationships)
+        key = (self._model_fingerprint, frozenset(composite_attributes_choices.items()))
+        return self._get_artifact("normalize", key, lambda: self._normalize(key, composite_attributes_choices))
+
+    def eliminate_hierarchies(self, normalized_model: NormalizedModel, hierarchy_choices: dict[str, HIERARCHY_CHOICE]) -> HierarchyFreeModel:
+        key = (normalized_model.key, frozenset(hierarchy_choices.items()))
+        return self._get_artifact("eliminate_hierarchies", key, lambda: self._eliminate_hierarchies(key, normalized_model, hierarchy_choices))
+
+    def translate_tables(self, hierarchy_free_model: HierarchyFreeModel, relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> RelationalModel:
+        key = (hierarchy_free_model.key, frozenset(relationship_choices.items()))
+        return self._get_artifact("translate_tables", key, lambda: self._translate_tables(key, hierarchy_free_model, relationship_choices))
+
+    def render(self, relational_model: RelationalModel) -> SQLStatements:
+        key = relational_model.key
+        return self._get_artifact("render", key, lambda: SQLStatements(key, *create_sql_statements(relational_model.tables, relational_model.hierarchy_checks)))
+
+    def _get_artifact(self, stage: str, key: tuple, create_artifact):
+        cache = self._stage_caches[stage]
+        with self._lock:
+            artifact = cache.get(key)
+            if artifact is not None:
+                cache.move_to_end(key)
+                return artifact
+        # built outside the lock, so other stages and keys are not blocked
+        artifact = create_artifact()
+        with self._lock:
+            self._runs[stage] += 1
+            artifact = cache.setdefault(key, artifact)
+            cache.move_to_end(key)
+            # least recently used first
+            while len(cache) > self._max_entries:
+                cache.popitem(last=False)
+        return artifact
+
+    def _copy_model(self, entities: dict[str, Entity], relationships: dict[str, Relationship]) -> ERTranslator:
+        entities = {entity_name: entity.copy() for entity_name, entity in entities.items()}
+        relationships = {relationship_name: relationship.copy() for relationship_name, relationship in relationships.items()}
+        return ERTranslator(entities, relationships)
+
+    def _normalize(self, key: tuple, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE]) -> NormalizedModel:
+        translator = self._copy_model(self._entities, self._relationships)
+        translator.normalize_all_attributes(composite_attributes_choices)
+        return NormalizedModel(key, translator.entities, translator.relationships)
+
+    def _eliminate_hierarchies(self, key: tuple, normalized_model: NormalizedModel, hierarchy_choices: dict[str, HIERARCHY_CHOICE]) -> HierarchyFreeModel:
+        translator = self._copy_model(normalized_model.entities, normalized_model.relationships)
+        translator.eliminate_all_hierarchies(hierarchy_choices)
+        return HierarchyFreeModel(key, translator.entities, translator.relationships, translator.hierarchy_checks, translator.collapsed_entities, translator.relationship_origins)
+
+    def _translate_tables(self, key: tuple, hierarchy_free_model: HierarchyFreeModel, relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> RelationalModel:
+        # translating entities and relationships only reads the conceptual model and the hierarchy state
+        translator = ERTranslator(dict(hierarchy_free_model.entities), dict(hierarchy_free_model.relationships))
+        translator.set_hierarchy_state(hierarchy_free_model.hierarchy_checks, hierarchy_free_model.collapsed_entities, hierarchy_free_model.relationship_origins)
+        translator.translate_entities_and_relationships(relationship_choices)
+        return RelationalModel(key, translator.tables, translator.hierarchy_checks)
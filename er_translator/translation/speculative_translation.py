@@ -0,0 +1,56 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ..data.choices import COMPOSITE_ATTRIBUTE_CHOICE, RELATIONSHIP_CHOICE, HIERARCHY_CHOICE
+from ..utils.utils import get_neighbour_choices
+
+DEFAULT_MAX_WORKERS = 1
+
+class SpeculativeTranslator:
+    """
+    Background worker that translates the configurations one choice away from the current one.
+
+    The translator must have a TranslationCache: speculative results are only
+    stored there, so when the user picks one of the alternatives its translation
+    is usually already cached. Starting a new round or calling cancel drops the
+    speculation that has not started yet.
+    """
+    def __init__(self, translator, max_workers: int = DEFAULT_MAX_WORKERS):
+        self._translator = translator
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculative-translation")
+        self._futures = []
+        # bumped by cancel, queued translations of an older round are skipped
+        self._round = 0
+        self._lock = threading.Lock()
+
+    def speculate(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> None:
+        """Start translating every single-choice neighbour of the given choices."""
+        self.cancel()
+        with self._lock:
+            speculation_round = self._round
+            for neighbour_choices in self.get_neighbour_choices(composite_attributes_choices, hierarchy_choices, relationship_choices):
+                self._futures.append(self._executor.submit(self._translate, speculation_round, neighbour_choices))
+
+    def get_neighbour_choices(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> list[tuple[dict, dict, dict]]:
+        all_choices = (
+            self._translator.get_composite_attributes_choices()[0],
+            self._translator.get_hierarchy_choices()[0],
+            self._translator.get_relationship_choices()[0],
+        )
+        return get_neighbour_choices(all_choices, (composite_attributes_choices, hierarchy_choices, relationship_choices))
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._round += 1
+            for future in self._futures:
+                future.cancel()
+            self._futures = []
+
+    def shutdown(self) -> None:
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _translate(self, speculation_round: int, choices: tuple[dict, dict, dict]) -> None:
+        if speculation_round != self._round:
+            return
+        self._translator.translate_statements(*choices)
@@ -1,23 +1,54 @@
 from pathlib import Path
+from string import Formatter
 
 from ..data.conceptual import *
 from ..data.constraint import *
-from ..utils.utils import load_tpl_file, get_primary_keys
-
-
-
-SELECTOR_PREFIX = "TYPE_"
-
-CWD = Path(__file__)
-PREFIX = CWD.parent.parent
-ATTRIBUTE = load_tpl_file(PREFIX.joinpath("templates").joinpath("attribute.tpl"))
-CONSTRAINT = load_tpl_file(PREFIX.joinpath("templates").joinpath("contraint.tpl"))
-REFERENCE = load_tpl_file(PREFIX.joinpath("templates").joinpath("reference.tpl"))
-SELECTOR = load_tpl_file(PREFIX.joinpath("templates").joinpath("selector.tpl"))
-TABLE = load_tpl_file(PREFIX.joinpath("templates").joinpath("table.tpl"))
-TRIGGER_ONE_CHILD = load_tpl_file(PREFIX.joinpath("templates").joinpath("trigger_one_child.tpl"))
-TRIGGER_BOTH_CHILDREN = load_tpl_file(PREFIX.joinpath("templates").joinpath("trigger_both_children.tpl"))
-TRIGGER_DOWNWARDS = load_tpl_file(PREFIX.joinpath("templates").joinpath("trigger_downwards.tpl"))
+from ..utils.utils import load_tpl_file
+
+
+
+TEMPLATES_DIRECTORY = Path(__file__).parent.parent.joinpath("templates")
+
+class SQLTemplate:
+    """
+    .tpl template read and compiled on first use, so importing the module does no file I/O.
+
+    The template is compiled into an f-string function taking its fields as
+    keyword arguments, which replaces render after the first call.
+    """
+    def __init__(self, file_name: str):
+        self._file_name = file_name
+        self._text = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = load_tpl_file(TEMPLATES_DIRECTORY.joinpath(self._file_name))
+        return self._text
+
+    def render(self, **params) -> str:
+        self.render = self.compile()
+        return self.render(**params)
+
+    def compile(self):
+        fields = []
+        for _, field_name, _, _ in Formatter().parse(self.text):
+            if field_name is None or field_name in fields:
+                continue
+            if not field_name.isidentifier():
+                raise ValueError(f"Unsupported field {{{field_name}}} in template {self._file_name}")
+            fields.append(field_name)
+        arguments = f"*, {", ".join(fields)}" if fields else ""
+        return eval(f"lambda {arguments}: f{self.text!r}", {})
+
+ATTRIBUTE = SQLTemplate("attribute.tpl")
+CONSTRAINT = SQLTemplate("contraint.tpl")
+REFERENCE = SQLTemplate("reference.tpl")
+SELECTOR = SQLTemplate("selector.tpl")
+TABLE = SQLTemplate("table.tpl")
+TRIGGER_ONE_CHILD = SQLTemplate("trigger_one_child.tpl")
+TRIGGER_BOTH_CHILDREN = SQLTemplate("trigger_both_children.tpl")
+TRIGGER_DOWNWARDS = SQLTemplate("trigger_downwards.tpl")
 
 class SQLGenerator:
     @staticmethod
@@ -40,155 +71,69 @@ class SQLGenerator:
         if constraints:
             constraints_list = ",\n    " + ",\n    ".join(constraints)
         
-        params = {
-            "table_name": table_name,
-            "attributes": attributes_list,
-            "selectors": selectors_list,
-            "references": references_list,
-            "primary_keys": primary_keys_list,
-            "constraints": constraints_list,
-
-        }
-
-        return TABLE.format(**params)
+        return TABLE.render(
+            table_name=table_name,
+            attributes=attributes_list,
+            selectors=selectors_list,
+            references=references_list,
+            primary_keys=primary_keys_list,
+            constraints=constraints_list
+        )
     
     @staticmethod
     def create_sql_attribute(attribute_name: str, is_optional: bool, is_unique: bool = False) -> str:
-        params = {
-                "attribute_name": attribute_name,
-                "attribute_type": "{ADD_TYPE}",
-                "optional": "" if is_optional else " NOT NULL",
-                "unique": " UNIQUE" if is_unique else ""
-            }
-        return ATTRIBUTE.format(**params)
+        return ATTRIBUTE.render(
+            attribute_name=attribute_name,
+            attribute_type="{ADD_TYPE}",
+            optional="" if is_optional else " NOT NULL",
+            unique=" UNIQUE" if is_unique else ""
+        )
 
     @staticmethod
     def create_sql_reference(attribute, table_name, primary_key) -> str:
-        params = {
-            "attribute": attribute,
-            "table": table_name,
-            "primary_key": primary_key
-        }
-        return REFERENCE.format(**params)
+        return REFERENCE.render(attribute=attribute, table=table_name, primary_key=primary_key)
 
     @staticmethod
     def create_sql_selector(name: str, values: list[str]) -> str:
-        params = {
-            "selector_name": name,
-            "selector_type": "VARCHAR(50)",
-            "optional": "NOT NULL",
-            "values": values
-        }
-        return SELECTOR.format(**params)
-
-
-
-    @staticmethod
-    def create_sql_constraint(constraint: Constraint) -> str:
-        constraint_name = constraint.constraint_name
-        selector_name = constraint.selector_name
-        conditions = constraint.conditions
-
-        complete_conditions = []
-        for condition in conditions:
-            selector_value = condition.selector_value
-            checks = condition.checks
-            complete_checks = []
-            for check in checks:
-                attribute_name = check.attribute_name
-                attribute_value = "NULL" if check.isNull else "NOT NULL"
-
-                complete_check = f"{attribute_name} IS {attribute_value}"
-                complete_checks.append(complete_check)
-            complete_condition = f"({selector_name} = {selector_value} AND {" AND ".join(complete_checks)})"
-            complete_conditions.append(complete_condition)
-        
-        params = {
-            "constraint_name": constraint_name,
-            "conditions": " OR ".join(complete_conditions)
-        }
+        return SELECTOR.render(selector_name=name, selector_type="VARCHAR(50)", optional="NOT NULL", values=values)
 
-        return CONSTRAINT.format(**params)
 
-    @staticmethod
-    def create_sql_total_constraint(children_names) -> str:
-        constraint_name = "TOTAL_HIERARCHY"
-        conditions = []
-        
-        for name in children_names:
-            conditions.append(f"{SELECTOR_PREFIX}{name}=1")
-        
-        conditions = " OR ".join(conditions)
 
-        params = {
-            "constraint_name": constraint_name,
-            "conditions": "(" + conditions + ")"
-        }
-
-        return CONSTRAINT.format(**params)
-    
     @staticmethod
-    def create_sql_trigger_before_insert(relationship, table_name, father, connected_child, selector_name, other_child = None, other_selector_name = None, identifier_modifier: str = "") -> str:
-        trigger_name = relationship.name + connected_child.name
-        primary_keys = get_primary_keys(father)
-        conditions = []
-
-        for primary_key in primary_keys:
-            if identifier_modifier != "":
-                condition = f"{father.name}.{primary_key} = N.{relationship.name}_{connected_child.name}_{primary_key}{identifier_modifier}"
-            else:
-                condition = f"{father.name}.{primary_key} = N.{relationship.name}_{connected_child.name}_{primary_key}"
-            conditions.append(condition)
-        
-        hierarchy = father.hierarchy
-        if hierarchy.hierarchy_disjointness == HierarchyDisjointness.DISJOINT:
-            selector_value = connected_child.name
-            if other_child:
-                other_selector_value = other_child.name
-            else:
-                other_selector_value = None
-        else:
-            selector_value = 1
-            other_selector_value = 1
-        params = {
-            "trigger_name": trigger_name,
-            "table_name": table_name,
-            "conditions": " AND ".join(conditions),
-            "selector_name": selector_name,
-            "selector_value": selector_value,
-            "entity_name": father.name,
-            "child_name": connected_child.name
-        }
-        
-        if other_child:
-            params.update({
-                "other_selector_name": other_selector_name,
-                "other_selector_value": other_selector_value
-            })
-            return TRIGGER_BOTH_CHILDREN.format(**params)
-        
-        return TRIGGER_ONE_CHILD.format(**params)
-    
+    def create_sql_check(constraint_name: str, conditions: str) -> str:
+        return CONSTRAINT.render(constraint_name=constraint_name, conditions=conditions)
 
     @staticmethod
-    def create_sql_downwards_constraint(constraint_name, conditions) -> str:
-        conditions = " OR ".join(conditions)
-
-        params = {
-            "constraint_name": constraint_name,
-            "conditions": conditions
-        }
-
-        return CONSTRAINT.format(**params)
+    def create_sql_trigger_before_insert(trigger_name, table_name, entity_name, child_name, conditions, selector_name, selector_value, other_selector_name = None, other_selector_value = None) -> str:
+        if other_selector_name:
+            return TRIGGER_BOTH_CHILDREN.render(
+                trigger_name=trigger_name,
+                table_name=table_name,
+                conditions=conditions,
+                selector_name=selector_name,
+                selector_value=selector_value,
+                entity_name=entity_name,
+                child_name=child_name,
+                other_selector_name=other_selector_name,
+                other_selector_value=other_selector_value
+            )
+
+        return TRIGGER_ONE_CHILD.render(
+            trigger_name=trigger_name,
+            table_name=table_name,
+            conditions=conditions,
+            selector_name=selector_name,
+            selector_value=selector_value,
+            entity_name=entity_name,
+            child_name=child_name
+        )
 
     @staticmethod
-    def create_sql_downwards_trigger(table_name, other_table_name, conditions, message) -> str:
-        params = {
-            "trigger_name": table_name + "_" + other_table_name,
-            "table_name": table_name,
-            "other_table_name": other_table_name,
-            "conditions": conditions,
-            "message": message
-        }
-        return TRIGGER_DOWNWARDS.format(**params)
-    
\ No newline at end of file
+    def create_sql_downwards_trigger(trigger_name, table_name, other_table_name, conditions, message) -> str:
+        return TRIGGER_DOWNWARDS.render(
+            trigger_name=trigger_name,
+            table_name=table_name,
+            other_table_name=other_table_name,
+            conditions=conditions,
+            message=message
+        )
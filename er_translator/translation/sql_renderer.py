@@ -0,0 +1,142 @@
+from ..data.sql_ir import Column, Reference, Selector, NullCheck, RowCondition, AnySelectorSet, Check, CreateTable, ParentTrigger, ExclusionTrigger
+from .sql_generator import SQLGenerator
+
+class SQLRenderer:
+    """
+    Render statement IR into SQL text with the .tpl templates of SQLGenerator.
+
+    This is the dialect the translator has always produced. Other dialects
+    subclass it and override the render_* methods of the nodes they write differently.
+    """
+    dialect = "default"
+
+    def render(self, statement) -> str:
+        if isinstance(statement, CreateTable):
+            return self.render_create_table(statement)
+        if isinstance(statement, ParentTrigger):
+            return self.render_parent_trigger(statement)
+        if isinstance(statement, ExclusionTrigger):
+            return self.render_exclusion_trigger(statement)
+        raise TypeError(f"Cannot render {type(statement).__name__} statements!")
+
+    def render_statements(self, statements):
+        """Render statements one at a time, as they are requested."""
+        for statement in statements:
+            yield self.render(statement)
+
+    def render_column(self, column: Column) -> str:
+        return SQLGenerator.create_sql_attribute(column.name, column.is_optional, column.is_unique)
+
+    def render_selector(self, selector: Selector) -> str:
+        return SQLGenerator.create_sql_selector(selector.name, list(selector.values))
+
+    def render_reference(self, reference: Reference) -> str:
+        return SQLGenerator.create_sql_reference(self.render_column(reference.column), reference.table_name, reference.primary_key)
+
+    def render_check(self, check: Check) -> str:
+        return SQLGenerator.create_sql_check(check.name, " OR ".join(self.render_condition(condition) for condition in check.conditions))
+
+    def render_condition(self, condition) -> str:
+        if isinstance(condition, RowCondition):
+            return self.render_row_condition(condition)
+        if isinstance(condition, AnySelectorSet):
+            return self.render_any_selector_set(condition)
+        raise TypeError(f"Cannot render {type(condition).__name__} conditions!")
+
+    def render_null_check(self, null_check: NullCheck) -> str:
+        return f"{null_check.column} IS {"NULL" if null_check.is_null else "NOT NULL"}"
+
+    def render_row_condition(self, condition: RowCondition) -> str:
+        null_checks = " AND ".join(self.render_null_check(null_check) for null_check in condition.null_checks)
+        if condition.selector_name is None:
+            return f"({null_checks})"
+        return f"({condition.selector_name} = {condition.selector_value} AND {null_checks})"
+
+    def render_any_selector_set(self, condition: AnySelectorSet) -> str:
+        return "(" + " OR ".join(f"{selector_name}=1" for selector_name in condition.selector_names) + ")"
+
+    def render_create_table(self, table: CreateTable) -> str:
+        return SQLGenerator.create_sql_table(
+            table.name,
+            [self.render_column(column) for column in table.columns],
+            [self.render_selector(selector) for selector in table.selectors],
+            [self.render_reference(reference) for reference in table.references],
+            list(table.primary_keys),
+            [self.render_check(check) for check in table.checks]
+        )
+
+    def render_parent_trigger(self, trigger: ParentTrigger) -> str:
+        conditions = " AND ".join(f"{trigger.parent_table_name}.{primary_key} = N.{column}" for primary_key, column in trigger.key_columns)
+        return SQLGenerator.create_sql_trigger_before_insert(
+            trigger.name, trigger.table_name, trigger.parent_table_name, trigger.child_name, conditions,
+            trigger.selector_name, trigger.selector_value, trigger.other_selector_name, trigger.other_selector_value
+        )
+
+    def render_exclusion_trigger(self, trigger: ExclusionTrigger) -> str:
+        conditions = " OR ".join(f"N.{column} = {trigger.other_table_name}.{column}" for column in trigger.key_columns)
+        return SQLGenerator.create_sql_downwards_trigger(trigger.name, trigger.table_name, trigger.other_table_name, conditions, trigger.message)
+
+
+class PostgreSQLRenderer(SQLRenderer):
+    """PostgreSQL dialect: quoted selector values, and triggers calling a PL/pgSQL function."""
+    dialect = "postgresql"
+
+    def render_selector(self, selector: Selector) -> str:
+        values = ", ".join(self._quote(value) for value in selector.values)
+        return f"{selector.name} VARCHAR(50) NOT NULL CHECK ({selector.name} IN ({values}))"
+
+    def render_row_condition(self, condition: RowCondition) -> str:
+        null_checks = [self.render_null_check(null_check) for null_check in condition.null_checks]
+        if condition.selector_name is not None:
+            null_checks.insert(0, f"{condition.selector_name} = {self._quote(condition.selector_value)}")
+        return "(" + " AND ".join(null_checks) + ")"
+
+    def render_any_selector_set(self, condition: AnySelectorSet) -> str:
+        return "(" + " OR ".join(f"{selector_name} = '1'" for selector_name in condition.selector_names) + ")"
+
+    def render_parent_trigger(self, trigger: ParentTrigger) -> str:
+        conditions = " AND ".join(f"{trigger.parent_table_name}.{primary_key} = NEW.{column}" for primary_key, column in trigger.key_columns)
+        condition = (
+            f"NOT EXISTS (SELECT * FROM {trigger.parent_table_name} WHERE {conditions} "
+            f"AND {trigger.parent_table_name}.{trigger.selector_name} = {self._quote(trigger.selector_value)})"
+        )
+        if trigger.other_selector_name:
+            condition = f"NEW.{trigger.other_selector_name} = {self._quote(trigger.other_selector_value)} AND {condition}"
+        # both sides of a recursive relationship need their own function and trigger
+        return self._render_trigger(trigger.name + trigger.identifier_modifier, trigger.table_name, condition, f"Inserted tuple needs to reference an instance of {trigger.child_name}!")
+
+    def render_exclusion_trigger(self, trigger: ExclusionTrigger) -> str:
+        conditions = " OR ".join(f"NEW.{column} = {trigger.other_table_name}.{column}" for column in trigger.key_columns)
+        condition = f"EXISTS (SELECT * FROM {trigger.other_table_name} WHERE {conditions})"
+        return self._render_trigger(trigger.name, trigger.table_name, condition, trigger.message)
+
+    def _render_trigger(self, trigger_name: str, table_name: str, condition: str, message: str) -> str:
+        function_name = trigger_name + "_check"
+        message = message.replace("'", "''")
+        return (
+            f"CREATE FUNCTION {function_name}() RETURNS trigger AS $$\n"
+            f"BEGIN\n"
+            f"    IF {condition} THEN\n"
+            f"        RAISE EXCEPTION '{message}' USING ERRCODE = '70001';\n"
+            f"    END IF;\n"
+            f"    RETURN NEW;\n"
+            f"END;\n"
+            f"$$ LANGUAGE plpgsql;\n"
+            f"CREATE TRIGGER {trigger_name}\n"
+            f"BEFORE INSERT ON {table_name}\n"
+            f"FOR EACH ROW EXECUTE FUNCTION {function_name}();"
+        )
+
+    def _quote(self, value) -> str:
+        return "'" + str(value).replace("'", "''") + "'"
+
+
+DEFAULT_RENDERER = SQLRenderer()
+
+def render_dialects(statements, renderers: list[SQLRenderer]) -> dict[str, list[str]]:
+    """Render the same statements with several renderers in one pass over them."""
+    rendered = {renderer.dialect: [] for renderer in renderers}
+    for statement in statements:
+        for renderer in renderers:
+            rendered[renderer.dialect].append(renderer.render(statement))
+    return rendered
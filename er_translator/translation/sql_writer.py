@@ -0,0 +1,44 @@
+import io
+
+# characters collected before writing to the sink
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+def join_sql_code(table_statements: list[str], triggers: list[str]) -> str:
+    return "\n\n".join(table_statements) + "\n\n" + "\n\n".join(triggers)
+
+def iter_sql_code(table_statements, triggers):
+    """Yield the pieces of join_sql_code one at a time, statements can be any iterable, also lazy ones."""
+    separator = ""
+    for table_statement in table_statements:
+        yield separator
+        yield table_statement
+        separator = "\n\n"
+    yield "\n\n"
+    separator = ""
+    for trigger in triggers:
+        yield separator
+        yield trigger
+        separator = "\n\n"
+
+def write_sql_code(sql_code_pieces, sink, buffer_size: int = DEFAULT_BUFFER_SIZE, encoding: str = "utf-8") -> None:
+    """
+    Write SQL code pieces to a text or binary sink, like a file, sys.stdout or a gzip stream.
+
+    Pieces are collected up to buffer_size characters, so the sink sees few large writes
+    and the whole SQL code is never held in memory.
+    """
+    binary = not isinstance(sink, io.TextIOBase)
+    buffer = []
+    buffered_size = 0
+    for piece in sql_code_pieces:
+        buffer.append(piece)
+        buffered_size += len(piece)
+        if buffered_size >= buffer_size:
+            _write(sink, "".join(buffer), binary, encoding)
+            buffer = []
+            buffered_size = 0
+    if buffer:
+        _write(sink, "".join(buffer), binary, encoding)
+
+def _write(sink, text: str, binary: bool, encoding: str) -> None:
+    sink.write(text.encode(encoding) if binary else text)
@@ -0,0 +1,106 @@
+import math
+
+from ..data.conceptual import Entity, Relationship
+from ..data.relational import Table
+from ..data.sql_ir import Selector
+from ..data.choices import COMPOSITE_ATTRIBUTE_CHOICE, RELATIONSHIP_CHOICE, HIERARCHY_CHOICE
+from ..data.statistics import Statistics
+from .er_translation import ERTranslator
+
+class TableEstimate:
+    __slots__ = ("name", "rows", "columns", "bytes_per_row", "total_bytes", "null_density")
+
+    def __init__(self, name: str, rows: int, columns: int, bytes_per_row: float, null_density: float):
+        self.name = name
+        self.rows = rows
+        self.columns = columns
+        self.bytes_per_row = bytes_per_row
+        self.total_bytes = rows * bytes_per_row
+        self.null_density = null_density
+
+class StorageEstimator:
+    """
+    Estimate the size of every table of a translation from model statistics.
+
+    A table holds as many rows as the largest entity stored in it. A column coming
+    from an entity with fewer rows, like the attributes of a child collapsed
+    upwards or of an entity merged by a one to one relationship, is NULL in the
+    other rows, on top of the null ratio of the attribute itself. The selectors of
+    a collapsed hierarchy are never NULL, as wide as their values unless the
+    statistics give their width.
+    A row takes the row overhead, a null bitmap, and the width of its non NULL values.
+    """
+    def __init__(self, entities: dict[str, Entity], relationships: dict[str, Relationship], statistics: Statistics):
+        self._entities = entities
+        self._relationships = relationships
+        self._statistics = statistics
+        self._translator = ERTranslator(entities, relationships)
+        # attribute name -> first entity declaring it, for columns copied into other tables
+        self._attribute_entities = {}
+        for entity in entities.values():
+            for attribute in list(entity.identifiers) + list(entity.attributes):
+                self._attribute_entities.setdefault(attribute.name, entity)
+
+    def estimate(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> dict[str, TableEstimate]:
+        return self.estimate_tables(self._translator.translate_model(composite_attributes_choices, hierarchy_choices, relationship_choices))
+
+    def estimate_tables(self, translated: ERTranslator) -> dict[str, TableEstimate]:
+        """Estimate the tables of a translator returned by ERTranslator.translate_model."""
+        table_entities = {}
+        for entity_name, entity in self._entities.items():
+            table_entities.setdefault(translated.resolve_table_name(entity_name), []).append(entity)
+
+        estimates = {}
+        for table_name, table in translated.tables.items():
+            estimates[table_name] = self._estimate_table(table, table_entities.get(table_name, []), translated.hierarchy_checks.selectors.get(table_name, []))
+        return estimates
+
+    def _estimate_table(self, table: Table, entities: list[Entity], selectors: list[Selector] = ()) -> TableEstimate:
+        statistics = self._statistics
+        if entities:
+            rows = max(statistics.get_rows(entity.name) for entity in entities)
+        elif table.name in self._relationships and not statistics.has_rows(table.name):
+            relationship = self._relationships[table.name]
+            rows = max(statistics.get_rows(relationship.entity_from), statistics.get_rows(relationship.entity_to))
+        else:
+            rows = statistics.get_rows(table.name)
+
+        foreign_keys_names = {foreign_key.name for foreign_key in table.foreign_keys}
+        # primary keys that are also foreign keys are stored once
+        columns = [primary_key for primary_key in table.primary_keys if primary_key.name not in foreign_keys_names]
+        columns += table.attributes
+        columns += table.foreign_keys
+
+        values_width = 0
+        null_values = 0
+        for column in columns:
+            owner = self._get_column_owner(column.name, entities)
+            if owner:
+                owner_name = owner.name
+            elif column.name in self._attribute_entities:
+                owner_name = self._attribute_entities[column.name].name
+            else:
+                owner_name = table.name
+            # share of the table rows where the column has a value
+            filled_ratio = 1 - statistics.get_null_ratio(owner_name, column.name)
+            if owner and rows:
+                filled_ratio *= min(statistics.get_rows(owner.name) / rows, 1)
+            values_width += filled_ratio * statistics.get_width(owner_name, column.name)
+            null_values += 1 - filled_ratio
+
+        for selector in selectors:
+            if statistics.has_width(table.name, selector.name):
+                values_width += statistics.get_width(table.name, selector.name)
+            else:
+                values_width += sum(len(value) for value in selector.values) / len(selector.values) if selector.values else statistics.default_width
+
+        columns_count = len(columns) + len(selectors)
+        bytes_per_row = statistics.row_overhead + math.ceil(columns_count / 8) + values_width
+        null_density = null_values / columns_count if columns_count else 0
+        return TableEstimate(table.name, rows, columns_count, bytes_per_row, null_density)
+
+    def _get_column_owner(self, column_name: str, entities: list[Entity]) -> Entity:
+        for entity in entities:
+            if entity.get_identifier(column_name) is not None or entity.get_attribute(column_name) is not None:
+                return entity
+        return None
@@ -0,0 +1,100 @@
+import threading
+from collections import OrderedDict
+
+from ..data.choices import COMPOSITE_ATTRIBUTE_CHOICE, RELATIONSHIP_CHOICE, HIERARCHY_CHOICE
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_SIZE = 32 * 1024 * 1024
+
+class TranslationCache:
+    """
+    In-process LRU cache of finished translations.
+
+    Entries are keyed by the fingerprint of the conceptual model and the frozen
+    choice dicts, so the same configuration of the same model is translated once.
+    The size of an entry is the utf-8 size of its SQL statements; the least
+    recently used entries are evicted when either max_entries or max_size is exceeded.
+    The cache can be shared between translators and threads.
+    """
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_size: int = DEFAULT_MAX_SIZE):
+        self._max_entries = max_entries
+        self._max_size = max_size
+        self._entries: OrderedDict[tuple, tuple[tuple[str, ...], tuple[str, ...], int, tuple]] = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_entries(self):
+        return self._max_entries
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_key(self, model_fingerprint: str, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> tuple:
+        # the translation only looks choices up by key, so their order does not matter
+        return (model_fingerprint, frozenset(composite_attributes_choices.items()), frozenset(hierarchy_choices.items()), frozenset(relationship_choices.items()))
+
+    def load(self, key: tuple):
+        """Return the cached (table statements, triggers) for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        table_statements, triggers, _, _ = entry
+        return list(table_statements), list(triggers)
+
+    def load_ordered(self, key: tuple):
+        """Return the cached (table statements, triggers, order keys) for key, or None if they were stored without order keys."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[3] is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        table_statements, triggers, _, order_keys = entry
+        return list(table_statements), list(triggers), order_keys
+
+    def store(self, key: tuple, table_statements: list[str], triggers: list[str], order_keys: tuple = None) -> None:
+        entry_size = sum(len(statement.encode()) for statement in table_statements) + sum(len(trigger.encode()) for trigger in triggers)
+        if entry_size > self._max_size:
+            return
+        with self._lock:
+            previous_entry = self._entries.pop(key, None)
+            if previous_entry is not None:
+                self._size -= previous_entry[2]
+            self._entries[key] = (tuple(table_statements), tuple(triggers), entry_size, order_keys)
+            self._size += entry_size
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _evict(self) -> None:
+        # least recently used first
+        while len(self._entries) > self._max_entries or self._size > self._max_size:
+            _, (_, _, entry_size, _) = self._entries.popitem(last=False)
+            self._size -= entry_size
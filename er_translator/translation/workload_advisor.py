@@ -0,0 +1,120 @@
+from ..data.conceptual import Entity, Relationship, MaximumCardinality
+from ..data.choices import COMPOSITE_ATTRIBUTE_CHOICE, RELATIONSHIP_CHOICE, HIERARCHY_CHOICE
+from ..data.workload import Workload, AccessPath
+from ..exceptions.exceptions import WorkloadFormatException
+from .er_translation import ERTranslator
+
+MAX_ROUNDS = 10
+
+class WorkloadAdvisor:
+    """
+    Choose hierarchy collapse directions and one to one relationship translations for a workload.
+
+    The cost of an access path is its frequency times the rows of every table it
+    touches plus join_cost for each join between them. A father collapsed
+    downwards is read from all its children tables, a relationship translated
+    into its own table adds that table between its two entities.
+    Decisions are improved one at a time until none of them changes, the cost of
+    every alternative of the last round is kept in hierarchy_costs and relationship_costs.
+    """
+    def __init__(self, entities: dict[str, Entity], relationships: dict[str, Relationship], workload: Workload):
+        for access_path in workload.access_paths:
+            for entity_name in access_path.entities:
+                if entity_name not in entities:
+                    raise WorkloadFormatException(f"Access path {access_path.name} uses unknown entity {entity_name}!")
+        self._entities = entities
+        self._relationships = relationships
+        self._workload = workload
+        self._translator = ERTranslator(entities, relationships)
+        self._hierarchy_costs = {}
+        self._relationship_costs = {}
+
+    @property
+    def hierarchy_costs(self):
+        # father entity name -> {choice: estimated cost}
+        return self._hierarchy_costs
+
+    @property
+    def relationship_costs(self):
+        # relationship name -> {choice: estimated cost}
+        return self._relationship_costs
+
+    def advise(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE] = None, hierarchy_choices: dict[str, HIERARCHY_CHOICE] = None, relationship_choices: dict[str, RELATIONSHIP_CHOICE] = None) -> tuple[dict, dict, dict]:
+        """Return the choices with the lowest estimated cost, starting from the given or default ones."""
+        hierarchy_options, default_hierarchy_choices = self._translator.get_hierarchy_choices()
+        relationship_options, default_relationship_choices = self._translator.get_relationship_choices()
+        choices = (
+            dict(composite_attributes_choices) if composite_attributes_choices is not None else self._translator.get_composite_attributes_choices()[1],
+            dict(hierarchy_choices) if hierarchy_choices is not None else default_hierarchy_choices,
+            dict(relationship_choices) if relationship_choices is not None else default_relationship_choices,
+        )
+        decisions = [(1, entity_name, options, self._hierarchy_costs) for entity_name, options in hierarchy_options.items()]
+        for relationship_name, options in relationship_options.items():
+            relationship = self._relationships[relationship_name]
+            if relationship.cardinality_from.max_cardinality == MaximumCardinality.ONE and relationship.cardinality_to.max_cardinality == MaximumCardinality.ONE:
+                decisions.append((2, relationship_name, options, self._relationship_costs))
+
+        for _ in range(MAX_ROUNDS):
+            changed = False
+            for position, item_key, options, costs in decisions:
+                current_choice = choices[position][item_key]
+                item_costs = {}
+                for choice in sorted(options, key=lambda item_choice: item_choice.value):
+                    choices[position][item_key] = choice
+                    item_costs[choice] = self.estimate_cost(*choices)
+                costs[item_key] = item_costs
+                # ties keep the current choice
+                best_choice = min(item_costs, key=lambda choice: (item_costs[choice], choice != current_choice))
+                choices[position][item_key] = best_choice
+                changed = changed or best_choice != current_choice
+            if not changed:
+                break
+        return choices
+
+    def estimate_cost(self, composite_attributes_choices: dict[(str, str), COMPOSITE_ATTRIBUTE_CHOICE], hierarchy_choices: dict[str, HIERARCHY_CHOICE], relationship_choices: dict[str, RELATIONSHIP_CHOICE]) -> float:
+        translated = self._translator.translate_model(composite_attributes_choices, hierarchy_choices, relationship_choices)
+        table_rows = self._get_table_rows(translated)
+        cost = 0
+        for access_path in self._workload.access_paths:
+            cost += self._estimate_access_path_cost(translated, table_rows, access_path, hierarchy_choices)
+        return cost
+
+    def _estimate_access_path_cost(self, translated: ERTranslator, table_rows: dict[str, int], access_path: AccessPath, hierarchy_choices: dict[str, HIERARCHY_CHOICE]) -> float:
+        # dict used as an ordered set of table names
+        touched_tables = {}
+        previous_entity_name = None
+        for entity_name in access_path.entities:
+            if previous_entity_name is not None:
+                for relationship in self._relationships.values():
+                    if {relationship.entity_from, relationship.entity_to} == {previous_entity_name, entity_name} and relationship.name in translated.tables:
+                        touched_tables[relationship.name] = None
+            for table_name in self._get_entity_tables(translated, entity_name, hierarchy_choices):
+                touched_tables[table_name] = None
+            previous_entity_name = entity_name
+
+        rows = sum(table_rows.get(table_name, self._workload.default_rows) for table_name in touched_tables)
+        joins = max(len(touched_tables) - 1, 0)
+        return access_path.frequency * (rows + self._workload.join_cost * joins)
+
+    def _get_entity_tables(self, translated: ERTranslator, entity_name: str, hierarchy_choices: dict[str, HIERARCHY_CHOICE]) -> list[str]:
+        entity = self._entities[entity_name]
+        if entity.hierarchy and hierarchy_choices.get(entity_name) == HIERARCHY_CHOICE.COLLAPSE_DOWNWARDS:
+            # the father rows are spread over the children tables
+            table_names = []
+            for child_name in entity.hierarchy.children:
+                table_names += self._get_entity_tables(translated, child_name, hierarchy_choices)
+            return table_names
+        table_name = translated.resolve_table_name(entity_name)
+        return [table_name] if table_name in translated.tables else []
+
+    def _get_table_rows(self, translated: ERTranslator) -> dict[str, int]:
+        # a table holds as many rows as the largest entity stored in it
+        table_rows = {}
+        for entity_name in self._entities:
+            table_name = translated.resolve_table_name(entity_name)
+            if table_name in translated.tables:
+                table_rows[table_name] = max(table_rows.get(table_name, 0), self._workload.get_rows(entity_name))
+        for relationship in self._relationships.values():
+            if relationship.name in translated.tables and relationship.name not in table_rows:
+                table_rows[relationship.name] = max(self._workload.get_rows(relationship.entity_from), self._workload.get_rows(relationship.entity_to))
+        return table_rows
@@ -0,0 +1,65 @@
+"""
+Messages and events of the translator go through the standard logging module.
+
+Modules log to logging.getLogger(__name__), children of the er_translator
+logger, which has no handler of its own: nothing is formatted or written
+until an application enables an output, so library and batch use pay only
+an isEnabledFor check. Records carry an event name and its fields, which
+handlers can read as record.event and record.fields.
+"""
+
+import json
+import logging
+import sys
+
+LOGGER_NAME = "er_translator"
+
+def log_event(logger: logging.Logger, level: int, event: str, message: str, *args, **fields) -> None:
+    # message is formatted with args only if a handler will see the record
+    if logger.isEnabledFor(level):
+        logger.log(level, message, *args, extra={"event": event, "fields": fields})
+
+class ConsoleHandler(logging.Handler):
+    """Write messages as plain lines, like the prints they replace."""
+    def __init__(self, stream=None, level: int = logging.NOTSET):
+        super().__init__(level)
+        # None is whatever sys.stdout is when the record is written
+        self._stream = stream
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            stream = self._stream if self._stream is not None else sys.stdout
+            stream.write(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record, with its event and fields."""
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None),
+            "message": record.getMessage().strip(),
+        }
+        data.update(getattr(record, "fields", {}))
+        return json.dumps(data, default=str)
+
+def enable_console_output(level: int = logging.INFO, stream=None, structured: bool = False) -> logging.Handler:
+    """
+    Show translator messages from level up on stream, sys.stdout by default.
+
+    Calling it again only changes the level, so the interactive entry points
+    can call it without printing messages twice.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    for handler in logger.handlers:
+        if isinstance(handler, ConsoleHandler):
+            return handler
+    handler = ConsoleHandler(stream)
+    if structured:
+        handler.setFormatter(JSONFormatter())
+    logger.addHandler(handler)
+    return handler
@@ -1,4 +1,8 @@
+import hashlib
+
 from ..data.conceptual import *
+from ..data.relational import Table
+from ..data.hierachy_checks import HierarchyChecks
 
 def load_tpl_file(file_path):
     with open(file_path) as f:
@@ -38,16 +42,6 @@ def get_all_father_entities(entities: list[Entity]) -> list[str]:
 
     return father_entities
 
-def retrieve_connected_relationships(entity_names: list[str], relationships: dict[str, Relationship]) -> list[str]:
-    connected_relationships = []
-
-    for relationship in relationships.values():
-        
-        if relationship.entity_from in entity_names or relationship.entity_to in entity_names:
-            connected_relationships.append(relationship.name)
-
-    return connected_relationships
-
 def retrieve_children_names(father_entity: Entity) -> list[str]:
     children_names = []
     for child_name in father_entity.hierarchy.children:
@@ -64,13 +58,45 @@ def retrieve_all_hierarchy_entities(entities: list[Entity]) -> list[str]:
                 hierarchy_entities.append(child_name)
     return hierarchy_entities
 
-def retrieve_all_hierarchy_relationships(entities: list[Entity], relationships: dict[str, Relationship]) -> list[str]:
-    hierarchy_entities = retrieve_all_hierarchy_entities(entities)
-    return retrieve_connected_relationships(hierarchy_entities, relationships)
+def get_relational_metrics(tables: dict[str, Table], hierarchy_checks: HierarchyChecks) -> dict[str, int]:
+    metrics = {"tables": len(tables), "columns": 0, "nullable_columns": 0, "foreign_keys": 0, "checks": 0, "triggers": len(hierarchy_checks.triggers)}
+    for table_name, table in tables.items():
+        foreign_keys_names = {foreign_key.name for foreign_key in table.foreign_keys}
+        # primary keys that are also foreign keys are counted once, like in the SQL code
+        columns = [primary_key for primary_key in table.primary_keys if primary_key.name not in foreign_keys_names]
+        columns += table.attributes
+        columns += table.foreign_keys
+        metrics["columns"] += len(columns)
+        metrics["nullable_columns"] += sum(1 for column in columns if column.is_optional)
+        metrics["foreign_keys"] += len(table.foreign_keys)
+        metrics["checks"] += len(hierarchy_checks.selectors.get(table_name, [])) + len(hierarchy_checks.constraints.get(table_name, []))
+    return metrics
+
+def fingerprint_tables(tables: dict[str, Table], hierarchy_checks: HierarchyChecks) -> str:
+    """Hash of a relational model, equal tables, checks and triggers have the same fingerprint."""
+    digest = hashlib.sha256()
+    for table_name, table in tables.items():
+        digest.update(repr((
+            table_name,
+            [(primary_key.name, primary_key.is_optional) for primary_key in table.primary_keys],
+            [(attribute.name, attribute.is_optional, attribute.is_unique) for attribute in table.attributes],
+            [(foreign_key.name, foreign_key.is_optional, foreign_key.is_unique, foreign_key.table_ref.name, foreign_key.primary_key_ref.name) for foreign_key in table.foreign_keys],
+            hierarchy_checks.selectors.get(table_name, []),
+            hierarchy_checks.constraints.get(table_name, []),
+        )).encode())
+    digest.update(repr(hierarchy_checks.triggers).encode())
+    return digest.hexdigest()
 
-def change_relationships_entity(relationships: dict[str, Relationship], old_name: str, new_name: str) -> None:
-    for relationship in relationships.values():
-        if relationship.entity_from == old_name:
-            relationship.set_entity_from(new_name)
-        if relationship.entity_to == old_name:
-            relationship.set_entity_to(new_name)
\ No newline at end of file
+def get_neighbour_choices(all_choices: tuple[dict, dict, dict], current_choices: tuple[dict, dict, dict]) -> list[tuple[dict, dict, dict]]:
+    """Return every (composite attributes, hierarchy, relationship) choices differing from current_choices by one choice."""
+    neighbours = []
+    for position, choices in enumerate(all_choices):
+        for item_key, item_choices in choices.items():
+            # sets of choices, sorted to always return the neighbours in the same order
+            for choice in sorted(item_choices, key=lambda item_choice: item_choice.value):
+                if current_choices[position].get(item_key) == choice:
+                    continue
+                neighbour = [dict(choices) for choices in current_choices]
+                neighbour[position][item_key] = choice
+                neighbours.append(tuple(neighbour))
+    return neighbours
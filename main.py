@@ -1,11 +1,7 @@
 #import click
+import sys
 from pathlib import Path
 
-from er_translator.parsers.erdplus_parser import *
-from er_translator.printers.diagram_printer import *
-from er_generator import create_diagram
-from choices_prompt import choices_selector
-
 
 #@click.command()
 #@click.argument('file_path', type=click.Path(exists=True))
@@ -15,6 +11,9 @@ def cli(file_path):
     
     FILE_PATH: Path to the .erdplus file to process
     """
+    from er_translator.parsers.erdplus_parser import ERDPLUS_Parser
+    from choices_prompt import choices_selector
+
     file_path = Path(file_path)
     
     erdplus_parser = ERDPLUS_Parser()
@@ -25,5 +24,9 @@ def cli(file_path):
     choices_selector(entities, relationships, file_path)
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # same commands as python -m er_translator
+        from er_translator.cli import main
+        sys.exit(main())
     file_path = Path(__file__).parent.joinpath('er_translator/examples/down_t_d_N_1.erdplus')
-    cli(file_path)
\ No newline at end of file
+    cli(file_path)
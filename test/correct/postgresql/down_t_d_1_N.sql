@@ -0,0 +1,50 @@
+CREATE TABLE Manager (
+    EmployeeID {ADD_TYPE} NOT NULL,
+    TeamName {ADD_TYPE} NOT NULL,
+    Interact_GovOfficial_Year {ADD_TYPE} NOT NULL,
+    Manage_Manager_EmployeeID {ADD_TYPE} UNIQUE NOT NULL REFERENCES Manager(EmployeeID),
+    Interact_GovOfficial_GovID {ADD_TYPE} UNIQUE NOT NULL REFERENCES GovOfficial(GovID),
+    Manage_Engineer_EmployeeID {ADD_TYPE} UNIQUE NOT NULL REFERENCES Engineer(EmployeeID),
+    PRIMARY KEY (EmployeeID),
+    CONSTRAINT Manage CHECK ((Manage_Manager_EmployeeID IS NOT NULL AND Manage_Engineer_EmployeeID IS NULL) OR (Manage_Engineer_EmployeeID IS NOT NULL AND Manage_Manager_EmployeeID IS NULL))
+);
+
+
+CREATE TABLE Engineer (
+    EmployeeID {ADD_TYPE} NOT NULL,
+    Level {ADD_TYPE} NOT NULL,
+    Interact_GovOfficial_Year {ADD_TYPE} NOT NULL,
+    Interact_GovOfficial_GovID {ADD_TYPE} UNIQUE NOT NULL REFERENCES GovOfficial(GovID),
+    PRIMARY KEY (EmployeeID)
+);
+
+
+CREATE TABLE GovOfficial (
+    GovID {ADD_TYPE} NOT NULL,
+    PRIMARY KEY (GovID)
+);
+
+
+CREATE FUNCTION Manager_Engineer_check() RETURNS trigger AS $$
+BEGIN
+    IF EXISTS (SELECT * FROM Engineer WHERE NEW.EmployeeID = Engineer.EmployeeID) THEN
+        RAISE EXCEPTION 'Only one child must exist with a specific identifier!' USING ERRCODE = '70001';
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+CREATE TRIGGER Manager_Engineer
+BEFORE INSERT ON Manager
+FOR EACH ROW EXECUTE FUNCTION Manager_Engineer_check();
+
+CREATE FUNCTION Engineer_Manager_check() RETURNS trigger AS $$
+BEGIN
+    IF EXISTS (SELECT * FROM Manager WHERE NEW.EmployeeID = Manager.EmployeeID) THEN
+        RAISE EXCEPTION 'Only one child must exist with a specific identifier!' USING ERRCODE = '70001';
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+CREATE TRIGGER Engineer_Manager
+BEFORE INSERT ON Engineer
+FOR EACH ROW EXECUTE FUNCTION Engineer_Manager_check();
\ No newline at end of file
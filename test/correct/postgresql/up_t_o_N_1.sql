@@ -0,0 +1,92 @@
+CREATE TABLE Employee (
+    EmployeeID {ADD_TYPE} NOT NULL,
+    TeamName {ADD_TYPE},
+    Level {ADD_TYPE},
+    Product {ADD_TYPE},
+    TYPE_Manager VARCHAR(50) NOT NULL CHECK (TYPE_Manager IN ('0', '1')),
+    TYPE_Engineer VARCHAR(50) NOT NULL CHECK (TYPE_Engineer IN ('0', '1')),
+    TYPE_ProductManager VARCHAR(50) NOT NULL CHECK (TYPE_ProductManager IN ('0', '1')),
+    Promote_Manager_EmployeeID {ADD_TYPE} UNIQUE REFERENCES Employee(EmployeeID),
+    Manage_Manager_EmployeeID {ADD_TYPE} UNIQUE REFERENCES Employee(EmployeeID),
+    PRIMARY KEY (EmployeeID),
+    CONSTRAINT TOTAL_HIERARCHY CHECK ((TYPE_Manager = '1' OR TYPE_Engineer = '1' OR TYPE_ProductManager = '1')),
+    CONSTRAINT Manager CHECK ((TYPE_Manager = '1' AND TeamName IS NOT NULL) OR (TYPE_Manager = '0' AND TeamName IS NULL)),
+    CONSTRAINT Engineer CHECK ((TYPE_Engineer = '1' AND Level IS NOT NULL AND Promote_Manager_EmployeeID IS NOT NULL) OR (TYPE_Engineer = '0' AND Level IS NULL AND Promote_Manager_EmployeeID IS NULL)),
+    CONSTRAINT ProductManager CHECK ((TYPE_ProductManager = '1' AND Product IS NOT NULL) OR (TYPE_ProductManager = '0' AND Product IS NULL))
+);
+
+
+CREATE TABLE Customer (
+    CustomerID {ADD_TYPE} NOT NULL,
+    Interact_ProductManager_EmployeeID {ADD_TYPE} UNIQUE REFERENCES Employee(EmployeeID),
+    PRIMARY KEY (CustomerID)
+);
+
+
+CREATE TABLE PlanWith (
+    Year {ADD_TYPE} NOT NULL,
+    PlanWith_Manager_EmployeeID_A {ADD_TYPE} UNIQUE NOT NULL REFERENCES Employee(EmployeeID),
+    PlanWith_Manager_EmployeeID_B {ADD_TYPE} UNIQUE NOT NULL REFERENCES Employee(EmployeeID),
+    PRIMARY KEY (PlanWith_Manager_EmployeeID_A,PlanWith_Manager_EmployeeID_B)
+);
+
+
+CREATE FUNCTION PlanWithManager_A_check() RETURNS trigger AS $$
+BEGIN
+    IF NOT EXISTS (SELECT * FROM Employee WHERE Employee.EmployeeID = NEW.PlanWith_Manager_EmployeeID_A AND Employee.TYPE_Manager = '1') THEN
+        RAISE EXCEPTION 'Inserted tuple needs to reference an instance of Manager!' USING ERRCODE = '70001';
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+CREATE TRIGGER PlanWithManager_A
+BEFORE INSERT ON PlanWith
+FOR EACH ROW EXECUTE FUNCTION PlanWithManager_A_check();
+
+CREATE FUNCTION PlanWithManager_B_check() RETURNS trigger AS $$
+BEGIN
+    IF NOT EXISTS (SELECT * FROM Employee WHERE Employee.EmployeeID = NEW.PlanWith_Manager_EmployeeID_B AND Employee.TYPE_Manager = '1') THEN
+        RAISE EXCEPTION 'Inserted tuple needs to reference an instance of Manager!' USING ERRCODE = '70001';
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+CREATE TRIGGER PlanWithManager_B
+BEFORE INSERT ON PlanWith
+FOR EACH ROW EXECUTE FUNCTION PlanWithManager_B_check();
+
+CREATE FUNCTION PromoteManager_check() RETURNS trigger AS $$
+BEGIN
+    IF NEW.TYPE_Engineer = '1' AND NOT EXISTS (SELECT * FROM Employee WHERE Employee.EmployeeID = NEW.Promote_Manager_EmployeeID AND Employee.TYPE_Manager = '1') THEN
+        RAISE EXCEPTION 'Inserted tuple needs to reference an instance of Manager!' USING ERRCODE = '70001';
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+CREATE TRIGGER PromoteManager
+BEFORE INSERT ON Employee
+FOR EACH ROW EXECUTE FUNCTION PromoteManager_check();
+
+CREATE FUNCTION ManageManager_check() RETURNS trigger AS $$
+BEGIN
+    IF NOT EXISTS (SELECT * FROM Employee WHERE Employee.EmployeeID = NEW.Manage_Manager_EmployeeID AND Employee.TYPE_Manager = '1') THEN
+        RAISE EXCEPTION 'Inserted tuple needs to reference an instance of Manager!' USING ERRCODE = '70001';
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+CREATE TRIGGER ManageManager
+BEFORE INSERT ON Employee
+FOR EACH ROW EXECUTE FUNCTION ManageManager_check();
+
+CREATE FUNCTION InteractProductManager_check() RETURNS trigger AS $$
+BEGIN
+    IF NOT EXISTS (SELECT * FROM Employee WHERE Employee.EmployeeID = NEW.Interact_ProductManager_EmployeeID AND Employee.TYPE_ProductManager = '1') THEN
+        RAISE EXCEPTION 'Inserted tuple needs to reference an instance of ProductManager!' USING ERRCODE = '70001';
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+CREATE TRIGGER InteractProductManager
+BEFORE INSERT ON Customer
+FOR EACH ROW EXECUTE FUNCTION InteractProductManager_check();
\ No newline at end of file
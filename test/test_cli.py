@@ -0,0 +1,85 @@
+import contextlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from er_translator.cli import main
+
+EXAMPLES_DIR = project_root / "er_translator" / "examples"
+EXAMPLE_FILE = EXAMPLES_DIR / "up_t_d_N_1.erdplus"
+
+def run(*argv) -> tuple[int, str, str]:
+    """Run the command line entry point, return its exit code, stdout and stderr."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        exit_code = main([str(argument) for argument in argv])
+    return exit_code, stdout.getvalue(), stderr.getvalue()
+
+def test_parse_and_translate():
+    for streaming in ([], ["--streaming"]):
+        exit_code, stdout, stderr = run("parse", EXAMPLE_FILE, *streaming)
+        assert exit_code == 0 and stderr == ""
+        assert stdout.endswith("relationships\n")
+        exit_code, stdout, stderr = run("translate", EXAMPLE_FILE, *streaming)
+        assert exit_code == 0 and stderr == "" and "CREATE TABLE" in stdout
+
+def test_translate_output_file():
+    with tempfile.TemporaryDirectory() as directory:
+        plain_path = Path(directory) / "model.sql"
+        assert run("translate", "-o", plain_path, EXAMPLE_FILE)[0] == 0
+        exit_code, stdout, _ = run("translate", EXAMPLE_FILE)
+        assert plain_path.read_text() + "\n" == stdout
+
+def test_missing_file():
+    for streaming in ([], ["--streaming"]):
+        for command in ("parse", "translate", "print"):
+            exit_code, stdout, stderr = run(command, EXAMPLES_DIR / "missing.erdplus", *streaming)
+            assert exit_code == 1 and stdout == ""
+            assert stderr.count("\n") == 1 and "No such file or directory" in stderr
+
+def test_malformed_file():
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = Path(directory) / "malformed.erdplus"
+        file_path.write_text('{"data": {"nodes": [')
+        for streaming in ([], ["--streaming"]):
+            exit_code, stdout, stderr = run("parse", file_path, *streaming)
+            assert exit_code == 1 and stdout == "" and stderr.count("\n") == 1
+
+def test_malformed_workload():
+    with tempfile.TemporaryDirectory() as directory:
+        workload_path = Path(directory) / "workload.json"
+        for text in ('{"access_paths": [{"entities": "Employee"}]}', '{"access_paths": [{"entities": ["Employee"]}], "rows": [1, 2]}', '{"access_paths": [{"entities": ["Nobody"]}]}'):
+            workload_path.write_text(text)
+            exit_code, stdout, stderr = run("translate", "--workload", workload_path, EXAMPLE_FILE)
+            assert exit_code == 1 and stdout == "" and stderr.count("\n") == 1
+
+def test_estimate():
+    with tempfile.TemporaryDirectory() as directory:
+        statistics_path = Path(directory) / "statistics.json"
+        statistics_path.write_text('{"entities": {"Employee": {"rows": 5000}}}')
+        exit_code, stdout, stderr = run("estimate", "--statistics", statistics_path, EXAMPLE_FILE)
+        assert exit_code == 0 and stderr == ""
+        lines = stdout.splitlines()
+        assert lines[0].startswith("Employee: 5000 rows, ") and lines[-1].startswith("total: ")
+        statistics_path.write_text('{"entities": {"Employee": {"rows": "many"}}}')
+        exit_code, stdout, stderr = run("estimate", "--statistics", statistics_path, EXAMPLE_FILE)
+        assert exit_code == 1 and stdout == "" and stderr.count("\n") == 1
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✓ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\nFailed {failed} tests")
+    sys.exit(1 if failed else 0)
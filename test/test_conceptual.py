@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from er_translator.data.conceptual import Attribute, AttributeCollection, Cardinality, MinimumCardinality, MaximumCardinality
+
+def test_attribute_collection_duplicates():
+    cardinality = Cardinality(MinimumCardinality.ONE, MaximumCardinality.ONE)
+    first, other, second = Attribute("Name", cardinality, False), Attribute("Age", cardinality, False), Attribute("Name", cardinality, True)
+    collection = AttributeCollection([first, other, second])
+    assert len(collection) == 3
+    assert list(collection) == [first, other, second]
+    assert "Name" in collection and collection.get("Name") is first
+
+    collection_copy = collection.copy()
+    # removal takes the first attribute with the name, as list.remove would
+    assert collection.remove("Name") is first
+    assert collection.get("Name") is second and list(collection) == [other, second]
+    assert collection.remove("Name") is second
+    assert "Name" not in collection and collection.remove("Name") is None
+    # the copy is not affected
+    assert list(collection_copy) == [first, other, second]
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✓ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\nFailed {failed} tests")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,98 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from er_translator.parsers import erdplus_parser
+from er_translator.parsers.erdplus_parser import ERDPLUS_Parser
+from er_translator.parsers.diagram_cache import DiagramCache, CACHE_SUFFIX
+from er_translator.data.serialization import dumps_model
+
+EXAMPLES_DIR = project_root / "er_translator" / "examples"
+EXAMPLE_FILE = EXAMPLES_DIR / "up_t_d_N_1.erdplus"
+
+def parse(file_path: Path, cache: DiagramCache = None) -> ERDPLUS_Parser:
+    parser = ERDPLUS_Parser(cache)
+    parser.parse_erdplus_diagram(file_path)
+    return parser
+
+def cache_entries(cache: DiagramCache) -> list[Path]:
+    return list(cache.cache_dir.glob("*" + CACHE_SUFFIX))
+
+def test_diagram_cache_miss():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = DiagramCache(directory)
+        key = cache.get_key(EXAMPLE_FILE, erdplus_parser.PARSER_VERSION)
+        assert cache.load(key) is None
+        # a miss parses the file and stores the model
+        parsed = parse(EXAMPLE_FILE, cache)
+        assert cache_entries(cache) == [Path(directory) / (key + CACHE_SUFFIX)]
+        entities, relationships = cache.load(key)
+        assert dumps_model(entities, relationships) == dumps_model(parsed.entities, parsed.relationships)
+
+def test_diagram_cache_hit():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = DiagramCache(directory)
+        parsed = parse(EXAMPLE_FILE, cache)
+        cached = ERDPLUS_Parser(cache)
+        # a hit returns the cached model without parsing the file again
+        cached._parse_erdplus_diagram = None
+        cached.parse_erdplus_diagram(EXAMPLE_FILE)
+        assert dumps_model(parsed.entities, parsed.relationships) == dumps_model(cached.entities, cached.relationships)
+        assert len(cache_entries(cache)) == 1
+
+def test_diagram_cache_parser_version():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = DiagramCache(directory)
+        assert cache.get_key(EXAMPLE_FILE, "1") != cache.get_key(EXAMPLE_FILE, "2")
+        parse(EXAMPLE_FILE, cache)
+        original_version = erdplus_parser.PARSER_VERSION
+        erdplus_parser.PARSER_VERSION = original_version + ".1"
+        try:
+            # the model cached by the former parser is not reused
+            assert cache.load(cache.get_key(EXAMPLE_FILE, erdplus_parser.PARSER_VERSION)) is None
+            parse(EXAMPLE_FILE, cache)
+        finally:
+            erdplus_parser.PARSER_VERSION = original_version
+        assert len(cache_entries(cache)) == 2
+
+def test_diagram_cache_size_eviction():
+    parsed = parse(EXAMPLE_FILE)
+    entry_size = len(dumps_model(parsed.entities, parsed.relationships))
+    with tempfile.TemporaryDirectory() as directory:
+        cache = DiagramCache(directory, max_size=2 * entry_size)
+        for time, key in enumerate(("a", "b")):
+            cache.store(key, parsed.entities, parsed.relationships)
+            os.utime(Path(directory) / (key + CACHE_SUFFIX), (time, time))
+        # a is now the most recently used
+        assert cache.load("a") is not None
+        cache.store("c", parsed.entities, parsed.relationships)
+        assert sorted(entry_path.stem for entry_path in cache_entries(cache)) == ["a", "c"]
+        assert cache.load("b") is None
+
+def test_diagram_cache_corrupt_entry():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = DiagramCache(directory)
+        parse(EXAMPLE_FILE, cache)
+        entry_path, = cache_entries(cache)
+        entry_path.write_bytes(entry_path.read_bytes()[:-4])
+        assert cache.load(entry_path.stem) is None
+        assert not entry_path.exists()
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✓ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\nFailed {failed} tests")
+    sys.exit(1 if failed else 0)
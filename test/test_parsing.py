@@ -0,0 +1,101 @@
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from er_translator.parsers.erdplus_parser import ERDPLUS_Parser
+from er_translator.parsers.diagram_cache import DiagramCache, CACHE_SUFFIX
+from er_translator.data.serialization import dumps_model
+from er_translator.exceptions.exceptions import OrphanNodeException, CyclicNodeException, DiagramFormatException
+
+EXAMPLES_DIR = project_root / "er_translator" / "examples"
+EXAMPLE_FILE = EXAMPLES_DIR / "up_t_d_N_1.erdplus"
+
+def parse(file_path: Path, streaming: bool = False, cache: DiagramCache = None) -> ERDPLUS_Parser:
+    parser = ERDPLUS_Parser(cache)
+    parser.parse_erdplus_diagram(file_path, streaming)
+    return parser
+
+def assert_raises(exception_type, function, *args):
+    try:
+        function(*args)
+    except exception_type as e:
+        return e
+    raise AssertionError(f"{exception_type.__name__} not raised")
+
+def order_by_parent(nodes: list[dict]) -> list[str]:
+    ordered = ERDPLUS_Parser()._order_by_parent(nodes, lambda node: node.get("parentId"))
+    return [node["id"] for node in ordered]
+
+def test_order_by_parent():
+    # a child before its parent goes after every node of the first pass, like the former retry queue
+    nodes = [
+        {"id": "child", "parentId": "father"},
+        {"id": "grandfather"},
+        {"id": "father", "parentId": "grandfather"},
+        {"id": "uncle", "parentId": "grandfather"},
+    ]
+    assert order_by_parent(nodes) == ["grandfather", "father", "uncle", "child"]
+
+def test_order_by_parent_orphan():
+    nodes = [{"id": "a"}, {"id": "b", "parentId": "missing"}]
+    e = assert_raises(OrphanNodeException, order_by_parent, nodes)
+    assert (e.node_id, e.parent_id) == ("b", "missing")
+
+def test_order_by_parent_cycle():
+    nodes = [{"id": "a"}, {"id": "b", "parentId": "c"}, {"id": "c", "parentId": "b"}, {"id": "d", "parentId": "b"}]
+    e = assert_raises(CyclicNodeException, order_by_parent, nodes)
+    assert sorted(e.node_ids) == ["b", "c"]
+
+def test_streaming_matches_loading():
+    for file_path in sorted(EXAMPLES_DIR.glob("*.erdplus")):
+        loaded = parse(file_path)
+        streamed = parse(file_path, streaming=True)
+        assert dumps_model(loaded.entities, loaded.relationships) == dumps_model(streamed.entities, streamed.relationships), file_path.name
+
+def test_truncated_diagram():
+    text = EXAMPLE_FILE.read_text()
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = Path(directory) / "truncated.erdplus"
+        file_path.write_text(text[:len(text) // 2])
+        for streaming in (False, True):
+            assert_raises(DiagramFormatException, parse, file_path, streaming)
+
+def test_malformed_diagram():
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = Path(directory) / "malformed.erdplus"
+        for text in ('{"version": 1}', '[1, 2]', '{"data": {"nodes": [1]}}', '{"data": {"nodes": {}}}'):
+            file_path.write_text(text)
+            for streaming in (False, True):
+                assert_raises(DiagramFormatException, parse, file_path, streaming)
+
+def test_missing_diagram():
+    for streaming in (False, True):
+        assert_raises(FileNotFoundError, parse, EXAMPLES_DIR / "missing.erdplus", streaming)
+
+def test_diagram_cache_skips_failed_parse():
+    with tempfile.TemporaryDirectory() as directory:
+        cache_dir = Path(directory) / "cache"
+        file_path = Path(directory) / "truncated.erdplus"
+        text = EXAMPLE_FILE.read_text()
+        file_path.write_text(text[:len(text) // 2])
+        for streaming in (False, True):
+            assert_raises(DiagramFormatException, parse, file_path, streaming, DiagramCache(cache_dir))
+        assert not list(cache_dir.glob("*" + CACHE_SUFFIX))
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✓ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\nFailed {failed} tests")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,58 @@
+import struct
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from er_translator.parsers.erdplus_parser import ERDPLUS_Parser
+from er_translator.data.serialization import HEADER, dumps_model, loads_model
+from er_translator.exceptions.exceptions import ModelFormatException
+
+EXAMPLES_DIR = project_root / "er_translator" / "examples"
+
+def parse(file_path: Path) -> ERDPLUS_Parser:
+    parser = ERDPLUS_Parser()
+    parser.parse_erdplus_diagram(file_path)
+    return parser
+
+def assert_raises(exception_type, function, *args):
+    try:
+        function(*args)
+    except exception_type as e:
+        return e
+    raise AssertionError(f"{exception_type.__name__} not raised")
+
+def test_model_round_trip():
+    for file_path in sorted(EXAMPLES_DIR.glob("*.erdplus")):
+        parser = parse(file_path)
+        data = dumps_model(parser.entities, parser.relationships)
+        assert dumps_model(*loads_model(data)) == data, file_path.name
+
+def test_corrupt_model_blob():
+    parser = parse(EXAMPLES_DIR / "up_t_d_N_1.erdplus")
+    data = dumps_model(parser.entities, parser.relationships)
+    magic, version, strings_count, blob_size, stream_size = HEADER.unpack_from(data)
+    blob_start = HEADER.size + 4 * strings_count
+    invalid_utf8 = data[:blob_start] + b"\xff" + data[blob_start + 1:]
+    # one more integer than the model describes
+    extra_integer = HEADER.pack(magic, version, strings_count, blob_size, stream_size + 1) + data[HEADER.size:] + struct.pack("<I", 0)
+    # string lengths no longer add up to the blob
+    short_lengths = data[:HEADER.size] + struct.pack("<I", 0) + data[HEADER.size + 4:]
+    for corrupt_data in (b"", data[:HEADER.size], b"XXXX" + data[4:], data[:-4], invalid_utf8, extra_integer, short_lengths):
+        assert_raises(ModelFormatException, loads_model, corrupt_data)
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✓ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\nFailed {failed} tests")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from er_translator.parsers.erdplus_parser import ERDPLUS_Parser
+from er_translator.translation.er_translation import ERTranslator
+from er_translator.translation.sql_renderer import DEFAULT_RENDERER, PostgreSQLRenderer, render_dialects
+from er_translator.translation.sql_writer import join_sql_code
+from er_translator.data.choices import HIERARCHY_CHOICE
+
+EXAMPLES_DIR = project_root / "er_translator" / "examples"
+POSTGRESQL_DIR = Path(__file__).parent / "correct" / "postgresql"
+
+def translate_model(example_name: str, hierarchy_choice: HIERARCHY_CHOICE = None) -> ERTranslator:
+    parser = ERDPLUS_Parser()
+    parser.parse_erdplus_diagram(EXAMPLES_DIR / (example_name + ".erdplus"))
+    translator = ERTranslator(parser.entities, parser.relationships)
+    hierarchy_choices = translator.get_hierarchy_choices()[1]
+    if hierarchy_choice:
+        hierarchy_choices = {father_name: hierarchy_choice for father_name in hierarchy_choices}
+    return translator.translate_model(translator.get_composite_attributes_choices()[1], hierarchy_choices, translator.get_relationship_choices()[1])
+
+def test_postgresql_renderer():
+    # parent triggers of an overlapping hierarchy, and exclusion triggers between children tables
+    for example_name, hierarchy_choice in (("up_t_o_N_1", None), ("down_t_d_1_N", HIERARCHY_CHOICE.COLLAPSE_DOWNWARDS)):
+        translated = translate_model(example_name, hierarchy_choice)
+        sql_code = join_sql_code(*translated.create_sql_statements(PostgreSQLRenderer()))
+        assert sql_code == (POSTGRESQL_DIR / (example_name + ".sql")).read_text(), example_name
+
+def test_postgresql_trigger_names():
+    for file_path in sorted(EXAMPLES_DIR.glob("up_*.erdplus")):
+        _, triggers = translate_model(file_path.stem).create_sql_statements(PostgreSQLRenderer())
+        function_names = [line.split()[2] for trigger in triggers for line in trigger.splitlines() if line.startswith("CREATE FUNCTION")]
+        assert len(function_names) == len(triggers) == len(set(function_names)), file_path.name
+
+def test_render_dialects_single_pass():
+    translated = translate_model("up_t_o_N_1")
+    table_statements, triggers = translated.create_statements()
+    pulled = []
+    def statements():
+        # a generator can only be consumed once
+        for statement in table_statements + triggers:
+            pulled.append(statement)
+            yield statement
+    rendered = render_dialects(statements(), [DEFAULT_RENDERER, PostgreSQLRenderer()])
+    assert pulled == table_statements + triggers
+    assert rendered["default"] == sum(translated.create_sql_statements(), [])
+    assert rendered["postgresql"] == sum(translated.create_sql_statements(PostgreSQLRenderer()), [])
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✓ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\nFailed {failed} tests")
+    sys.exit(1 if failed else 0)
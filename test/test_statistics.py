@@ -0,0 +1,115 @@
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from er_translator.parsers.statistics_parser import StatisticsParser
+from er_translator.translation.er_translation import ERTranslator
+from er_translator.translation.storage_estimation import StorageEstimator
+from er_translator.data.statistics import Statistics, DEFAULT_ROW_OVERHEAD
+from er_translator.data.conceptual import Entity, Attribute, Hierarchy, HierarchyCompleteness, HierarchyDisjointness, Relationship, Cardinality, MinimumCardinality, MaximumCardinality
+from er_translator.exceptions.exceptions import StatisticsFormatException
+
+ONE = Cardinality(MinimumCardinality.ONE, MaximumCardinality.ONE)
+
+def assert_raises(exception_type, function, *args):
+    try:
+        function(*args)
+    except exception_type as e:
+        return e
+    raise AssertionError(f"{exception_type.__name__} not raised")
+
+def create_person() -> Entity:
+    person = Entity("Person")
+    person.add_identifier(Attribute("PersonID", ONE, True))
+    person.add_attribute(Attribute("Name", ONE, False))
+    return person
+
+def create_statistics() -> Statistics:
+    statistics = Statistics()
+    for name, rows in (("Person", 1000), ("Student", 250), ("Passport", 400)):
+        statistics.set_rows(name, rows)
+    statistics.set_width("Person", "Name", 20)
+    statistics.set_null_ratio("Person", "Name", 0.5)
+    statistics.set_width("Student", "Grade", 4)
+    statistics.set_width("Passport", "Number", 10)
+    return statistics
+
+def estimate(entities: dict, relationships: dict) -> dict:
+    translator = ERTranslator(entities, relationships)
+    choices = (translator.get_composite_attributes_choices()[1], translator.get_hierarchy_choices()[1], translator.get_relationship_choices()[1])
+    return StorageEstimator(entities, relationships, create_statistics()).estimate(*choices)
+
+def test_collapse_upwards_row_width():
+    person, student = create_person(), Entity("Student")
+    student.add_attribute(Attribute("Grade", ONE, False))
+    hierarchy = Hierarchy(HierarchyCompleteness.PARTIAL, HierarchyDisjointness.DISJOINT)
+    hierarchy.add_child("Student")
+    person.set_hierarchy(hierarchy)
+    estimate_person, = estimate({"Person": person, "Student": student}, {}).values()
+    assert (estimate_person.name, estimate_person.rows, estimate_person.columns) == ("Person", 1000, 4)
+    # PersonID, half of the names, Grade for the students only, and the TYPE_Student selector
+    assert estimate_person.bytes_per_row == DEFAULT_ROW_OVERHEAD + 1 + 8 + 0.5 * 20 + 0.25 * 4 + len("StudentPerson") / 2
+    assert estimate_person.null_density == (0.5 + 0.75) / 4
+
+def test_one_to_one_merge_row_width():
+    passport = Entity("Passport")
+    passport.add_identifier(Attribute("Number", ONE, True))
+    holds = Relationship("Holds", "Person", "Passport", Cardinality(MinimumCardinality.ZERO, MaximumCardinality.ONE), ONE)
+    estimate_table, = estimate({"Person": create_person(), "Passport": passport}, {"Holds": holds}).values()
+    assert (estimate_table.name, estimate_table.rows, estimate_table.columns) == ("PersonPassport", 1000, 3)
+    # passport numbers only for the people holding one
+    assert estimate_table.bytes_per_row == DEFAULT_ROW_OVERHEAD + 1 + 0.4 * 10 + 8 + 0.5 * 20
+    assert estimate_table.total_bytes == 1000 * estimate_table.bytes_per_row
+
+def test_parse_statistics_keeps_samples():
+    with tempfile.TemporaryDirectory() as directory:
+        sample_path = Path(directory) / "person.csv"
+        sample_path.write_text("PersonID,Name\n1,Ann\n2,\n3,Bob\n4,Eve\n")
+        statistics_path = Path(directory) / "statistics.json"
+        statistics_path.write_text(json.dumps({"default_width": 4, "entities": {"Student": {"rows": 250, "widths": {"Grade": 2}}}}))
+        parser = StatisticsParser()
+        parser.parse_csv_sample("Person", sample_path)
+        statistics = parser.parse_statistics(statistics_path)
+    assert statistics is parser.statistics
+    assert (statistics.get_rows("Person"), statistics.get_null_ratio("Person", "Name"), statistics.get_width("Person", "Name")) == (4, 0.25, 3)
+    assert (statistics.get_rows("Student"), statistics.get_width("Student", "Grade"), statistics.default_width) == (250, 2, 4)
+
+def test_invalid_statistics():
+    invalid_statistics = (
+        [1, 2],
+        {"default_rows": "many"},
+        {"default_width": True},
+        {"row_overhead": -1},
+        {"entities": ["Person"]},
+        {"entities": {"Person": 1000}},
+        {"entities": {"Person": {"rows": "1000"}}},
+        {"entities": {"Person": {"null_ratios": {"Name": "half"}}}},
+        {"entities": {"Person": {"null_ratios": {"Name": 1.5}}}},
+        {"relationships": {"Holds": {"widths": {"Since": None}}}},
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        statistics_path = Path(directory) / "statistics.json"
+        for data in invalid_statistics:
+            statistics_path.write_text(json.dumps(data))
+            assert_raises(StatisticsFormatException, StatisticsParser().parse_statistics, statistics_path)
+        statistics_path.write_text('{"entities": ')
+        assert_raises(StatisticsFormatException, StatisticsParser().parse_statistics, statistics_path)
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✓ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\nFailed {failed} tests")
+    sys.exit(1 if failed else 0)
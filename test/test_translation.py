@@ -1,3 +1,4 @@
+import logging
 import sys
 from pathlib import Path
 
@@ -8,6 +9,9 @@ sys.path.insert(0, str(project_root))
 from er_translator.parsers.erdplus_parser import ERDPLUS_Parser
 from er_translator.translation.er_translation import ERTranslator
 from er_translator.data.choices import HIERARCHY_CHOICE
+from er_translator.utils.log import LOGGER_NAME, enable_console_output
+
+logger = logging.getLogger(f"{LOGGER_NAME}.test_translation")
 
 def test_translation(file_path: Path):
     """
@@ -20,9 +24,7 @@ def test_translation(file_path: Path):
         str: Generated SQL code or error message
     """
     try:
-        print(f"\n{'='*80}")
-        print(f"Processing: {file_path.name}")
-        print(f"{'='*80}")
+        logger.info("\n%s\nProcessing: %s\n%s", "=" * 80, file_path.name, "=" * 80)
         
         # Parse the diagram
         parser = ERDPLUS_Parser()
@@ -51,10 +53,7 @@ def test_translation(file_path: Path):
             relationship_defaults
         )
         
-        print("\nGenerated SQL:")
-        print("-" * 80)
-        #print(sql_code)
-        print("-" * 80)
+        logger.info("\nGenerated SQL:\n%s\n%s", "-" * 80, "-" * 80)
         
         return sql_code
         
@@ -107,7 +106,7 @@ def test_all_examples():
     # Process each file
     for file_path in erdplus_files:
         if file_path.stem == "edizione_telegiornali" or file_path.stem == "every_possibility_no_hierarchy":
-            print(f"\n Skipping {file_path.stem}")
+            logger.info("\n Skipping %s", file_path.stem)
             continue
         sql_code = test_translation(file_path)
         
@@ -116,7 +115,7 @@ def test_all_examples():
             output_file = result_dir / f"{file_path.stem}.sql"
             with open(output_file, 'w') as f:
                 f.write(sql_code)
-            print(f"✓ Saved output to: {output_file}")
+            logger.info("✓ Saved output to: %s", output_file)
         else:
             failed += 1
     
@@ -129,6 +128,8 @@ def check_differences(correct_dir: Path, result_dir: Path):
     
 
 if __name__ == "__main__":
+    # --quiet prints only the results of the comparison
+    enable_console_output(logging.WARNING if "--quiet" in sys.argv else logging.INFO)
     test_all_examples()
     correct_dir = Path(__file__).parent / "correct"
     result_dir = Path(__file__).parent / "result"
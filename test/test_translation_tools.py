@@ -0,0 +1,161 @@
+import gzip
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from er_translator.parsers.erdplus_parser import ERDPLUS_Parser
+from er_translator.translation.er_translation import ERTranslator
+from er_translator.translation.translation_cache import TranslationCache
+from er_translator.translation.choice_enumeration import ChoiceEnumerator, VARIANTS_FILE
+from er_translator.translation.workload_advisor import WorkloadAdvisor
+from er_translator.translation.sql_writer import join_sql_code, iter_sql_code, write_sql_code
+from er_translator.data.workload import Workload, AccessPath
+from er_translator.data.choices import HIERARCHY_CHOICE
+from er_translator.data.conceptual import Entity, Attribute, Hierarchy, HierarchyCompleteness, HierarchyDisjointness, Relationship, Cardinality, MinimumCardinality, MaximumCardinality
+
+EXAMPLES_DIR = project_root / "er_translator" / "examples"
+
+def parse(file_path: Path) -> ERDPLUS_Parser:
+    parser = ERDPLUS_Parser()
+    parser.parse_erdplus_diagram(file_path)
+    return parser
+
+def default_choices(translator: ERTranslator) -> tuple[dict, dict, dict]:
+    return (
+        translator.get_composite_attributes_choices()[1],
+        translator.get_hierarchy_choices()[1],
+        translator.get_relationship_choices()[1]
+    )
+
+def test_translation_cache_lru_eviction():
+    cache = TranslationCache(max_entries=2)
+    cache.store("a", ["A"], [])
+    cache.store("b", ["B"], [])
+    # a is now the most recently used
+    assert cache.load("a") == (["A"], [])
+    cache.store("c", ["C"], [])
+    assert len(cache) == 2
+    assert cache.load("b") is None
+    assert cache.load("a") == (["A"], []) and cache.load("c") == (["C"], [])
+    assert (cache.hits, cache.misses) == (3, 1)
+
+def test_translation_cache_size_eviction():
+    cache = TranslationCache(max_size=10)
+    cache.store("a", ["12345"], [])
+    cache.store("b", ["1234"], ["5"])
+    assert cache.size == 10
+    cache.store("c", ["1"], [])
+    assert cache.load("a") is None and cache.size == 6
+    # an entry larger than the whole cache is not stored
+    cache.store("d", ["12345678901"], [])
+    assert cache.load("d") is None and len(cache) == 2
+
+def test_translator_cache():
+    parser = parse(EXAMPLES_DIR / "up_t_d_N_1.erdplus")
+    cache = TranslationCache()
+    translator = ERTranslator(parser.entities, parser.relationships, cache)
+    sql_code = translator.translate(*default_choices(translator))
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert translator.translate(*default_choices(translator)) == sql_code
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert ERTranslator(parser.entities, parser.relationships).translate(*default_choices(translator)) == sql_code
+
+def test_choice_enumerator():
+    parser = parse(EXAMPLES_DIR / "relationship_1_1.erdplus")
+    translator = ERTranslator(parser.entities, parser.relationships)
+    options = tuple(choices for choices, _ in (translator.get_composite_attributes_choices(), translator.get_hierarchy_choices(), translator.get_relationship_choices()))
+    enumerator = ChoiceEnumerator(parser.entities, parser.relationships, max_workers=1)
+    with tempfile.TemporaryDirectory() as directory:
+        summary = enumerator.enumerate(Path(directory))
+        assert summary == {"variants": 3, "translated": 3, "distinct": 3, "failed": 0}
+        with open(Path(directory) / VARIANTS_FILE) as variants_file:
+            for line in variants_file:
+                record = json.loads(line)
+                # every written model is the translation of its recorded choices
+                choices = (
+                    {(entity_name, attribute_name): next(choice for choice in options[0][(entity_name, attribute_name)] if choice.name == choice_name) for entity_name, attribute_name, choice_name in record["choices"]["composite_attributes"]},
+                    {item_key: next(choice for choice in options[1][item_key] if choice.name == choice_name) for item_key, choice_name in record["choices"]["hierarchies"].items()},
+                    {item_key: next(choice for choice in options[2][item_key] if choice.name == choice_name) for item_key, choice_name in record["choices"]["relationships"].items()},
+                )
+                assert (Path(directory) / record["sql_file"]).read_text() == translator.translate(*choices)
+
+def test_write_sql_code():
+    for file_path in sorted(EXAMPLES_DIR.glob("*.erdplus")):
+        parser = parse(file_path)
+        translator = ERTranslator(parser.entities, parser.relationships)
+        table_statements, triggers = translator.translate_statements(*default_choices(translator))
+        sql_code = join_sql_code(table_statements, triggers)
+        assert "".join(iter_sql_code(table_statements, triggers)) == sql_code
+        for buffer_size in (1, 7, 1 << 16):
+            text_sink = io.StringIO()
+            write_sql_code(iter_sql_code(table_statements, triggers), text_sink, buffer_size)
+            assert text_sink.getvalue() == sql_code, file_path.name
+            binary_sink = io.BytesIO()
+            with gzip.GzipFile(fileobj=binary_sink, mode="wb") as gzip_sink:
+                write_sql_code(iter_sql_code(table_statements, triggers), gzip_sink, buffer_size)
+            assert gzip.decompress(binary_sink.getvalue()) == sql_code.encode("utf-8"), file_path.name
+
+def test_merge_after_collapse_upwards():
+    one = Cardinality(MinimumCardinality.ONE, MaximumCardinality.ONE)
+    entities = {}
+    for entity_name in ("Person", "Student", "Passport", "School"):
+        entity = Entity(entity_name)
+        entity.add_identifier(Attribute("ID" + entity_name, one, True))
+        entities[entity_name] = entity
+    hierarchy = Hierarchy(HierarchyCompleteness.PARTIAL, HierarchyDisjointness.DISJOINT)
+    hierarchy.add_child("Student")
+    entities["Person"].set_hierarchy(hierarchy)
+    relationships = {
+        # Student is collapsed into Person, then Person is merged with Passport
+        "Holds": Relationship("Holds", "Person", "Passport", one, one),
+        "Attends": Relationship("Attends", "Student", "School", Cardinality(MinimumCardinality.ZERO, MaximumCardinality.MANY), one),
+    }
+    translator = ERTranslator(entities, relationships)
+    tables, hierarchy_checks = translator.translate_tables(*default_choices(translator))
+    assert list(tables) == ["School", "PersonPassport"]
+    assert [foreign_key.name for foreign_key in tables["School"].foreign_keys] == ["Attends_Student_IDPerson"]
+    # the selector and the trigger follow the father into the merged table
+    assert list(hierarchy_checks.selectors) == ["PersonPassport"]
+    trigger, = hierarchy_checks.triggers
+    assert (trigger.table_name, trigger.parent_table_name) == ("School", "PersonPassport")
+
+def test_workload_advisor_costs():
+    parser = parse(EXAMPLES_DIR / "up_t_d_N_1.erdplus")
+    workload = Workload()
+    workload.add_access_path(AccessPath(["Employee"], 10))
+    advisor = WorkloadAdvisor(parser.entities, parser.relationships, workload)
+    _, hierarchy_choices, _ = advisor.advise()
+    # collapsed downwards, every employee read joins the three children tables
+    assert advisor.hierarchy_costs == {"Employee": {HIERARCHY_CHOICE.COLLAPSE_UPWARDS: 10 * 1000, HIERARCHY_CHOICE.COLLAPSE_DOWNWARDS: 10 * (3 * 1000 + 2 * 100)}}
+    assert hierarchy_choices == {"Employee": HIERARCHY_CHOICE.COLLAPSE_UPWARDS}
+
+def test_translator_pipeline_reuse():
+    parser = parse(EXAMPLES_DIR / "relationship_1_1.erdplus")
+    translator = ERTranslator(parser.entities, parser.relationships)
+    composite_attributes_choices, hierarchy_choices, relationship_choices = default_choices(translator)
+    (relationship_name, options), = translator.get_relationship_choices()[0].items()
+    for choice in sorted(options, key=lambda item_choice: item_choice.value):
+        choices = (composite_attributes_choices, hierarchy_choices, {**relationship_choices, relationship_name: choice})
+        assert translator.translate(*choices) == translator.translate_model(*choices).create_sql_code()
+    # only the relationship choice changed, the earlier stages ran once
+    assert translator.pipeline.runs == {"normalize": 1, "eliminate_hierarchies": 1, "translate_tables": len(options), "render": len(options)}
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✓ {name}")
+            except Exception as e:
+                failed += 1
+                print(f"✗ {name}: {type(e).__name__}: {e}")
+    print(f"\nFailed {failed} tests")
+    sys.exit(1 if failed else 0)